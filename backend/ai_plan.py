@@ -0,0 +1,346 @@
+"""
+AI 아이돌 레퍼런스 플랜 캐시
+============================
+/api/recommend마다 gpt-4o-mini에 ~1,800토큰 요청을 보내던 구조를
+정규화된 프로필 단위 캐시로 바꿉니다.
+
+  - 프롬프트 입력을 구간화: 키/체중은 5cm/5kg 구간, 스타일/색상은 정렬·중복 제거,
+    예산 구간, 상위 3개 브랜드 id — 프롬프트도 구간 값으로 작성하므로
+    같은 키의 플랜은 그대로 재사용 가능
+  - 메모리 LRU + SQLite(data/ai-plans.sqlite3) 2단 캐시, TTL AI_PLAN_TTL
+  - 같은 프로필의 동시 미스는 OpenAI 호출 1회로 병합 (single-flight)
+  - 프로필별 조회 수를 캐시 DB(ai_plans_hits)에 주기적으로 누적 — 워밍업 작업이
+    인기 프로필부터 만료 전 재생성 (워밍업을 켜지 않아도, 단독 CLI에서도 같은 기준)
+
+실행:
+  FastAPI 프로세스 내장:  AI_PLAN_WARMUP=1 uvicorn main:app
+  단독 CLI:               python ai_plan.py [--once] [--top N] [--stats]
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from typing import List, Optional, Set, Tuple
+
+from cache_store import SQLiteStore, TieredCache
+from clients import clients
+from crawler import DATA_DIR, HITS_FLUSH_INTERVAL
+from metrics import CACHE_REQUESTS, stage_timer
+from singleflight import SingleFlight
+
+AI_PLAN_DB_PATH      = DATA_DIR / "ai-plans.sqlite3"
+AI_PLAN_MODEL        = "gpt-4o-mini"
+AI_PLAN_TTL          = int(os.getenv("AI_PLAN_TTL", str(7 * 24 * 3600)))   # 7일
+AI_PLAN_MAX_ENTRIES  = int(os.getenv("AI_PLAN_MAX_ENTRIES", "1024"))
+AI_PLAN_WARM_TOP     = int(os.getenv("AI_PLAN_WARM_TOP", "50"))            # 워밍업 대상 인기 프로필 수
+AI_PLAN_WARM_MARGIN  = int(os.getenv("AI_PLAN_WARM_MARGIN", str(24 * 3600)))
+AI_PLAN_WARM_INTERVAL = int(os.getenv("AI_PLAN_WARM_INTERVAL", "3600"))
+AI_PLAN_WARM_CONCURRENCY = 2
+
+HEIGHT_STEP = 5   # cm
+WEIGHT_STEP = 5   # kg
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 프로필 정규화
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _bucket(value: Optional[int], step: int) -> Optional[int]:
+    return None if value is None else value // step * step
+
+
+def normalize_profile(
+    height: Optional[int],
+    weight: Optional[int],
+    body_type: str,
+    styles: List[str],
+    colors: List[str],
+    budget_krw: str,
+    brand_ids: List[str],
+) -> dict:
+    """프롬프트에 들어가는 값만 구간화해서 모은 프로필 (캐시 키의 원본)."""
+    return {
+        "height":     _bucket(height, HEIGHT_STEP),
+        "weight":     _bucket(weight, WEIGHT_STEP),
+        "body_type":  body_type.strip(),
+        "styles":     sorted({s.strip() for s in styles if s.strip()}),
+        "colors":     sorted({c.strip() for c in colors if c.strip()}),
+        "budget_krw": budget_krw,
+        "brands":     list(brand_ids),   # 랭킹 순서 유지
+    }
+
+
+def profile_key(profile: dict) -> str:
+    raw = json.dumps(profile, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _range(value: Optional[int], step: int, unit: str) -> str:
+    return "미기재" if value is None else f"{value}~{value + step - 1}{unit}"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# OpenAI 호출
+# ══════════════════════════════════════════════════════════════════════════════
+
+def build_prompt(profile: dict, brands_info: str) -> str:
+    budget = profile["budget_krw"]
+    return f"""당신은 K-POP 아이돌 공항 패션 전문 스타일리스트입니다.
+
+사용자 정보:
+- 키: {_range(profile["height"], HEIGHT_STEP, "cm")}, 체중: {_range(profile["weight"], WEIGHT_STEP, "kg")}, 체형: {profile["body_type"]}
+- 원하는 스타일: {', '.join(profile["styles"]) or '미기재'}
+- 선호 색상: {', '.join(profile["colors"]) or '미기재'}
+- 예산 (KRW): {budget or '미기재'}
+
+이 사용자에게 추천된 무신사 브랜드 (matchScore 결과):
+{brands_info}
+
+아래 JSON만 반환 (한국어):
+{{
+  "idol_name": "가장 잘 어울리는 아이돌 이름 (예: BTS RM, aespa 카리나)",
+  "idol_style_ref": "이 사용자에게 어울리는 공항 패션 스타일 설명 (3문장, 위 브랜드 언급 포함)",
+  "product_descriptions": {{
+    "brand_id_1": "이 브랜드 상품이 이 체형/스타일에 어울리는 이유 (1~2문장)",
+    "brand_id_2": "이 브랜드 상품이 이 체형/스타일에 어울리는 이유",
+    "brand_id_3": "이 브랜드 상품이 이 체형/스타일에 어울리는 이유"
+  }},
+  "korean_brands_fallback": [
+    {{
+      "brand": "한국 브랜드명",
+      "product_name": "구체적 상품명",
+      "product_description": "설명 2문장",
+      "price_krw": 숫자,
+      "style_tags": ["태그1", "태그2"],
+      "is_korean": true,
+      "source": "ai_fallback"
+    }}
+  ],
+  "other_brands": [
+    {{
+      "brand": "해외 브랜드 (아이돌 착용 브랜드 우선)",
+      "product_name": "상품명",
+      "product_description": "설명 2문장",
+      "price_krw": 숫자,
+      "style_tags": ["태그1", "태그2"],
+      "is_korean": false,
+      "source": "ai"
+    }}
+  ]
+}}
+
+- korean_brands_fallback: 3개 (크롤링 실패 시 표시)
+- other_brands: 2개
+- 예산({budget})에 맞는 price_krw 설정
+"""
+
+
+async def generate_plan(profile: dict, brands_info: str) -> Tuple[dict, int]:
+    """OpenAI로 플랜 생성 → (plan, 사용 토큰 수)."""
+    with stage_timer("openai"):
+        resp = await clients.openai.chat.completions.create(
+            model=AI_PLAN_MODEL,
+            messages=[{"role": "user", "content": build_prompt(profile, brands_info)}],
+            response_format={"type": "json_object"},
+            max_tokens=1800,
+        )
+    tokens = resp.usage.total_tokens if resp.usage else 0
+    return json.loads(resp.choices[0].message.content), tokens
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 캐시
+# ══════════════════════════════════════════════════════════════════════════════
+
+class AIPlanCache:
+    def __init__(
+        self,
+        store: SQLiteStore,
+        ttl: int = AI_PLAN_TTL,
+        maxsize: int = AI_PLAN_MAX_ENTRIES,
+    ) -> None:
+        self.ttl = ttl
+        self.cache = TieredCache(store, maxsize, ttl=ttl)
+        self._flight: SingleFlight[dict] = SingleFlight("ai_plan")
+        self._unflushed: Counter = Counter()   # 아직 store.add_hits로 반영하지 않은 조회 수
+        self._flushed_at = 0.0
+        self._bg_tasks: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        self.generated    = 0
+        self.tokens_used  = 0
+        self.tokens_saved = 0
+        self.warmed       = 0
+
+    async def get(self, profile: dict, brands_info: str) -> dict:
+        """캐시된 플랜 (없으면 생성). 호출자가 수정해도 되도록 사본 반환."""
+        key = profile_key(profile)
+        self._unflushed[key] += 1
+        self._schedule_flush()
+        entry = await self.cache.get(key)
+        CACHE_REQUESTS.inc(cache="ai_plans", result="hit" if entry is not None else "miss")
+        if entry is not None:
+            self.tokens_saved += entry.get("tokens", 0)
+            return copy.deepcopy(entry["plan"])
+
+        plan = await self._flight.do(key, lambda: self._generate(key, profile, brands_info))
+        return copy.deepcopy(plan)
+
+    async def _generate(self, key: str, profile: dict, brands_info: str) -> dict:
+        plan, tokens = await generate_plan(profile, brands_info)
+        self.generated   += 1
+        self.tokens_used += tokens
+        await self.cache.put(key, {
+            "plan":        plan,
+            "profile":     profile,
+            "brands_info": brands_info,
+            "tokens":      tokens,
+            "ts":          time.time(),
+        })
+        return plan
+
+    # ── 조회 수 ───────────────────────────────────────────────────────────────
+
+    def _flush_sync(self) -> int:
+        deltas, self._unflushed = self._unflushed, Counter()
+        try:
+            self.cache.store.add_hits(deltas)
+        except Exception as e:
+            self._unflushed.update(deltas)   # 다음 주기에 재시도
+            print(f"[ai-plan] 조회 수 저장 실패: {e}")
+            return 0
+        return len(deltas)
+
+    async def flush(self) -> int:
+        """모아 둔 조회 수를 캐시 DB에 반영. 반영한 키 수 반환."""
+        return await asyncio.to_thread(self._flush_sync)
+
+    def _schedule_flush(self) -> None:
+        now = time.time()
+        if now - self._flushed_at < HITS_FLUSH_INTERVAL:
+            return
+        self._flushed_at = now
+        task = asyncio.ensure_future(self.flush())
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+
+    def hit_counts(self) -> Counter:
+        """키별 조회 수 — 캐시 DB 누적(모든 프로세스) + 미반영분. 동기."""
+        counts = Counter(self.cache.store.hits())
+        counts.update(self._unflushed)
+        return counts
+
+    # ── 워밍업 ────────────────────────────────────────────────────────────────
+
+    def due(self, top: int, margin: int) -> List[Tuple[str, dict]]:
+        """조회 수 상위 top개 중 만료 margin초 이내(또는 만료)인 엔트리."""
+        now = time.time()
+        due: List[Tuple[str, dict]] = []
+        ranked = 0
+        for key, _ in self.hit_counts().most_common():
+            if ranked >= top:
+                break
+            entry = self.cache.store.get(key)
+            if entry is None:   # 만료 정리된 플랜 — 재생성할 프로필 정보 없음
+                continue
+            ranked += 1
+            if now - entry.get("ts", 0) >= self.ttl - margin:
+                due.append((key, entry))
+        return due
+
+    async def warm_up(self, top: int = AI_PLAN_WARM_TOP, margin: int = AI_PLAN_WARM_MARGIN) -> int:
+        """인기 프로필 플랜을 만료 전에 재생성하고, 만료된 나머지는 정리."""
+        await self.flush()
+        due = await asyncio.to_thread(self.due, top, margin)
+        sem = asyncio.Semaphore(AI_PLAN_WARM_CONCURRENCY)
+
+        async def _warm(key: str, entry: dict) -> None:
+            async with sem:
+                try:
+                    await self._flight.do(key, lambda: self._generate(
+                        key, entry["profile"], entry["brands_info"]
+                    ))
+                    self.warmed += 1
+                except Exception as e:
+                    print(f"[ai-plan] 워밍업 실패 ({key[:8]}): {e}")
+
+        await asyncio.gather(*(_warm(k, e) for k, e in due))
+        pruned = await asyncio.to_thread(self.cache.store.prune, time.time() - self.ttl)
+        if due or pruned:
+            print(f"[ai-plan] 워밍업 {len(due)}개, 만료 정리 {pruned}개")
+        return len(due)
+
+    async def run_forever(self, interval: int = AI_PLAN_WARM_INTERVAL) -> None:
+        while True:
+            try:
+                await self.warm_up()
+            except Exception as e:
+                print(f"[ai-plan] 워밍업 오류: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "generated":    self.generated,
+            "coalesced":    self._flight.coalesced,
+            "tokens_used":  self.tokens_used,
+            "tokens_saved": self.tokens_saved,
+            "warmed":       self.warmed,
+            "warmup":       self._task is not None,
+        }
+
+
+ai_plans = AIPlanCache(SQLiteStore(AI_PLAN_DB_PATH, "ai_plans"))
+
+
+async def _main(once: bool, top: int, show_stats: bool) -> None:
+    store = ai_plans.cache.store
+    try:
+        if show_stats:
+            counts = ai_plans.hit_counts()
+            entries = sorted(store.items(), key=lambda kv: -counts.get(kv[0], 0))
+            print(f"[ai-plan] 저장된 플랜 {len(entries)}개")
+            for key, e in entries[:top]:
+                p = e.get("profile", {})
+                age_h = (time.time() - e.get("ts", 0)) / 3600
+                print(
+                    f"  {key[:8]}  hits={counts.get(key, 0):<5} {age_h:6.1f}h  "
+                    f"{p.get('body_type') or '-'} / {','.join(p.get('styles', [])) or '-'} / "
+                    f"{p.get('budget_krw') or '-'} / {','.join(p.get('brands', []))}"
+                )
+        elif once:
+            n = await ai_plans.warm_up(top=top)
+            print(f"[ai-plan] 완료: {n}개 재생성, 토큰 {ai_plans.tokens_used}")
+        else:
+            await ai_plans.run_forever()
+    finally:
+        await clients.aclose()
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 플랜 캐시 워밍업")
+    parser.add_argument("--once", action="store_true", help="워밍업 1회 실행 후 종료")
+    parser.add_argument("--top", type=int, default=AI_PLAN_WARM_TOP, help="대상 인기 프로필 수")
+    parser.add_argument("--stats", action="store_true", help="인기 프로필 목록만 출력")
+    args = parser.parse_args()
+    asyncio.run(_main(args.once, args.top, args.stats))
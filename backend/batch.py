@@ -0,0 +1,152 @@
+"""
+일괄 추천 (캠페인용 사전 계산)
+==============================
+저장된 프로필 수천 개의 추천을 /api/recommend를 반복 호출하지 않고 한 번에 계산합니다.
+
+  - 카탈로그 로드/랭킹 1회: brand_index.top_k_many로 전체 프로필을 함께 채점
+  - 필요한 브랜드의 합집합만 크롤링 — 브랜드당 1회 (예산 무관 전체 상품),
+    동시 크롤링 수 BATCH_CRAWL_CONCURRENCY로 제한
+  - 각 프로필은 자기 브랜드 크롤링이 모두 끝나는 즉시 완성(AI 플랜 + 응답 조립)되어
+    완료 순서대로 스트리밍 — AI 호출은 BATCH_AI_CONCURRENCY로 제한, 같은 구간 프로필은
+    ai_plan 캐시에서 재사용
+
+실행:
+  API:  POST /api/recommend/batch  {"profiles": [RecommendRequest, ...]}  → NDJSON
+  CLI:  python batch.py profiles.jsonl [-o results.jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Set, Tuple
+
+from crawler import BUDGET_RANGE, build_price_index, search_brand_cached, select_products
+from metrics import stage_timer
+from ranking import brand_index
+
+BATCH_MAX_PROFILES       = int(os.getenv("BATCH_MAX_PROFILES", "5000"))
+BATCH_CRAWL_CONCURRENCY  = int(os.getenv("BATCH_CRAWL_CONCURRENCY", "4"))
+BATCH_AI_CONCURRENCY     = int(os.getenv("BATCH_AI_CONCURRENCY", "8"))
+
+# (프로필 번호, 상위 3개 브랜드, 브랜드별 상품) → 응답 본문
+Finish = Callable[[int, List[dict], List[List[dict]]], Awaitable[dict]]
+
+
+async def run_batch(
+    user_inputs: List[dict],
+    finish: Finish,
+    products_per_brand: int = 2,
+    crawl_concurrency: int = BATCH_CRAWL_CONCURRENCY,
+    finish_concurrency: int = BATCH_AI_CONCURRENCY,
+) -> AsyncIterator[dict]:
+    """
+    user_inputs: [{"styles", "budget_krw", "body_type"}, ...]
+    완료되는 순서대로 {"index": i, "result": {...}} 또는 {"index": i, "error": "..."}.
+    """
+    t0 = time.perf_counter()
+    with stage_timer("ranking"):
+        tops = [[b for _, b in ranked] for ranked in brand_index.top_k_many(user_inputs, 3)]
+
+    # 브랜드 합집합 + 브랜드별 대기 프로필
+    brands:  Dict[str, dict] = {}
+    waiting: Dict[str, List[int]] = defaultdict(list)
+    for i, top in enumerate(tops):
+        for b in top:
+            brands.setdefault(b["id"], b)
+            waiting[b["id"]].append(i)
+    remaining = [len({b["id"] for b in top}) for top in tops]
+    print(f"[batch] 프로필 {len(tops)}개 → 브랜드 {len(brands)}개 크롤링")
+
+    catalog: Dict[str, Tuple[List[dict], List[List[int]]]] = {}
+    results: "asyncio.Queue[dict]" = asyncio.Queue()
+    crawl_sem  = asyncio.Semaphore(crawl_concurrency)
+    finish_sem = asyncio.Semaphore(finish_concurrency)
+    tasks: Set[asyncio.Task] = set()
+
+    def spawn(coro) -> None:
+        task = asyncio.ensure_future(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def finish_one(i: int) -> None:
+        budget = BUDGET_RANGE.get(user_inputs[i].get("budget_krw", ""))
+        crawled = []
+        for b in tops[i]:
+            products, index = catalog[b["id"]]
+            crawled.append([dict(p) for p in select_products(products, budget, products_per_brand, index)])
+        async with finish_sem:
+            try:
+                await results.put({"index": i, "result": await finish(i, tops[i], crawled)})
+            except Exception as e:
+                await results.put({"index": i, "error": str(e) or type(e).__name__})
+
+    async def crawl(brand_id: str) -> None:
+        async with crawl_sem:
+            try:
+                products = await search_brand_cached(brands[brand_id], "", limit=None)
+            except Exception as e:
+                print(f"[batch] 크롤링 오류 ({brand_id}): {e}")
+                products = []
+        catalog[brand_id] = (products, build_price_index(products))
+        for i in waiting[brand_id]:
+            remaining[i] -= 1
+            if remaining[i] == 0:
+                spawn(finish_one(i))
+
+    for i, n in enumerate(remaining):
+        if n == 0:
+            spawn(finish_one(i))
+    for brand_id in brands:
+        spawn(crawl(brand_id))
+
+    try:
+        for _ in range(len(tops)):
+            yield await results.get()
+    finally:
+        # 소비자가 중단(연결 종료)하면 남은 작업 취소 — 진행 중 크롤링은 single-flight로 계속
+        for task in list(tasks):
+            task.cancel()
+    print(f"[batch] 완료: 프로필 {len(tops)}개, {time.perf_counter() - t0:.1f}s")
+
+
+async def _main(path: str, output: str) -> None:
+    # main의 AI/응답 조립 로직을 그대로 사용 (앱 lifespan 없이 클라이언트만 정리)
+    from ai_plan import ai_plans
+    from browser_pool import browser_pool
+    from clients import clients
+    from main import RecommendRequest, finish_batch_item
+
+    with open(path, encoding="utf-8") as f:
+        reqs = [RecommendRequest(**json.loads(line)) for line in f if line.strip()]
+    out = open(output, "w", encoding="utf-8") if output != "-" else sys.stdout
+    ok = failed = 0
+    try:
+        async for item in run_batch(
+            [{"styles": r.styles, "budget_krw": r.budget_krw, "body_type": r.body_type} for r in reqs],
+            lambda i, top3, crawled: finish_batch_item(reqs[i], top3, crawled),
+        ):
+            if "error" in item:
+                failed += 1
+            else:
+                ok += 1
+            out.write(json.dumps(item, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        await ai_plans.stop()
+        await browser_pool.close()
+        await clients.aclose()
+    print(f"[batch] 성공 {ok}개, 실패 {failed}개", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일괄 추천 (JSONL 프로필 → JSONL 결과)")
+    parser.add_argument("profiles", help="RecommendRequest JSON을 한 줄에 하나씩 담은 파일")
+    parser.add_argument("-o", "--output", default="-", help="결과 파일 (기본: stdout)")
+    args = parser.parse_args()
+    asyncio.run(_main(args.profiles, args.output))
@@ -0,0 +1,191 @@
+"""
+상품 추출 벤치마크 (녹화 스냅샷 재생)
+======================================
+실행: cd backend && python bench_extract.py [--dir data/snapshots] [--repeat 20] [--brands id ...]
+녹화: cd backend && python bench_extract.py --record [--brands id ...]   (무신사 접속 필요)
+
+CRAWL_RECORD_DIR로 저장한 브랜드 페이지(<brand_id>.html + .json)를 네트워크 없이 재생해
+페이지별로 다음을 측정합니다.
+
+  1. replay      — _crawl_brand_playwright 전체 경로 (스냅샷 fulfill → 준비 대기 → 추출)
+  2. _JS_EXTRACT — 같은 페이지에서 page.evaluate만 반복 (중앙값)
+  3. normalize   — _normalize_items (Python)
+  4. http parse  — 같은 HTML을 http_extract.parse_listing으로 파싱 (HTTP 엔진 비교용)
+
+정합성 검사 (실패 시 종료 코드 1):
+  - 재생 추출 결과 = 녹화 시점 추출 결과 (raw_items)
+  - test_crawler.py [4]와 같은 필드 검증 (brand / product_name / price ≥ 1,000 / https URL)
+--no-browser: Chromium 없이 녹화된 추출 결과로 3~4와 필드 검증만 실행합니다.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import crawler
+from browser_pool import browser_pool
+from crawler import (
+    SNAPSHOT_DIR,
+    CrawlError,
+    _JS_EXTRACT,
+    _crawl_brand_playwright,
+    _normalize_items,
+    crawl_timings,
+    load_brands,
+    load_snapshot,
+    replay_route,
+    snapshot_paths,
+)
+from http_extract import ExtractError, parse_listing
+from test_crawler import field_errors
+
+GREEN  = "\033[92m"
+RED    = "\033[91m"
+YELLOW = "\033[93m"
+RESET  = "\033[0m"
+
+
+def median_ms(fn: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def evaluate_ms(html: str, url: str, brand_name: str, repeat: int) -> Tuple[float, List[Dict]]:
+    """스냅샷을 한 번 로드한 페이지에서 _JS_EXTRACT만 repeat회 실행 → (중앙값 ms, 마지막 결과)."""
+    samples, raw_items = [], []
+    async with browser_pool.page(user_agent=crawler._UA, locale="ko-KR") as page:
+        await page.route("**/*", replay_route(html))
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            raw_items = await page.evaluate(_JS_EXTRACT, brand_name)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), raw_items
+
+
+async def bench_brand(snapshot_dir: Path, brand: Dict, repeat: int, use_browser: bool) -> Dict:
+    name = brand["name_ko"]
+    html, meta = load_snapshot(snapshot_dir, brand["id"])
+    recorded = meta.get("raw_items")
+    row: Dict = {"brand": name, "errors": []}
+
+    raw_items = None
+    if use_browser:
+        try:
+            products = await _crawl_brand_playwright(brand)
+            row["replay_ms"] = crawl_timings[-1]["total_ms"] if crawl_timings and crawl_timings[-1]["ok"] else None
+            row["evaluate_ms"], raw_items = await evaluate_ms(
+                html, meta.get("url") or brand["musinsa_url"] + "?sortCode=POPULAR", name, repeat
+            )
+        except Exception as e:
+            row["errors"].append(f"브라우저 단계 실패: {e}")
+            raw_items, products = None, []
+        if raw_items is not None and recorded is not None and raw_items != recorded:
+            row["errors"].append(f"재생 추출 {len(raw_items)}개 ≠ 녹화 {len(recorded)}개 (또는 내용 불일치)")
+        if raw_items is not None and products != _normalize_items(raw_items, name):
+            row["errors"].append("_crawl_brand_playwright 결과 ≠ 추출 + 정규화 결과")
+    if not use_browser or raw_items is None:
+        raw_items = recorded
+    if raw_items is None:
+        row["errors"].append("메타(.json)에 녹화된 추출 결과 없음")
+        raw_items = []
+    row["items"] = len(raw_items)
+    row["normalize_ms"] = median_ms(lambda: _normalize_items(raw_items, name), repeat)
+    products = _normalize_items(raw_items, name)
+    bad = [(p.get("goods_no"), field_errors(p)) for p in products if field_errors(p)]
+    if bad:
+        row["errors"].append(f"필드 이상 {len(bad)}개 {bad[:3]}")
+    if not products:
+        row["errors"].append("정규화 후 상품 없음")
+    row["products"] = len(products)
+
+    # 참고용 (렌더링 후 DOM에서만 보이는 페이지면 HTTP 엔진은 실패가 정상)
+    try:
+        row["http_items"] = len(parse_listing(html, name))
+        row["http_ms"] = median_ms(lambda: parse_listing(html, name), repeat)
+    except ExtractError:
+        row["http_items"], row["http_ms"] = 0, None
+    return row
+
+
+def _fmt(v: Optional[float]) -> str:
+    return f"{v:9.2f}" if v is not None else f"{'-':>9}"
+
+
+async def run(snapshot_dir: Path, brand_ids: List[str], repeat: int, use_browser: bool) -> int:
+    brands = [
+        b for b in load_brands()
+        if snapshot_paths(snapshot_dir, b["id"])[0].exists() and (not brand_ids or b["id"] in brand_ids)
+    ]
+    if not brands:
+        print(f"{RED}스냅샷 없음: {snapshot_dir}{RESET}  — 먼저 python bench_extract.py --record")
+        return 1
+
+    crawler.CRAWL_REPLAY_DIR = str(snapshot_dir)
+    rows = []
+    try:
+        for brand in brands:
+            rows.append(await bench_brand(snapshot_dir, brand, repeat, use_browser))
+    finally:
+        await browser_pool.close()
+
+    print(f"\n{YELLOW}── 스냅샷 {len(rows)}개, 반복 {repeat}회 (중앙값 ms) ─────────────────────{RESET}")
+    print(f"  {'브랜드':<20} {'추출':>5} {'상품':>5} {'replay':>9} {'_JS_EXTRACT':>11} "
+          f"{'normalize':>9} {'http':>9} {'http추출':>7}")
+    for r in rows:
+        print(
+            f"  {r['brand'][:20]:<20} {r['items']:>5} {r['products']:>5} {_fmt(r.get('replay_ms'))} "
+            f"{_fmt(r.get('evaluate_ms')):>11} {_fmt(r['normalize_ms'])} {_fmt(r.get('http_ms'))} "
+            f"{r['http_items']:>7}"
+        )
+
+    failed = [r for r in rows if r["errors"]]
+    print()
+    for r in failed:
+        for err in r["errors"]:
+            print(f"  {RED}✘{RESET}  {r['brand']}: {err}")
+    if not failed:
+        checks = "재생 = 녹화, " if use_browser else ""
+        print(f"  {GREEN}✔{RESET}  {checks}필드 검증 통과 ({len(rows)}개 스냅샷)")
+    return 1 if failed else 0
+
+
+async def record(snapshot_dir: Path, brand_ids: List[str]) -> int:
+    crawler.CRAWL_RECORD_DIR = str(snapshot_dir)
+    brands = [b for b in load_brands() if not brand_ids or b["id"] in brand_ids]
+    saved = 0
+    try:
+        for brand in brands:
+            try:
+                await _crawl_brand_playwright(brand)
+            except CrawlError:
+                pass   # 실패 로그는 crawler가 출력
+            saved += snapshot_paths(snapshot_dir, brand["id"])[0].exists()
+    finally:
+        await browser_pool.close()
+    print(f"\n스냅샷 {saved}/{len(brands)}개: {snapshot_dir}")
+    return 0 if saved else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="_JS_EXTRACT 추출 벤치마크 (녹화 스냅샷 재생)")
+    parser.add_argument("--dir", type=Path, default=SNAPSHOT_DIR, help="스냅샷 디렉터리")
+    parser.add_argument("--brands", nargs="+", default=[], help="대상 브랜드 id (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--record", action="store_true", help="무신사에서 렌더링해 스냅샷 녹화")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="Chromium 없이 녹화된 추출 결과로 정규화/HTTP 파싱만 측정")
+    args = parser.parse_args()
+    if args.record:
+        sys.exit(asyncio.run(record(args.dir, args.brands)))
+    sys.exit(asyncio.run(run(args.dir, args.brands, args.repeat, not args.no_browser)))
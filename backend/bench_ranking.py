@@ -0,0 +1,128 @@
+"""
+브랜드 랭킹 벤치마크
+====================
+실행: cd backend && python bench_ranking.py [--sizes 10000 100000] [--profiles 1000]
+
+kpop-brands.json을 바탕으로 합성 카탈로그(10k / 100k 브랜드)를 만들어
+세 가지 채점 경로의 지연 시간을 비교합니다.
+
+  1. rank_brands        — 브랜드별 calc_match_score + 전체 정렬 (기준)
+  2. BrandIndex.top_k   — 그룹 단위 채점 + 힙 병합 (ranking.py)
+  3. VectorIndex        — NumPy 행렬 채점 + argpartition (vector_ranking.py)
+                          단일 프로필 / 다수 프로필 일괄
+
+각 크기에서 세 경로의 top-3 결과가 같은지도 함께 확인합니다.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import vector_ranking
+from crawler import BUDGET_RANGE, _BODY_TYPE_MAP, _STYLE_MAP, load_brands, rank_brands
+from ranking import BrandIndex
+
+GREEN  = "\033[92m"
+RED    = "\033[91m"
+YELLOW = "\033[93m"
+RESET  = "\033[0m"
+
+
+def synth_catalog(base: List[Dict], n: int, seed: int = 0) -> List[Dict]:
+    """실제 브랜드의 태그/가격대를 섞어 n개 브랜드 생성."""
+    rng = random.Random(seed)
+    tag_pool = sorted({t for b in base for t in b.get("style_tags", [])})
+    brands = []
+    for i in range(n):
+        src = base[i % len(base)]
+        lo = rng.choice([10_000, 30_000, 50_000, 100_000, 200_000, 350_000])
+        brands.append({
+            "id":              f"{src['id']}_{i}",
+            "name_ko":         f"{src['name_ko']} {i}",
+            "style_tags":      rng.sample(tag_pool, rng.randint(2, 5)),
+            "price_range_krw": {"min": lo, "max": lo * rng.choice([2, 3, 5])},
+            "idol_references": [{"confirmed": rng.random() < 0.3}],
+        })
+    return brands
+
+
+def synth_profiles(n: int, seed: int = 1) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "styles":     rng.sample(list(_STYLE_MAP), rng.randint(1, 3)),
+            "budget_krw": rng.choice(list(BUDGET_RANGE)),
+            "body_type":  rng.choice([*_BODY_TYPE_MAP, "표준"]),
+        }
+        for _ in range(n)
+    ]
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """1회 평균 소요 시간 (ms)."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / repeat
+
+
+def bench(size: int, n_profiles: int) -> None:
+    print(f"\n{YELLOW}── 브랜드 {size:,}개 ─────────────────────────────────────────{RESET}")
+    brands   = synth_catalog(load_brands(), size)
+    profiles = synth_profiles(n_profiles)
+    probe    = profiles[0]
+
+    t0 = time.perf_counter()
+    index = BrandIndex()
+    index._compile(brands)
+    index._mtime, index._checked_at = 0.0, float("inf")   # 파일 재로드 확인 비활성화
+    print(f"  BrandIndex 컴파일           {(time.perf_counter() - t0) * 1000:10.1f} ms")
+
+    vindex = None
+    if vector_ranking.np is not None:
+        t0 = time.perf_counter()
+        vindex = vector_ranking.VectorIndex(brands)
+        print(f"  VectorIndex 컴파일          {(time.perf_counter() - t0) * 1000:10.1f} ms")
+
+    base_ms = timed(lambda: rank_brands(probe, brands)[:3], 3)
+    print(f"  rank_brands (1 프로필)      {base_ms:10.3f} ms")
+    idx_ms = timed(lambda: index.top_k(probe, 3), 200)
+    print(f"  BrandIndex.top_k            {idx_ms:10.3f} ms   ×{base_ms / idx_ms:,.0f}")
+
+    if vindex is not None:
+        vec_ms = timed(lambda: vindex.top_k(probe, 3), 20)
+        print(f"  VectorIndex.top_k           {vec_ms:10.3f} ms   ×{base_ms / vec_ms:,.0f}")
+        many_ms = timed(lambda: vindex.top_k_many(profiles, 3), 1)
+        print(
+            f"  VectorIndex.top_k_many      {many_ms:10.1f} ms   "
+            f"({n_profiles:,} 프로필, 프로필당 {many_ms / n_profiles:.3f} ms)"
+        )
+    else:
+        print("  (numpy 미설치 — VectorIndex 생략)")
+
+    # 정합성 (일부 프로필)
+    mismatches = 0
+    for u in profiles[:20]:
+        expected = [b["id"] for b in rank_brands(u, brands)[:3]]
+        if [b["id"] for b in index.top_k(u, 3)] != expected:
+            mismatches += 1
+        if vindex is not None and [b["id"] for b in vindex.top_k(u, 3)] != expected:
+            mismatches += 1
+    if mismatches:
+        print(f"  {RED}✘{RESET}  top-3 불일치 {mismatches}건")
+    else:
+        print(f"  {GREEN}✔{RESET}  top-3 결과 일치 (20개 프로필)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="브랜드 랭킹 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--profiles", type=int, default=1000)
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.profiles)
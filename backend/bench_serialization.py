@@ -0,0 +1,249 @@
+"""
+직렬화 벤치마크
+================
+실행: cd backend && python bench_serialization.py [--brands 10000] [--entries 2000] [--products 60]
+
+kpop-brands.json을 바탕으로 합성한 대형 브랜드 카탈로그와 크롤링 캐시로
+표준 json 경로와 serialization.py 경로(orjson / msgpack)를 비교합니다.
+
+  1. 카탈로그 인코딩/디코딩 — json(indent=2, 기존 파일 형식) / orjson / msgpack, 크기
+  2. 카탈로그 기동 — json 원본 파싱 / JsonSnapshot(orjson 원본 파싱, msgpack 스냅샷) /
+     메모리 재사용(stat만)
+  3. 캐시 저장소 — SQLiteStore 값 형식별(json / orjson / msgpack) 전체 저장, 임의 키 조회, 전체 스캔
+  4. API 응답 — jsonable_encoder + JSONResponse / + ORJSONResponse / ORJSONResponse 직접
+
+각 경로의 디코딩 결과가 원본과 같은지도 함께 확인합니다.
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import serialization
+from cache_store import SQLiteStore
+from crawler import _cdn_url, build_price_index, load_brands
+from serialization import JsonSnapshot
+
+GREEN  = "\033[92m"
+RED    = "\033[91m"
+YELLOW = "\033[93m"
+RESET  = "\033[0m"
+
+
+def synth_catalog(base: List[Dict], n: int) -> Dict:
+    """실제 브랜드 구조를 그대로 복제한 n개 브랜드 카탈로그 (kpop-brands.json 형식)."""
+    brands = []
+    for i in range(n):
+        b = copy.deepcopy(base[i % len(base)])
+        b["id"] = f"{b['id']}_{i}"
+        b["name_ko"] = f"{b['name_ko']} {i}"
+        brands.append(b)
+    return {"meta": {"description": "합성 카탈로그", "brands": n}, "brands": brands}
+
+
+def synth_cache(n_entries: int, n_products: int, seed: int = 0) -> Dict[str, Dict]:
+    """크롤링 캐시 엔트리 n개 (브랜드당 상품 n_products개, crawler._crawl_and_store 형식)."""
+    rng = random.Random(seed)
+    entries = {}
+    for i in range(n_entries):
+        products = []
+        for j in range(n_products):
+            goods_no = str(1_000_000 + i * n_products + j)
+            products.append({
+                "goods_no":     goods_no,
+                "brand":        f"브랜드 {i}",
+                "product_name": f"오버핏 코튼 셔츠 {j} - 아이보리",
+                "price_krw":    rng.randrange(19_000, 390_000, 100),
+                "image_url":    _cdn_url(goods_no),
+                "product_url":  f"https://www.musinsa.com/products/{goods_no}",
+                "is_korean":    True,
+                "source":       "musinsa",
+                "style_tags":   ["미니멀", "캐주얼", "데일리"],
+            })
+        ts = time.time() - rng.random() * 3600
+        entries[f"brand_{i}"] = {
+            "products":    products,
+            "price_index": build_price_index(products),
+            "ts":          ts,
+            "ttl":         6 * 3600,
+            "outcome":     "ok",
+            "brand_name":  f"브랜드 {i}",
+            "crawled_at":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts)),
+        }
+    return entries
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """1회 평균 소요 시간 (ms)."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / repeat
+
+
+def row(label: str, ms: float, base_ms: float = 0, extra: str = "") -> None:
+    ratio = f"   ×{base_ms / ms:,.1f}" if base_ms and ms else ""
+    print(f"  {label:<34} {ms:10.2f} ms{ratio}  {extra}")
+
+
+def check(label: str, ok: bool, failures: List[str]) -> None:
+    if not ok:
+        failures.append(label)
+
+
+class formats:
+    """serialization 모듈 설정을 잠시 바꿔 측정 (orjson 사용 여부, STORE_FORMAT)."""
+
+    def __init__(self, use_orjson: bool, store_format: str) -> None:
+        self.use_orjson   = use_orjson
+        self.store_format = store_format
+
+    def __enter__(self) -> None:
+        self._saved = (serialization.orjson, serialization.STORE_FORMAT)
+        if not self.use_orjson:
+            serialization.orjson = None
+        serialization.STORE_FORMAT = self.store_format
+
+    def __exit__(self, *exc) -> None:
+        serialization.orjson, serialization.STORE_FORMAT = self._saved
+
+
+def bench_catalog(catalog: Dict, repeat: int, failures: List[str]) -> None:
+    print(f"\n{YELLOW}── 1. 카탈로그 인코딩/디코딩 (브랜드 {len(catalog['brands']):,}개) ─────────────{RESET}")
+    pretty = json.dumps(catalog, ensure_ascii=False, indent=2).encode("utf-8")
+    base_enc = timed(lambda: json.dumps(catalog, ensure_ascii=False, indent=2), repeat)
+    row("json.dumps(indent=2)", base_enc, extra=f"{len(pretty) / 1e6:.1f} MB")
+    base_dec = timed(lambda: json.loads(pretty), repeat)
+
+    decoders = [("json.loads", base_dec)]
+    if serialization.orjson is not None:
+        compact = serialization.dumps(catalog)
+        row("orjson.dumps", timed(lambda: serialization.dumps(catalog), repeat), base_enc,
+            f"{len(compact) / 1e6:.1f} MB")
+        decoders.append(("orjson.loads", timed(lambda: serialization.loads(compact), repeat)))
+        check("orjson 왕복", serialization.loads(compact) == catalog, failures)
+    if serialization.msgpack is not None:
+        with formats(True, "msgpack"):
+            packed = serialization.pack(catalog)
+            row("msgpack.packb", timed(lambda: serialization.pack(catalog), repeat), base_enc,
+                f"{len(packed) / 1e6:.1f} MB")
+        decoders.append(("msgpack.unpackb", timed(lambda: serialization.unpack(packed), repeat)))
+        check("msgpack 왕복", serialization.unpack(packed) == catalog, failures)
+    for label, ms in decoders:
+        row(label, ms, base_dec if label != "json.loads" else 0)
+
+
+def _variants() -> List[tuple]:
+    """(라벨, orjson 사용, STORE_FORMAT) — 설치된 것만."""
+    variants = [("json", False, "json")]
+    if serialization.orjson is not None:
+        variants.append(("orjson", True, "json"))
+    if serialization.msgpack is not None:
+        variants.append(("msgpack", serialization.orjson is not None, "msgpack"))
+    return variants
+
+
+def bench_startup(catalog: Dict, workdir: Path, repeat: int, failures: List[str]) -> None:
+    print(f"\n{YELLOW}── 2. 카탈로그 기동 (load_brands 경로, 새 프로세스 기준) ─────────────────{RESET}")
+    path = workdir / "kpop-brands.json"
+    path.write_text(json.dumps(catalog, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    base = timed(lambda: json.loads(path.read_text(encoding="utf-8"))["brands"], repeat)
+    row("JSON 파일 읽기 + json.loads (기존)", base)
+
+    for label, use_orjson, fmt in _variants()[1:]:
+        with formats(use_orjson, fmt):
+            JsonSnapshot(path).get()   # msgpack: 스냅샷 생성
+
+            def cold() -> object:
+                # 새 프로세스와 같은 상태 (메모리 없음, 스냅샷 파일만 있음)
+                return JsonSnapshot(path).get()["brands"]
+
+            row(f"JsonSnapshot 기동 ({label})", timed(cold, repeat), base)
+            check(f"{label} 스냅샷 = 원본", cold() == catalog["brands"], failures)
+
+    snap = JsonSnapshot(path)
+    snap.get()
+    row("JsonSnapshot 재사용 (stat만)", timed(lambda: snap.get()["brands"], repeat * 100), base)
+
+
+def bench_store(entries: Dict[str, Dict], workdir: Path, n_get: int, failures: List[str]) -> None:
+    print(
+        f"\n{YELLOW}── 3. 캐시 저장소 (엔트리 {len(entries):,}개 × 상품 "
+        f"{len(next(iter(entries.values()))['products'])}개) ─────────────{RESET}"
+    )
+    keys = random.Random(1).choices(list(entries), k=n_get)
+    base: Dict[str, float] = {}
+    for label, use_orjson, fmt in _variants():
+        with formats(use_orjson, fmt):
+            db = workdir / f"cache-{label}.sqlite3"
+            store = SQLiteStore(db)
+            t0 = time.perf_counter()
+            for k, v in entries.items():
+                store.put(k, v)
+            result = {
+                "put":  (time.perf_counter() - t0) * 1000,
+                "get":  timed(lambda: [store.get(k) for k in keys], 1) / n_get,
+                "scan": timed(lambda: sum(1 for _ in store.items()), 1),
+            }
+            check(f"{label} 저장소 왕복", store.get(keys[0]) == entries[keys[0]], failures)
+            store.close()
+        base = base or result
+        ref = base if label != "json" else {}
+        row(f"{label:<7} 전체 저장", result["put"], ref.get("put", 0), f"{db.stat().st_size / 1e6:.1f} MB")
+        row(f"{label:<7} 키 조회 (1건)", result["get"], ref.get("get", 0))
+        row(f"{label:<7} 전체 스캔", result["scan"], ref.get("scan", 0))
+
+
+def bench_response(entries: Dict[str, Dict], repeat: int, failures: List[str]) -> None:
+    print(f"\n{YELLOW}── 4. API 응답 인코딩 (/api/products/batch 200개 크기) ───────────────{RESET}")
+    products = [p for e in entries.values() for p in e["products"]][:200]
+    body = {"products": {p["goods_no"]: p for p in products}, "missing": []}
+
+    base = timed(lambda: JSONResponse(jsonable_encoder(body)), repeat)
+    row("jsonable_encoder + JSONResponse", base)
+    if serialization.ORJSONResponse is not None:
+        cls = serialization.ORJSONResponse
+        row("jsonable_encoder + ORJSONResponse", timed(lambda: cls(jsonable_encoder(body)), repeat), base)
+        row("ORJSONResponse 직접", timed(lambda: cls(body), repeat), base)
+        check("응답 본문 동일", json.loads(cls(body).body) == json.loads(JSONResponse(body).body), failures)
+    else:
+        print("  (orjson 미설치 — ORJSONResponse 생략)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="직렬화 벤치마크")
+    parser.add_argument("--brands", type=int, default=10_000, help="합성 카탈로그 브랜드 수")
+    parser.add_argument("--entries", type=int, default=2_000, help="합성 캐시 엔트리 수")
+    parser.add_argument("--products", type=int, default=60, help="엔트리당 상품 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson: {'있음' if serialization.orjson else '없음'}, "
+          f"msgpack: {'있음' if serialization.msgpack else '없음'}")
+    catalog = synth_catalog(load_brands(), args.brands)
+    entries = synth_cache(args.entries, args.products)
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_catalog(catalog, args.repeat, failures)
+        bench_startup(catalog, Path(tmp), args.repeat, failures)
+        bench_store(entries, Path(tmp), min(args.entries, 500), failures)
+        bench_response(entries, args.repeat * 20, failures)
+
+    print()
+    if failures:
+        for f in failures:
+            print(f"  {RED}✘{RESET}  {f} 불일치")
+        sys.exit(1)
+    print(f"  {GREEN}✔{RESET}  모든 경로의 디코딩 결과가 원본과 일치")
@@ -0,0 +1,223 @@
+"""
+Chromium 브라우저 풀 (Playwright)
+==================================
+크롤링마다 async_playwright() 드라이버와 Chromium 프로세스를 새로 띄우던 구조를
+앱 수명 동안 유지되는 브라우저 하나로 대체합니다.
+
+  - 요청마다 격리된 BrowserContext(쿠키/스토리지 분리) + Page를 발급
+  - 동시 페이지 수 상한 (BROWSER_MAX_PAGES) — 컨텍스트 수가 아니라 열린 탭(Page) 합계 기준
+  - N회 내비게이션(발급한 Page마다 1회) 후 브라우저 교체 (BROWSER_RECYCLE_AFTER) — 메모리 누수 방지
+  - 크래시(연결 끊김) 감지 시 다음 요청에서 자동 재기동
+  - FastAPI lifespan에서 start() / close() 호출
+
+사용:
+  async with browser_pool.page() as page:
+      await page.goto(url)
+
+  async with browser_pool.context() as ctx:          # 컨텍스트 하나에 탭 여러 개
+      async with browser_pool.new_page(ctx) as page:   # 탭마다 페이지 슬롯 하나
+          await page.goto(url)
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from metrics import Gauge
+
+_LAUNCH_ARGS: List[str] = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+]
+
+
+class BrowserPool:
+    """수명이 긴 Chromium 하나를 공유하고, 요청마다 격리된 컨텍스트를 발급."""
+
+    def __init__(self, max_pages: int = 4, recycle_after: int = 200) -> None:
+        self.max_pages     = max_pages
+        self.recycle_after = recycle_after
+
+        self._sem  = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+        self._pw:      Optional[Playwright] = None
+        self._browser: Optional[Browser]    = None
+        self._uses     = 0                        # 현재 브라우저의 내비게이션(발급 Page) 수
+        self._pages    = 0                        # 열려 있는 Page 수
+        self._inflight: Dict[Browser, int] = {}   # 브라우저별 사용 중 컨텍스트 수
+        self._retired:  List[Browser]      = []   # 교체됐지만 아직 사용 중인 브라우저
+        self._closing:  Set[asyncio.Task]  = set()   # 교체된 브라우저 종료 Task (close()에서 대기)
+        self._closed   = False
+
+        # 운영 지표
+        self.launches = 0
+        self.recycles = 0
+        self.crashes  = 0
+
+    # ── 수명 관리 ──────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """브라우저를 미리 띄워 첫 요청의 기동 지연을 없앰."""
+        self._closed = False
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def close(self) -> None:
+        """모든 브라우저와 Playwright 드라이버 종료."""
+        self._closed = True
+        async with self._lock:
+            browsers = self._retired + ([self._browser] if self._browser else [])
+            self._browser = None
+            self._retired = []
+            self._inflight.clear()
+            for b in browsers:
+                try:
+                    await b.close()
+                except Exception:
+                    pass
+            if self._closing:
+                await asyncio.gather(*self._closing, return_exceptions=True)
+            if self._pw is not None:
+                try:
+                    await self._pw.stop()
+                except Exception:
+                    pass
+                self._pw = None
+
+    async def _ensure_browser(self) -> Browser:
+        """현재 브라우저 반환. 없거나 크래시/교체 대상이면 새로 기동. (_lock 보유 상태)"""
+        if self._pw is None:
+            self._pw = await async_playwright().start()
+
+        browser = self._browser
+        if browser is not None and not browser.is_connected():
+            print("[browser-pool] 브라우저 연결 끊김 — 재기동")
+            self.crashes += 1
+            self._inflight.pop(browser, None)
+            browser = self._browser = None
+        elif browser is not None and self._uses >= self.recycle_after:
+            print(f"[browser-pool] {self._uses}회 사용 — 브라우저 교체")
+            self.recycles += 1
+            self._retire(browser)
+            browser = self._browser = None
+
+        if browser is None:
+            browser = await self._pw.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+            self._browser = browser
+            self._uses = 0
+            self._inflight[browser] = 0
+            self.launches += 1
+            print(f"[browser-pool] Chromium 기동 (누적 {self.launches}회)")
+        return browser
+
+    def _retire(self, browser: Browser) -> None:
+        if self._inflight.get(browser, 0) > 0:
+            self._retired.append(browser)
+        else:
+            self._inflight.pop(browser, None)
+            task = asyncio.ensure_future(_close_quietly(browser))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _release(self, browser: Browser) -> None:
+        if browser not in self._inflight:   # 크래시로 이미 정리된 브라우저
+            return
+        self._inflight[browser] -= 1
+        if browser in self._retired and self._inflight[browser] <= 0:
+            self._retired.remove(browser)
+            self._inflight.pop(browser, None)
+            await _close_quietly(browser)
+
+    # ── 발급 ──────────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def context(self, **context_kwargs) -> AsyncIterator[BrowserContext]:
+        """
+        격리된 BrowserContext 발급. 블록 종료(예외/취소 포함) 시 컨텍스트를 닫음.
+        페이지는 new_page(ctx)로 열어야 max_pages / 교체 주기에 반영됨.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool이 종료되었습니다.")
+
+        async with self._lock:
+            browser = await self._ensure_browser()
+            self._inflight[browser] = self._inflight.get(browser, 0) + 1
+
+        ctx: Optional[BrowserContext] = None
+        try:
+            ctx = await browser.new_context(**context_kwargs)
+            yield ctx
+        finally:
+            if ctx is not None:
+                try:
+                    await ctx.close()
+                except Exception:
+                    pass
+            await self._release(browser)
+
+    @asynccontextmanager
+    async def new_page(self, ctx: BrowserContext) -> AsyncIterator[Page]:
+        """
+        컨텍스트에 Page(탭) 하나를 열고 블록 종료 시 닫음.
+        동시에 열린 페이지 수(모든 컨텍스트 합계)는 max_pages로 제한.
+        """
+        async with self._sem:
+            page = await ctx.new_page()
+            self._uses  += 1    # 탭마다 goto 1회
+            self._pages += 1
+            try:
+                yield page
+            finally:
+                self._pages -= 1
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    @asynccontextmanager
+    async def page(self, **context_kwargs) -> AsyncIterator[Page]:
+        """격리된 컨텍스트 안의 단일 Page 발급."""
+        async with self.context(**context_kwargs) as ctx:
+            async with self.new_page(ctx) as page:
+                yield page
+
+    # ── 상태 ──────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            "running":       self._browser is not None and self._browser.is_connected(),
+            "max_pages":     self.max_pages,
+            "pages_in_use":  self._pages,
+            "contexts":      sum(self._inflight.values()),
+            "uses":          self._uses,
+            "recycle_after": self.recycle_after,
+            "launches":      self.launches,
+            "recycles":      self.recycles,
+            "crashes":       self.crashes,
+            "retired":       len(self._retired),
+        }
+
+
+async def _close_quietly(browser: Browser) -> None:
+    try:
+        await browser.close()
+    except Exception:
+        pass
+
+
+# 앱 전역 풀 (main.py lifespan에서 start/close)
+browser_pool = BrowserPool(
+    max_pages=int(os.getenv("BROWSER_MAX_PAGES", "4")),
+    recycle_after=int(os.getenv("BROWSER_RECYCLE_AFTER", "200")),
+)
+
+PAGES_IN_FLIGHT = Gauge(
+    "seoulfit_browser_pages_in_flight",
+    "Playwright 열려 있는 페이지(탭) 수",
+    fn=lambda: browser_pool._pages,
+)
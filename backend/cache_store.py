@@ -0,0 +1,246 @@
+"""
+2단 캐시 (메모리 LRU + SQLite)
+===============================
+  - 1단: 프로세스 메모리 LRU (TTL 적용) — 히트 시 디스크 접근 없음
+  - 2단: SQLite 키 단위 저장소 — INSERT OR REPLACE 한 줄로 원자적 갱신
+         (전체 파일 재작성 없음, WAL 모드)
+  - SQLite I/O는 asyncio.to_thread로 이벤트 루프 밖에서 실행
+  - hit / disk_hit / miss / eviction / expired 카운터
+  - 값 직렬화는 serialization.pack/unpack (STORE_FORMAT: orjson JSON TEXT / msgpack BLOB —
+    두 형식 모두 읽힘), JSON 파일 가져오기/내보내기 유지
+
+엔트리는 JSON 직렬화 가능한 dict이며 "ts"(저장 시각, epoch 초)를 포함해야 합니다.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from serialization import pack, unpack
+
+
+class LRUCache:
+    """메모리 LRU. entry["ts"] 기준 ttl이 지난 항목은 조회 시 제거."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 0) -> None:
+        self.maxsize = maxsize
+        self.ttl     = ttl          # 0이면 만료 없음
+        self._data: "OrderedDict[str, dict]" = OrderedDict()
+
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self.expired   = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        return bool(self.ttl) and now - entry.get("ts", 0) >= self.ttl
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self._is_expired(entry, time.time()):
+            del self._data[key]
+            self.expired += 1
+            self.misses  += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "size":      len(self._data),
+            "maxsize":   self.maxsize,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "expired":   self.expired,
+        }
+
+
+class SQLiteStore:
+    """키 단위로 갱신되는 영속 저장소 (key TEXT PRIMARY KEY, value msgpack/JSON, ts REAL, ttl REAL)."""
+
+    def __init__(self, path: Path, table: str = "cache") -> None:
+        self.path  = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                # value는 BLOB (형 변환 없음) — msgpack 바이트 / JSON 문자열 그대로 저장.
+                # 예전 DB의 TEXT 열도 그대로 사용: unpack이 str(JSON) / bytes(msgpack)로 구분
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "  key   TEXT PRIMARY KEY,"
+                "  value BLOB NOT NULL,"
+                "  ts    REAL NOT NULL,"
+                "  ttl   REAL"
+                ")"
+            )
+            # ttl 열이 없던 기존 DB — 추가 (NULL이면 호출 측 기본 TTL)
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+            if "ttl" not in columns:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN ttl REAL")
+            # 키별 누적 조회 수 — 여러 프로세스(API / refresher.py CLI)가 공유하는 우선순위 기준
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table}_hits ("
+                "  key  TEXT PRIMARY KEY,"
+                "  hits INTEGER NOT NULL"
+                ")"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return unpack(row[0]) if row else None
+
+    def put(self, key: str, entry: dict) -> None:
+        value = pack(entry)
+        with self._lock:
+            conn = self._connect()
+            with conn:   # 트랜잭션 — 키 단위 원자적 갱신
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, ts, ttl) VALUES (?, ?, ?, ?)",
+                    (key, value, entry.get("ts", time.time()), entry.get("ttl")),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def prune(self, before_ts: float) -> int:
+        """ts가 before_ts보다 오래된 행 삭제. 삭제한 행 수 반환."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    f"DELETE FROM {self.table} WHERE ts < ?", (before_ts,)
+                ).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def timestamps(self) -> Dict[str, Tuple[float, Optional[float]]]:
+        """키별 (저장 시각, 엔트리 "ttl" 또는 None) — 값 파싱 없이 조회."""
+        with self._lock:
+            rows = self._connect().execute(f"SELECT key, ts, ttl FROM {self.table}").fetchall()
+        return {key: (ts, ttl) for key, ts, ttl in rows}
+
+    def add_hits(self, deltas: Dict[str, int]) -> None:
+        """조회 수 증분 반영 (프로세스별로 모아 두었다가 주기적으로 호출)."""
+        if not deltas:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO {self.table}_hits (key, hits) VALUES (?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET hits = hits + excluded.hits",
+                    list(deltas.items()),
+                )
+
+    def hits(self) -> Dict[str, int]:
+        """키별 누적 조회 수 (모든 프로세스 합계)."""
+        with self._lock:
+            return dict(self._connect().execute(f"SELECT key, hits FROM {self.table}_hits").fetchall())
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT key, value FROM {self.table} ORDER BY key"
+            ).fetchall()
+        for key, value in rows:
+            yield key, unpack(value)
+
+    def import_json(self, path: Path) -> int:
+        """기존 JSON 캐시 파일({key: entry}) 가져오기. 가져온 키 수 반환."""
+        try:
+            data: Dict[str, dict] = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return 0
+        rows = [
+            (k, pack(v), v.get("ts", 0), v.get("ttl"))
+            for k, v in data.items() if isinstance(v, dict)
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {self.table} (key, value, ts, ttl) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def export_json(self, path: Path) -> int:
+        """저장소 전체를 JSON 파일로 내보내기 (디버깅/백업용)."""
+        data = dict(self.items())
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        return len(data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class TieredCache:
+    """메모리 LRU 앞단 + SQLite 뒷단. get/put은 이벤트 루프를 막지 않음."""
+
+    def __init__(self, store: SQLiteStore, maxsize: int = 1024, ttl: float = 0) -> None:
+        self.store  = store
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.disk_hits = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+
+        entry = await asyncio.to_thread(self.store.get, key)
+        if entry is None or self.memory._is_expired(entry, time.time()):
+            return None
+        self.disk_hits += 1
+        self.memory.put(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: dict) -> None:
+        self.memory.put(key, entry)
+        await asyncio.to_thread(self.store.put, key, entry)
+
+    def stats(self) -> dict:
+        return {**self.memory.stats(), "disk_hits": self.disk_hits}
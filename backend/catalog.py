@@ -0,0 +1,261 @@
+"""
+상품 카탈로그 (goods_no 인덱스 + 증분 변경 감지)
+================================================
+크롤링 캐시(musinsa-cache.sqlite3)는 브랜드 키 단위 상품 목록이라 goods_no로 상품을
+찾을 수 없습니다. 카탈로그는 크롤링 결과를 상품 단위 행으로 유지합니다.
+
+  - products: goods_no → 브랜드 / 상품명 / 가격 / 이미지 / URL / first_seen / last_seen
+  - listings: 브랜드별 마지막 목록 다이제스트(상품 순서 + 행 다이제스트)
+  - 재크롤링 시 목록 다이제스트가 같으면 listings.checked_at 한 줄만 갱신
+    (목록에 있는 상품의 last_seen = 브랜드의 checked_at — 행을 다시 쓰지 않음)
+  - 바뀌었으면 행 다이제스트를 비교해 추가/변경/삭제된 행만 기록
+    (목록에서 빠진 상품은 listed=0, last_seen은 마지막으로 확인된 시각으로 고정)
+
+crawler._crawl_and_store가 크롤링 저장 직후 sync()를 호출하고,
+GET /api/products/{goods_no} · POST /api/products/batch는 이 인덱스만 읽습니다.
+
+CLI:
+  python catalog.py --import-cache   # 기존 크롤링 캐시에서 채우기
+  python catalog.py --get 5621602
+  python catalog.py --stats
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 행 다이제스트에 포함되는 필드 (이 중 하나라도 바뀌면 행을 다시 씀)
+_ROW_FIELDS = ("brand", "product_name", "price_krw", "image_url", "product_url")
+
+_SELECT = (
+    "SELECT p.goods_no, p.brand_id, p.brand, p.product_name, p.price_krw, p.image_url,"
+    " p.product_url, p.listed, p.first_seen,"
+    " CASE WHEN p.listed = 1 AND l.checked_at IS NOT NULL THEN l.checked_at ELSE p.last_seen END,"
+    " p.updated_at"
+    " FROM products p LEFT JOIN listings l ON l.brand_id = p.brand_id"
+)
+_COLUMNS = (
+    "goods_no", "brand_id", "brand", "product_name", "price_krw", "image_url",
+    "product_url", "listed", "first_seen", "last_seen", "updated_at",
+)
+
+
+def row_digest(product: Dict) -> str:
+    raw = "\x1f".join(str(product.get(f, "")) for f in _ROW_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def listing_digest(rows: List[tuple]) -> str:
+    """[(goods_no, row_digest), ...] — 인기순 순서까지 포함."""
+    raw = ";".join(f"{g}:{d}" for g, d in rows)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ProductCatalog:
+    """goods_no 단위 상품 저장소. 동기 메서드는 스레드 안전, 비동기 래퍼는 to_thread 사용."""
+
+    def __init__(self, path: Path) -> None:
+        self.path  = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.syncs     = 0
+        self.unchanged = 0
+        self.inserted  = 0
+        self.updated   = 0
+        self.removed   = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "  goods_no     TEXT PRIMARY KEY,"
+                "  brand_id     TEXT NOT NULL,"
+                "  brand        TEXT NOT NULL,"
+                "  product_name TEXT NOT NULL,"
+                "  price_krw    INTEGER NOT NULL,"
+                "  image_url    TEXT NOT NULL,"
+                "  product_url  TEXT NOT NULL,"
+                "  digest       TEXT NOT NULL,"
+                "  listed       INTEGER NOT NULL DEFAULT 1,"
+                "  first_seen   REAL NOT NULL,"
+                "  last_seen    REAL NOT NULL,"
+                "  updated_at   REAL NOT NULL"
+                ");"
+                "CREATE INDEX IF NOT EXISTS products_brand ON products (brand_id);"
+                "CREATE TABLE IF NOT EXISTS listings ("
+                "  brand_id   TEXT PRIMARY KEY,"
+                "  digest     TEXT NOT NULL,"
+                "  items      INTEGER NOT NULL,"
+                "  checked_at REAL NOT NULL,"
+                "  changed_at REAL NOT NULL"
+                ");"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # ── 쓰기 ──────────────────────────────────────────────────────────────────
+
+    def apply(self, brand_id: str, products: List[Dict], ts: Optional[float] = None) -> Dict[str, int]:
+        """
+        브랜드의 최신 목록 반영. 변경 건수 {"inserted", "updated", "removed", "unchanged"} 반환
+        (unchanged=1이면 목록 전체가 그대로라 listings 한 줄만 갱신).
+        """
+        now = ts or time.time()
+        # 같은 goods_no가 목록에 두 번 나오면 첫 번째(인기순 상위)만
+        rows: Dict[str, Dict] = {}
+        for p in products:
+            goods_no = str(p.get("goods_no") or "")
+            if goods_no and goods_no not in rows:
+                rows[goods_no] = p
+        digests = {g: row_digest(p) for g, p in rows.items()}
+        digest = listing_digest(list(digests.items()))
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                prev = conn.execute(
+                    "SELECT digest, checked_at FROM listings WHERE brand_id = ?", (brand_id,)
+                ).fetchone()
+                if prev and prev[0] == digest:
+                    conn.execute(
+                        "UPDATE listings SET checked_at = ? WHERE brand_id = ?", (now, brand_id)
+                    )
+                    self.syncs     += 1
+                    self.unchanged += 1
+                    return {"inserted": 0, "updated": 0, "removed": 0, "unchanged": 1}
+
+                # 기존 행: 이 브랜드 목록에 있던 것 + 새 목록의 goods_no (브랜드 이동 포함)
+                stored: Dict[str, tuple] = {
+                    g: (d, listed) for g, d, listed in conn.execute(
+                        "SELECT goods_no, digest, listed FROM products WHERE brand_id = ?", (brand_id,)
+                    )
+                }
+                missing = [g for g in rows if g not in stored]
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for g, d in conn.execute(
+                        f"SELECT goods_no, digest FROM products WHERE goods_no IN ({marks})", chunk
+                    ):
+                        stored[g] = (d, -1)   # 다른 브랜드 소속이던 행 → 갱신 대상
+
+                inserts, updates = [], []
+                for g, p in rows.items():
+                    values = (
+                        brand_id, p.get("brand", ""), p.get("product_name", ""),
+                        int(p.get("price_krw", 0)), p.get("image_url", ""), p.get("product_url", ""),
+                        digests[g],
+                    )
+                    if g not in stored:
+                        inserts.append((g, *values, now, now, now))
+                    elif stored[g] != (digests[g], 1):
+                        updates.append((*values, now, g))
+                prev_checked = prev[1] if prev else now
+                removed = [
+                    (prev_checked, g) for g, (_, listed) in stored.items()
+                    if listed == 1 and g not in rows
+                ]
+
+                conn.executemany(
+                    "INSERT INTO products (goods_no, brand_id, brand, product_name, price_krw,"
+                    " image_url, product_url, digest, first_seen, last_seen, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    inserts,
+                )
+                conn.executemany(
+                    "UPDATE products SET brand_id = ?, brand = ?, product_name = ?, price_krw = ?,"
+                    " image_url = ?, product_url = ?, digest = ?, listed = 1, updated_at = ?"
+                    " WHERE goods_no = ?",
+                    updates,
+                )
+                conn.executemany(
+                    "UPDATE products SET listed = 0, last_seen = ? WHERE goods_no = ?", removed
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO listings (brand_id, digest, items, checked_at, changed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (brand_id, digest, len(rows), now, now),
+                )
+
+        self.syncs    += 1
+        self.inserted += len(inserts)
+        self.updated  += len(updates)
+        self.removed  += len(removed)
+        return {"inserted": len(inserts), "updated": len(updates), "removed": len(removed), "unchanged": 0}
+
+    # ── 읽기 ──────────────────────────────────────────────────────────────────
+
+    def lookup(self, goods_nos: List[str]) -> Dict[str, Dict]:
+        """{goods_no: 상품} — 없는 goods_no는 결과에 없음."""
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(goods_nos), 500):
+                chunk = goods_nos[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in conn.execute(f"{_SELECT} WHERE p.goods_no IN ({marks})", chunk):
+                    product = dict(zip(_COLUMNS, row))
+                    product["listed"] = bool(product["listed"])
+                    found[product["goods_no"]] = product
+        return found
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    # ── 비동기 래퍼 ───────────────────────────────────────────────────────────
+
+    async def sync(self, brand_id: str, products: List[Dict], ts: Optional[float] = None) -> Dict[str, int]:
+        return await asyncio.to_thread(self.apply, brand_id, products, ts)
+
+    async def get(self, goods_no: str) -> Optional[Dict]:
+        return (await asyncio.to_thread(self.lookup, [goods_no])).get(goods_no)
+
+    async def get_many(self, goods_nos: List[str]) -> Dict[str, Dict]:
+        return await asyncio.to_thread(self.lookup, goods_nos)
+
+    def stats(self) -> dict:
+        return {
+            "syncs":     self.syncs,
+            "unchanged": self.unchanged,
+            "inserted":  self.inserted,
+            "updated":   self.updated,
+            "removed":   self.removed,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+if __name__ == "__main__":
+    from crawler import catalog, crawl_cache
+
+    parser = argparse.ArgumentParser(description="goods_no 상품 카탈로그")
+    parser.add_argument("--import-cache", action="store_true", help="크롤링 캐시의 모든 브랜드 목록 반영")
+    parser.add_argument("--get", nargs="+", metavar="GOODS_NO", help="상품 조회")
+    parser.add_argument("--stats", action="store_true")
+    args = parser.parse_args()
+
+    if args.import_cache:
+        for key, entry in crawl_cache.store.items():
+            diff = catalog.apply(key, entry.get("products", []), entry.get("ts"))
+            print(f"[catalog] {key}: {diff}")
+    if args.get:
+        print(json.dumps(catalog.lookup(args.get), ensure_ascii=False, indent=2))
+    if args.stats or not (args.import_cache or args.get):
+        print(json.dumps({"products": catalog.count(), **catalog.stats()}, ensure_ascii=False))
@@ -0,0 +1,160 @@
+"""
+외부 API 클라이언트 레지스트리
+==============================
+Yahoo / 무신사 / OpenAI / Stripe 호출이 제각각 클라이언트를 만들던 구조를
+앱 전역 레지스트리 하나로 모읍니다. FastAPI lifespan 종료 시 aclose()로 정리.
+
+  - 업스트림별 httpx.AsyncClient (커넥션 풀 상한, keep-alive, 타임아웃 개별 설정)
+  - h2 패키지가 설치돼 있으면 HTTP/2 사용 (pip install "httpx[http2]")
+  - OpenAI: 튜닝된 httpx 풀을 쓰는 AsyncOpenAI
+  - Stripe: 커넥션 풀을 유지하는 requests 세션 기반 StripeClient
+
+사용:
+  from clients import clients
+  r = await clients.http("yahoo").get(url)
+  await clients.openai.chat.completions.create(...)
+"""
+
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+import openai
+import stripe
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class Upstream:
+    timeout:    float              # 읽기/쓰기 타임아웃 (초)
+    connect:    float              # 연결 타임아웃 (초)
+    max_conns:  int
+    keepalive:  int                # 유지할 유휴 커넥션 수
+    http2:      bool = True
+    headers:    Optional[Dict[str, str]] = None
+
+
+UPSTREAMS: Dict[str, Upstream] = {
+    "musinsa": Upstream(
+        timeout=10.0, connect=5.0, max_conns=20, keepalive=10,
+        headers={
+            "Accept":          "text/html,application/xhtml+xml,*/*;q=0.8",
+            "Accept-Language": "ko-KR,ko;q=0.9",
+        },
+    ),
+    "msscdn": Upstream(
+        timeout=10.0, connect=5.0, max_conns=32, keepalive=16,
+        headers={
+            "Referer":    "https://www.musinsa.com/",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept":     "image/webp,image/apng,image/*,*/*;q=0.8",
+        },
+    ),
+    "yahoo":  Upstream(
+        timeout=5.0, connect=3.0, max_conns=4, keepalive=2,
+        headers={"User-Agent": "Mozilla/5.0"},
+    ),
+    "openai": Upstream(timeout=60.0, connect=5.0, max_conns=50, keepalive=20),
+}
+
+STRIPE_TIMEOUT   = float(os.getenv("STRIPE_TIMEOUT", "30"))
+STRIPE_POOL_SIZE = int(os.getenv("STRIPE_POOL_SIZE", "10"))
+STRIPE_API_BASE  = os.getenv("STRIPE_API_BASE", "")    # 부하 테스트 스텁 등 (기본: api.stripe.com)
+
+
+def _limits(u: Upstream) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=u.max_conns,
+        max_keepalive_connections=u.keepalive,
+        keepalive_expiry=30.0,
+    )
+
+
+def _timeout(u: Upstream) -> httpx.Timeout:
+    return httpx.Timeout(u.timeout, connect=u.connect)
+
+
+class ClientRegistry:
+    def __init__(self) -> None:
+        self._http: Dict[str, httpx.AsyncClient] = {}
+        self._openai: Optional[openai.AsyncOpenAI] = None
+        self._stripe: Optional[stripe.StripeClient] = None
+        self._stripe_session = None   # requests.Session (StripeClient 커넥션 풀)
+
+    def http(self, name: str) -> httpx.AsyncClient:
+        """업스트림 이름별 공유 AsyncClient (필요할 때 생성)."""
+        client = self._http.get(name)
+        if client is None or client.is_closed:
+            u = UPSTREAMS[name]
+            client = httpx.AsyncClient(
+                timeout=_timeout(u),
+                limits=_limits(u),
+                http2=u.http2 and HTTP2_AVAILABLE,
+                headers=u.headers,
+                follow_redirects=True,
+            )
+            self._http[name] = client
+        return client
+
+    @property
+    def openai(self) -> openai.AsyncOpenAI:
+        if self._openai is None:
+            u = UPSTREAMS["openai"]
+            self._openai = openai.AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY", ""),
+                max_retries=1,
+                timeout=_timeout(u),
+                http_client=openai.DefaultAsyncHttpxClient(
+                    limits=_limits(u), http2=u.http2 and HTTP2_AVAILABLE
+                ),
+            )
+        return self._openai
+
+    @property
+    def stripe(self) -> Optional[stripe.StripeClient]:
+        """STRIPE_SECRET_KEY가 없으면 None."""
+        if self._stripe is None:
+            api_key = os.getenv("STRIPE_SECRET_KEY", "")
+            if not api_key:
+                return None
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=STRIPE_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._stripe_session = session
+            self._stripe = stripe.StripeClient(
+                api_key,
+                max_network_retries=1,
+                http_client=stripe.RequestsClient(timeout=STRIPE_TIMEOUT, session=session),
+                **({"base_addresses": {"api": STRIPE_API_BASE}} if STRIPE_API_BASE else {}),
+            )
+        return self._stripe
+
+    async def aclose(self) -> None:
+        for client in self._http.values():
+            await client.aclose()
+        self._http.clear()
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
+        if self._stripe_session is not None:
+            self._stripe_session.close()
+            self._stripe_session = None
+        self._stripe = None
+
+    def stats(self) -> dict:
+        return {
+            "http2":   HTTP2_AVAILABLE,
+            "http":    sorted(name for name, c in self._http.items() if not c.is_closed),
+            "openai":  self._openai is not None,
+            "stripe":  self._stripe is not None,
+        }
+
+
+clients = ClientRegistry()
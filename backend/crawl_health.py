@@ -0,0 +1,225 @@
+"""
+크롤링 호스트 상태 (서킷 브레이커 + AIMD 동시성)
+================================================
+무신사가 차단/스로틀링을 시작하면 크롤링이 연달아 실패하는데, 그동안에도 다른 브랜드
+크롤링이 계속 브라우저를 띄워 같은 호스트를 두드리게 됩니다. 호스트별로 상태를 추적해
+실패가 이어지면 크롤링 자체를 멈추고, 동시 크롤링 수를 결과에 따라 조절합니다.
+
+  - 서킷 브레이커: 연속 실패 CRAWL_BREAKER_THRESHOLD회 → open (CRAWL_BREAKER_COOLDOWN 동안
+    크롤링 거부) → half_open (탐색 크롤링 1건만 허용) → 성공 시 closed, 실패 시 다시 open
+    (쿨다운 2배, 최대 CRAWL_BREAKER_MAX_COOLDOWN)
+  - AIMD: 성공마다 한도 +1/한도 (대략 한도만큼 성공하면 +1), 실패 시 한도 ×0.5
+    (CRAWL_AIMD_MIN ~ CRAWL_AIMD_MAX)
+  - 결과 구분: success(상품 있음) / empty(정상 응답, 상품 0개 — 한도·브레이커 변화 없음) / failure
+
+사용 (crawler._crawl_and_store):
+  async with crawl_health.slot(host) as health:   # open이면 CircuitOpen
+      products = await crawl()
+      health.record("success" if products else "empty")
+
+상태: GET /api/crawler/status 의 "health", /metrics 의 seoulfit_crawl_breaker_state 등
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+from metrics import CRAWL_BREAKER_STATE, CRAWL_CONCURRENCY_LIMIT
+
+CRAWL_BREAKER_THRESHOLD    = int(os.getenv("CRAWL_BREAKER_THRESHOLD", "5"))
+CRAWL_BREAKER_COOLDOWN     = float(os.getenv("CRAWL_BREAKER_COOLDOWN", "120"))
+CRAWL_BREAKER_MAX_COOLDOWN = float(os.getenv("CRAWL_BREAKER_MAX_COOLDOWN", "1800"))
+CRAWL_AIMD_INITIAL         = float(os.getenv("CRAWL_AIMD_INITIAL", "4"))   # ≥ CRAWL_MAX_TABS — 한 배치가 쪼개지지 않게
+CRAWL_AIMD_MIN             = float(os.getenv("CRAWL_AIMD_MIN", "1"))
+CRAWL_AIMD_MAX             = float(os.getenv("CRAWL_AIMD_MAX", "8"))
+
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpen(Exception):
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"{host}: 서킷 open ({retry_in:.0f}s 후 재시도)")
+        self.host     = host
+        self.retry_in = retry_in
+
+
+class AdaptiveLimiter:
+    """한도가 실행 중에 바뀌는 세마포어 (한도는 float, 정수 부분만큼 동시 실행)."""
+
+    def __init__(self, initial: float, minimum: float, maximum: float) -> None:
+        self.minimum  = minimum
+        self.maximum  = maximum
+        self.limit    = min(max(initial, minimum), maximum)
+        self.inflight = 0
+        self._waiters: List["asyncio.Future[None]"] = []
+
+    async def acquire(self) -> None:
+        while self.inflight >= int(self.limit):
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+                if fut.done() and not fut.cancelled():
+                    # 깨워진 뒤 재개 전에 취소됨 — 받은 차례를 다음 대기자에게 넘김
+                    self._wake()
+                raise
+            finally:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+        self.inflight += 1
+
+    def release(self) -> None:
+        self.inflight -= 1
+        self._wake()
+
+    def increase(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        self._wake()
+
+    def decrease(self) -> None:
+        self.limit = max(self.minimum, self.limit * 0.5)
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.inflight
+        for fut in self._waiters[:max(free, 0)]:
+            if not fut.done():
+                fut.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "limit":    round(self.limit, 2),
+            "inflight": self.inflight,
+            "waiting":  len(self._waiters),
+        }
+
+
+class HostHealth:
+    def __init__(self, host: str) -> None:
+        self.host     = host
+        self.state    = "closed"
+        self.cooldown = CRAWL_BREAKER_COOLDOWN
+        self.limiter  = AdaptiveLimiter(CRAWL_AIMD_INITIAL, CRAWL_AIMD_MIN, CRAWL_AIMD_MAX)
+        self._opened_at = 0.0
+        self._probing   = False
+        self.consecutive_failures = 0
+
+        self.successes = 0
+        self.empties   = 0
+        self.failures  = 0
+        self.rejected  = 0     # 브레이커 때문에 시작하지 않은 크롤링
+        self.trips     = 0
+        self._export()
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.cooldown - time.time())
+
+    def allow(self) -> bool:
+        """크롤링을 시작해도 되는지. half_open에서는 탐색 1건만 허용."""
+        if self.state == "open":
+            if self.retry_in() > 0:
+                self.rejected += 1
+                return False
+            self._set_state("half_open")
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    def record(self, outcome: str) -> None:
+        """outcome: success / empty / failure"""
+        self._probing = False
+        if outcome == "failure":
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.limiter.decrease()
+            if self.state == "half_open":
+                self.cooldown = min(self.cooldown * 2, CRAWL_BREAKER_MAX_COOLDOWN)
+                self._trip()
+            elif self.state == "closed" and self.consecutive_failures >= CRAWL_BREAKER_THRESHOLD:
+                self._trip()
+        else:
+            if outcome == "success":
+                self.successes += 1
+                self.limiter.increase()
+            else:
+                self.empties += 1
+            self.consecutive_failures = 0
+            if self.state != "closed":
+                print(f"[crawl-health] {self.host}: 복구 — closed")
+                self.cooldown = CRAWL_BREAKER_COOLDOWN
+                self._set_state("closed")
+        self._export()
+
+    def _trip(self) -> None:
+        self.trips += 1
+        self._opened_at = time.time()
+        self._set_state("open")
+        print(
+            f"[crawl-health] {self.host}: 연속 실패 {self.consecutive_failures}회 — "
+            f"서킷 open ({self.cooldown:.0f}s)"
+        )
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self._export()
+
+    def _export(self) -> None:
+        CRAWL_BREAKER_STATE.set(_STATE_VALUES[self.state], host=self.host)
+        CRAWL_CONCURRENCY_LIMIT.set(int(self.limiter.limit), host=self.host)
+
+    def stats(self) -> dict:
+        return {
+            "state":                self.state,
+            "retry_in":             round(self.retry_in(), 1) if self.state == "open" else 0,
+            "cooldown":             self.cooldown,
+            "consecutive_failures": self.consecutive_failures,
+            "concurrency":          self.limiter.stats(),
+            "successes":            self.successes,
+            "empties":              self.empties,
+            "failures":             self.failures,
+            "rejected":             self.rejected,
+            "trips":                self.trips,
+        }
+
+
+class CrawlHealth:
+    """호스트별 HostHealth 레지스트리."""
+
+    def __init__(self) -> None:
+        self._hosts: Dict[str, HostHealth] = {}
+
+    def host(self, host: str) -> HostHealth:
+        h = self._hosts.get(host)
+        if h is None:
+            h = self._hosts[host] = HostHealth(host)
+        return h
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[HostHealth]:
+        """브레이커 확인 + 동시성 슬롯 확보. 블록 안에서 record()로 결과를 알려야 함."""
+        h = self.host(host)
+        if not h.allow():
+            raise CircuitOpen(host, h.retry_in())
+        try:
+            await h.limiter.acquire()
+        except BaseException:
+            h._probing = False
+            raise
+        try:
+            yield h
+        finally:
+            h.limiter.release()
+            h._probing = False   # 결과 기록 없이 취소된 탐색 → 다음 요청이 다시 탐색
+
+    def stats(self) -> dict:
+        return {host: h.stats() for host, h in self._hosts.items()}
+
+
+crawl_health = CrawlHealth()
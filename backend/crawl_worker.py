@@ -0,0 +1,438 @@
+"""
+크롤링 워커 프로세스 + SQLite 작업 큐
+=====================================
+uvicorn 워커가 여러 개면 API 프로세스마다 Chromium을 띄우고, 크롤링 CPU가 요청 처리와
+경쟁합니다. CRAWL_MODE=worker이면 API 프로세스는 크롤링을 직접 하지 않고 작업 큐에
+넣은 뒤 워커 완료를 기다립니다.
+
+  - 큐: data/crawl-jobs.sqlite3 (WAL) — 프로세스 재시작에도 유지
+  - 중복 제거: 같은 브랜드의 queued/running 작업이 있으면 새로 넣지 않고 그 작업을 기다림
+    (부분 유니크 인덱스로 보장, 프로세스 안에서는 crawler의 single-flight가 먼저 병합)
+  - 호스트 전체 동시 크롤링 수: CRAWL_WORKER_CONCURRENCY
+    (작업 점유가 BEGIN IMMEDIATE 트랜잭션 안에서 running 개수를 확인)
+  - 결과는 워커가 musinsa-cache.sqlite3에 저장 → API는 완료 후 저장소에서 읽어 메모리 LRU 갱신
+  - 워커가 죽어 running으로 남은 작업은 CRAWL_JOB_LEASE 후 재시도,
+    CRAWL_JOB_MAX_ATTEMPTS회 실패하면 failed
+
+실행:
+  워커 풀:  python crawl_worker.py --workers 2
+  API:      CRAWL_MODE=worker uvicorn main:app --workers 4
+  큐 상태:  python crawl_worker.py --stats
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import crawler
+from crawler import CRAWL_HARD_TIMEOUT, DATA_DIR, _cache_key, crawl_cache, refresh_brand
+
+JOBS_DB_PATH = DATA_DIR / "crawl-jobs.sqlite3"
+
+CRAWL_WORKER_CONCURRENCY = int(os.getenv("CRAWL_WORKER_CONCURRENCY", "4"))    # 호스트 전체
+CRAWL_JOB_LEASE          = float(os.getenv("CRAWL_JOB_LEASE", str(CRAWL_HARD_TIMEOUT + 30)))
+CRAWL_JOB_MAX_ATTEMPTS   = int(os.getenv("CRAWL_JOB_MAX_ATTEMPTS", "3"))
+CRAWL_JOB_WAIT           = float(os.getenv("CRAWL_JOB_WAIT", str(CRAWL_HARD_TIMEOUT * 2)))
+CRAWL_JOB_POLL           = float(os.getenv("CRAWL_JOB_POLL", "0.25"))
+CRAWL_JOB_RETENTION      = 24 * 3600   # 끝난 작업 행 보관 (초)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 작업 큐 (SQLite)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class JobQueue:
+    """프로세스 간 공유되는 브랜드 크롤링 작업 큐. 모든 메서드는 동기 (to_thread로 호출)."""
+
+    def __init__(self, path) -> None:
+        self.path  = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "  id          INTEGER PRIMARY KEY AUTOINCREMENT,"
+                "  brand_id    TEXT NOT NULL,"
+                "  brand       TEXT NOT NULL,"            # brand_data JSON
+                "  status      TEXT NOT NULL,"            # queued / running / done / failed
+                "  attempts    INTEGER NOT NULL DEFAULT 0,"
+                "  worker      TEXT,"
+                "  items       INTEGER,"
+                "  error       TEXT,"
+                "  enqueued_at REAL NOT NULL,"
+                "  started_at  REAL,"
+                "  finished_at REAL"
+                ")"
+            )
+            # 브랜드당 진행 중 작업은 하나 — 중복 제거의 기준
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS jobs_active ON jobs (brand_id)"
+                " WHERE status IN ('queued', 'running')"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE — 다른 프로세스의 점유/등록과 직렬화)."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, brand_data: Dict) -> Tuple[int, bool]:
+        """(작업 id, 새로 등록했는지). 같은 브랜드의 진행 중 작업이 있으면 그 id."""
+        brand_id = _cache_key(brand_data)
+        with self._tx() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE brand_id = ? AND status IN ('queued', 'running')",
+                (brand_id,),
+            ).fetchone()
+            if row:
+                return row[0], False
+            cur = conn.execute(
+                "INSERT INTO jobs (brand_id, brand, status, enqueued_at) VALUES (?, ?, 'queued', ?)",
+                (brand_id, json.dumps(brand_data, ensure_ascii=False), time.time()),
+            )
+            return cur.lastrowid, True
+
+    def claim(self, worker: str, limit: int) -> Optional[Tuple[int, Dict]]:
+        """가장 오래된 queued 작업 점유. 호스트 전체 running이 limit 이상이면 None."""
+        now = time.time()
+        with self._tx() as conn:
+            self._expire_leases(conn, now)
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running'").fetchone()[0]
+            if running >= limit:
+                return None
+            row = conn.execute(
+                "SELECT id, brand FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                (worker, now, row[0]),
+            )
+        return row[0], json.loads(row[1])
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float) -> None:
+        """임대 시간이 지난 running 작업(워커 비정상 종료) → 재시도 또는 failed."""
+        cutoff = now - CRAWL_JOB_LEASE
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = 'lease expired', finished_at = ?"
+            " WHERE status = 'running' AND started_at < ? AND attempts >= ?",
+            (now, cutoff, CRAWL_JOB_MAX_ATTEMPTS),
+        )
+        conn.execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL"
+            " WHERE status = 'running' AND started_at < ?",
+            (cutoff,),
+        )
+
+    def release(self, job_id: int) -> None:
+        """점유 해제 (워커 종료로 중단된 작업) — 다른 워커가 바로 다시 점유할 수 있게."""
+        with self._tx() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL, attempts = attempts - 1"
+                " WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def finish(self, job_id: int, items: int, error: Optional[str] = None) -> None:
+        with self._tx() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, items = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "done", items, error, time.time(), job_id),
+            )
+
+    def results(self, job_ids: List[int]) -> Dict[int, Tuple[str, Optional[str]]]:
+        """끝난 작업만 {id: (status, error)}."""
+        if not job_ids:
+            return {}
+        marks = ",".join("?" * len(job_ids))
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT id, status, error FROM jobs WHERE id IN ({marks})"
+                " AND status IN ('done', 'failed')",
+                job_ids,
+            ).fetchall()
+        return {job_id: (status, error) for job_id, status, error in rows}
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+
+    def prune(self, before_ts: float) -> int:
+        with self._tx() as conn:
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (before_ts,),
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+job_queue = JobQueue(JOBS_DB_PATH)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# API 프로세스 쪽 — 등록 + 완료 대기
+# ══════════════════════════════════════════════════════════════════════════════
+
+class CrawlDispatcher:
+    """작업 등록 후 완료를 기다림. 대기 중인 작업 전체를 폴러 하나가 한 번의 쿼리로 확인."""
+
+    def __init__(self, queue: JobQueue, wait: float = CRAWL_JOB_WAIT, poll: float = CRAWL_JOB_POLL) -> None:
+        self.queue = queue
+        self.wait  = wait
+        self.poll  = poll
+        self._waiters: Dict[int, "asyncio.Future[Tuple[str, Optional[str]]]"] = {}
+        self._refs: Dict[int, int] = {}     # 작업별 대기자 수 — 0이 되면 대기 목록에서 제거
+        self._poller: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.joined   = 0     # 다른 프로세스가 이미 등록한 작업에 합류
+        self.timeouts = 0
+        self.failed   = 0
+
+    async def crawl(self, brand_data: Dict) -> Optional[str]:
+        """워커가 크롤링/저장을 끝낼 때까지 대기. 성공 시 None, 실패 시 오류 메시지."""
+        job_id, created = await asyncio.to_thread(self.queue.enqueue, brand_data)
+        if created:
+            self.enqueued += 1
+        else:
+            self.joined += 1
+
+        fut = self._waiters.get(job_id)
+        if fut is None:
+            fut = self._waiters[job_id] = asyncio.get_running_loop().create_future()
+        self._refs[job_id] = self._refs.get(job_id, 0) + 1
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+
+        try:
+            # shield: 한 대기자의 시간 초과/취소가 같은 작업의 다른 대기자에게 번지지 않도록
+            status, error = await asyncio.wait_for(asyncio.shield(fut), self.wait)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return f"작업 {job_id} 대기 {self.wait:.0f}s 초과"
+        finally:
+            # 마지막 대기자가 떠나면(완료/시간 초과/취소) 대기 목록에서 제거 — 폴러도 멈춤
+            self._refs[job_id] -= 1
+            if not self._refs[job_id]:
+                del self._refs[job_id]
+                self._waiters.pop(job_id, None)
+        if status == "failed":
+            self.failed += 1
+            return error or "failed"
+        return None
+
+    async def _poll(self) -> None:
+        while self._waiters:
+            await asyncio.sleep(self.poll)
+            try:
+                finished = await asyncio.to_thread(self.queue.results, list(self._waiters))
+            except Exception as e:
+                print(f"[crawl-queue] 상태 조회 오류: {e}")
+                continue
+            for job_id, result in finished.items():
+                fut = self._waiters.pop(job_id, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(result)
+
+    async def stats(self) -> dict:
+        queue = {}
+        if crawler.CRAWL_MODE == "worker":
+            queue = await asyncio.to_thread(self.queue.counts)
+        return {
+            "mode":     crawler.CRAWL_MODE,
+            "enqueued": self.enqueued,
+            "joined":   self.joined,
+            "waiting":  len(self._waiters),
+            "timeouts": self.timeouts,
+            "failed":   self.failed,
+            "queue":    queue,
+        }
+
+
+dispatcher = CrawlDispatcher(job_queue)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 워커 프로세스
+# ══════════════════════════════════════════════════════════════════════════════
+
+class CrawlWorker:
+    """큐에서 작업을 점유해 crawler.refresh_brand로 크롤링 + 공유 캐시 저장."""
+
+    def __init__(self, queue: JobQueue, name: str, slots: int = CRAWL_WORKER_CONCURRENCY) -> None:
+        self.queue = queue
+        self.name  = name
+        self.slots = slots
+
+        self.done   = 0
+        self.failed = 0
+
+    async def run_job(self, job_id: int, brand_data: Dict) -> None:
+        cache_key = _cache_key(brand_data)
+        started = time.time()
+        error: Optional[str] = None
+        items = 0
+        try:
+            products = await refresh_brand(brand_data)
+            items = len(products)
+            # 실패(이전 결과 유지)/서킷 open으로 저장되지 않았으면 실패
+            # (대기자가 예전 엔트리를 새 결과로 오인하지 않도록)
+            entry = await asyncio.to_thread(crawl_cache.store.get, cache_key)
+            if not entry or entry.get("ts", 0) < started:
+                error = "결과 저장 안 됨 (크롤링 실패 또는 서킷 open)"
+        except asyncio.CancelledError:
+            # shield: 종료 중 한 번 더 취소돼도 해제 쿼리는 스레드에서 끝까지 실행
+            await asyncio.shield(asyncio.to_thread(self.queue.release, job_id))
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        await asyncio.to_thread(self.queue.finish, job_id, items, error)
+        if error:
+            self.failed += 1
+            print(f"[crawl-worker] {self.name} 작업 {job_id} ({cache_key}) 실패: {error}")
+        else:
+            self.done += 1
+            print(f"[crawl-worker] {self.name} 작업 {job_id} ({cache_key}) 완료: {items}개")
+
+    async def _slot(self, drain: bool) -> None:
+        while True:
+            job = await asyncio.to_thread(self.queue.claim, self.name, CRAWL_WORKER_CONCURRENCY)
+            if job is None:
+                if drain and await asyncio.to_thread(self.queue.pending) == 0:
+                    return
+                await asyncio.sleep(CRAWL_JOB_POLL)
+                continue
+            await self.run_job(*job)
+
+    async def _prune_forever(self) -> None:
+        while True:
+            try:
+                n = await asyncio.to_thread(self.queue.prune, time.time() - CRAWL_JOB_RETENTION)
+                if n:
+                    print(f"[crawl-worker] 끝난 작업 {n}개 정리")
+            except Exception as e:
+                print(f"[crawl-worker] 정리 오류: {e}")
+            await asyncio.sleep(600)
+
+    async def run(self, drain: bool = False) -> None:
+        """drain=True면 큐가 빌 때까지만 처리하고 종료."""
+        crawler.CRAWL_MODE = "inline"   # 워커 자신은 직접 크롤링 (.env를 API와 공유해도 무방)
+        print(f"[crawl-worker] {self.name} 시작 (슬롯 {self.slots}, 호스트 상한 {CRAWL_WORKER_CONCURRENCY})")
+        pruner = asyncio.ensure_future(self._prune_forever())
+        try:
+            await asyncio.gather(*(self._slot(drain) for _ in range(self.slots)))
+        finally:
+            pruner.cancel()
+
+
+async def _run_worker(name: str, slots: int, drain: bool) -> None:
+    from browser_pool import browser_pool
+
+    worker = CrawlWorker(job_queue, name, slots)
+    # 풀(부모)의 SIGTERM → 진행 중 작업을 큐로 돌려놓고 브라우저 정리 후 종료
+    main_task = asyncio.current_task()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, main_task.cancel)
+    try:
+        await worker.run(drain)
+    finally:
+        await browser_pool.close()
+        crawl_cache.store.close()
+        job_queue.close()
+    print(f"[crawl-worker] {name} 종료: 완료 {worker.done}개, 실패 {worker.failed}개")
+
+
+def _run_pool(workers: int, slots: int) -> None:
+    """워커 프로세스 N개 실행 + 비정상 종료 시 재시작. SIGINT/SIGTERM으로 전체 종료."""
+    stopping = False
+
+    def _stop(*_) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    def spawn(i: int) -> subprocess.Popen:
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--name", f"worker-{i}", "--slots", str(slots)]
+        )
+
+    procs = [spawn(i) for i in range(workers)]
+    print(f"[crawl-worker] 워커 {workers}개 실행 (PID {', '.join(str(p.pid) for p in procs)})")
+    while not stopping:
+        time.sleep(1)
+        for i, p in enumerate(procs):
+            if p.poll() is not None and not stopping:
+                print(f"[crawl-worker] worker-{i} 종료 (코드 {p.returncode}) — 재시작")
+                procs[i] = spawn(i)
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        try:
+            p.wait(timeout=CRAWL_HARD_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤링 워커 (SQLite 작업 큐)")
+    parser.add_argument("--workers", type=int, default=0, help="워커 프로세스 N개 실행 (풀 모드)")
+    parser.add_argument("--name", default=f"worker-{os.getpid()}")
+    parser.add_argument("--slots", type=int, default=CRAWL_WORKER_CONCURRENCY,
+                        help="프로세스당 동시 작업 수 (호스트 전체는 CRAWL_WORKER_CONCURRENCY)")
+    parser.add_argument("--once", action="store_true", help="큐가 빌 때까지만 처리 후 종료")
+    parser.add_argument("--stats", action="store_true", help="큐 상태 출력")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(job_queue.counts(), ensure_ascii=False))
+    elif args.workers:
+        _run_pool(args.workers, args.slots)
+    else:
+        try:
+            asyncio.run(_run_worker(args.name, args.slots, args.once))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
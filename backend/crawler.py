@@ -6,25 +6,93 @@ kpop-brands.json에 정의된 브랜드 페이지를 Playwright(Chromium)로 직
 
   - debug-crawl/route.js (Puppeteer) 로직을 Python async Playwright로 1:1 포팅
   - 이미지 없을 경우 msscdn.net CDN URL을 goodsNo로 직접 구성
-  - 결과는 6시간 단위로 backend/data/musinsa-cache.json에 캐싱
+  - 결과는 6시간 단위로 캐싱 (메모리 LRU + backend/data/musinsa-cache.sqlite3)
+  - Chromium은 browser_pool.py의 상주 브라우저를 공유 (크롤링마다 기동하지 않음)
+  - 기본은 경량 HTTP 추출(http_extract.py) 우선, 파싱 실패 시에만 Playwright
+  - CRAWL_RECORD_DIR / CRAWL_REPLAY_DIR: 렌더링된 페이지 녹화 → 오프라인 재생 (bench_extract.py)
+  - 여러 브랜드는 컨텍스트 하나의 탭들로 병렬 크롤링 (crawl_brands, 동시 미스는 TabBatcher가 묶음)
 
 초기 설치:
   pip install -r requirements.txt
   playwright install chromium
 """
 
+import asyncio
 import json
+import os
+import re
 import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
 
-from playwright.async_api import async_playwright
+from playwright.async_api import BrowserContext, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from browser_pool import browser_pool
+from cache_store import SQLiteStore, TieredCache
+from catalog import ProductCatalog
+from crawl_health import CircuitOpen, crawl_health
+from http_extract import fetch_listing
+from metrics import CACHE_REQUESTS, CRAWL_RESULTS, stage_timer
+from serialization import JsonSnapshot
+from singleflight import SingleFlight
 
 # ── 경로 ──────────────────────────────────────────────────────────────────────
-DATA_DIR    = Path(__file__).parent / "data"
-CACHE_PATH  = DATA_DIR / "musinsa-cache.json"
-BRANDS_PATH = DATA_DIR / "kpop-brands.json"
-CACHE_TTL   = 6 * 3600  # 6시간
+DATA_DIR      = Path(os.getenv("DATA_DIR", str(Path(__file__).parent / "data")))
+CACHE_PATH    = DATA_DIR / "musinsa-cache.json"     # 레거시 (가져오기/내보내기 전용)
+CACHE_DB_PATH = DATA_DIR / "musinsa-cache.sqlite3"
+CATALOG_DB_PATH = DATA_DIR / "catalog.sqlite3"     # goods_no 단위 상품 인덱스 (catalog.py)
+BRANDS_PATH   = DATA_DIR / "kpop-brands.json"       # 편집 원본 (STORE_FORMAT=msgpack이면 .msgpack 스냅샷)
+CACHE_TTL     = 6 * 3600  # 6시간
+
+# 상품 0개(정상 응답) / 크롤링 실패 결과의 TTL — 6시간 동안 빈 목록을 고정하지 않도록 짧게.
+# 실패 시 이전 정상 결과가 있으면 덮어쓰지 않음
+CRAWL_EMPTY_TTL  = int(os.getenv("CRAWL_EMPTY_TTL", "1800"))
+CRAWL_FAILED_TTL = int(os.getenv("CRAWL_FAILED_TTL", "300"))
+
+# TTL이 지났어도 이 시간까지는 즉시 응답하고 백그라운드에서 갱신 (stale-while-revalidate)
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", str(24 * 3600)))
+# TTL의 이 비율을 넘긴 fresh 엔트리는 히트 시 미리 갱신 (refresh-ahead)
+CACHE_REFRESH_AHEAD = float(os.getenv("CACHE_REFRESH_AHEAD", "0.8"))
+
+# 추출 엔진: auto (HTTP 우선 → 실패 시 Playwright) | http | playwright
+CRAWL_BACKEND = os.getenv("CRAWL_BACKEND", "auto")
+
+# 브랜드 1회 크롤링 상한(초). 요청 데드라인이 지나도 크롤링은 백그라운드에서 계속되며,
+# 이 시간을 넘기면 취소(Playwright 페이지/컨텍스트 닫힘)하고 캐시에 저장하지 않음
+CRAWL_HARD_TIMEOUT = float(os.getenv("CRAWL_HARD_TIMEOUT", "60"))
+
+# inline: API 프로세스에서 직접 크롤링 / worker: crawl_worker.py 작업 큐에 넣고 결과 대기
+CRAWL_MODE = os.getenv("CRAWL_MODE", "inline")
+
+# 녹화/재생 (오프라인 추출 검증·벤치마크 — bench_extract.py)
+#   CRAWL_RECORD_DIR: Playwright로 렌더링한 브랜드 페이지를 <brand_id>.html(+ 추출 결과 .json)로 저장
+#   CRAWL_REPLAY_DIR: 네트워크 대신 저장된 스냅샷으로 페이지를 채움. 그 외 요청은 모두 차단하고
+#                     HTTP 엔진도 건너뜀 → 항상 _crawl_brand_playwright 경로로 추출
+CRAWL_RECORD_DIR = os.getenv("CRAWL_RECORD_DIR", "")
+CRAWL_REPLAY_DIR = os.getenv("CRAWL_REPLAY_DIR", "")
+SNAPSHOT_DIR     = DATA_DIR / "snapshots"   # bench_extract.py 기본 위치
+
+# 진행 중인 크롤링 (brand_id → Task) — 동시 미스/백그라운드 갱신 병합용
+_crawl_flight: SingleFlight[List[Dict]] = SingleFlight("crawl")
+
+# 키별 조회 빈도 (프리워밍 우선순위) / fresh·stale·miss 집계 / 백그라운드 갱신 Task 참조
+cache_hits:   Counter = Counter()
+cache_events: Counter = Counter()
+
+# 아직 저장소에 반영하지 않은 조회 수 — HITS_FLUSH_INTERVAL마다 crawl_cache.store.add_hits
+# (refresher.py를 별도 프로세스로 돌려도 같은 우선순위를 보도록)
+HITS_FLUSH_INTERVAL = float(os.getenv("HITS_FLUSH_INTERVAL", "30"))
+_unflushed_hits: Counter = Counter()
+_hits_flushed_at = 0.0
+
+# 추출 엔진별 결과 집계 (http_ok / http_failed / playwright)
+backend_events: Counter = Counter()
+_bg_tasks: Set["asyncio.Task"] = set()
 
 # ── 예산 범위 ─────────────────────────────────────────────────────────────────
 BUDGET_RANGE: Dict[str, Tuple[int, int]] = {
@@ -41,13 +109,61 @@ _UA = (
     "Chrome/122.0.0.0 Safari/537.36"
 )
 
+# ── fast 모드 (리소스 차단 + 셀렉터 기반 준비 대기) ──────────────────────────
+CRAWL_FAST_MODE         = os.getenv("CRAWL_FAST_MODE", "1") == "1"
+CRAWL_READY_COUNT       = int(os.getenv("CRAWL_READY_COUNT", "12"))      # 목록 한 페이지(스크롤 1회)분 상품 수
+CRAWL_READY_TIMEOUT_MS  = int(os.getenv("CRAWL_READY_TIMEOUT_MS", "8000"))
+
+# ── 다중 탭 크롤링 (공유 컨텍스트 하나에 브랜드/카테고리별 탭) ───────────────
+#   CRAWL_PAGES: 브랜드 목록을 몇 페이지까지 읽을지 (2 이상이면 무한 스크롤로 추가 로드)
+#   CRAWL_CATEGORIES: 비우면 전체 인기순 목록 1개, "all"이면 브랜드의 categories 전부,
+#                     "outer,top"처럼 지정하면 브랜드가 가진 것만 — 카테고리마다 탭 1개
+#   CRAWL_MAX_TABS: 컨텍스트 하나에서 동시에 여는 탭 수
+#   CRAWL_BATCH_WINDOW_MS: 이 시간 안에 시작된 Playwright 크롤링을 한 컨텍스트로 묶음 (0: 묶지 않음)
+CRAWL_PAGES           = max(1, int(os.getenv("CRAWL_PAGES", "1")))
+CRAWL_CATEGORIES      = [c.strip() for c in os.getenv("CRAWL_CATEGORIES", "").split(",") if c.strip()]
+CRAWL_MAX_TABS        = int(os.getenv("CRAWL_MAX_TABS", "4"))
+CRAWL_BATCH_WINDOW_MS = int(os.getenv("CRAWL_BATCH_WINDOW_MS", "50"))
+
+# kpop-brands.json categories → 무신사 카테고리 코드 (브랜드 상품 목록 categoryCode 필터)
+MUSINSA_CATEGORY_CODES: Dict[str, str] = {
+    "top":    "001",
+    "outer":  "002",
+    "bottom": "003",
+    "dress":  "100",
+}
+
+_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+_BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook",
+    "criteo",
+    "kakaopixel",
+    "analytics.tiktok.com",
+    "braze.com",
+    "appsflyer.com",
+)
+
+# 상품 앵커(_JS_EXTRACT와 같은 조건)가 n개 이상 렌더링됐는지
+_JS_READY = """(n) => Array.from(document.querySelectorAll('a[href*="/products/"]'))
+    .filter(a => /\\/products\\/\\d+/.test(a.href) && a.innerText?.trim().length > 2)
+    .length >= n"""
+
+# 최근 크롤링 소요 시간 기록
+crawl_timings: Deque[Dict] = deque(maxlen=200)
+
 # page.evaluate에 넘길 JS (Puppeteer debug-crawl/route.js와 동일 로직)
-_JS_EXTRACT = """(brandName) => {
+# 인자: 브랜드명 또는 [브랜드명, 최대 개수] (기본 12개 — 인기순 첫 페이지)
+_JS_EXTRACT = """(arg) => {
+    const [brandName, limit] = Array.isArray(arg) ? arg : [arg, 12];
     const results = [];
     const nameLinks = Array.from(document.querySelectorAll('a'))
         .filter(a => /\\/products\\/\\d+/.test(a.href) && a.innerText?.trim().length > 2);
 
-    nameLinks.slice(0, 12).forEach(link => {
+    nameLinks.slice(0, limit).forEach(link => {
         const name = link.innerText?.trim();
         if (!name) return;
 
@@ -96,32 +212,39 @@ _JS_EXTRACT = """(brandName) => {
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-# 캐시 I/O
+# 캐시 (메모리 LRU + SQLite)
 # ══════════════════════════════════════════════════════════════════════════════
 
-def load_cache() -> dict:
-    try:
-        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+crawl_cache = TieredCache(
+    SQLiteStore(CACHE_DB_PATH, table="musinsa"),
+    maxsize=int(os.getenv("CACHE_MAX_ENTRIES", "2048")),
+    ttl=CACHE_STALE_TTL,   # 신선도(CACHE_TTL)는 search_brand_cached에서 판단
+)
 
+# 크롤링 결과를 goods_no 단위로 유지 — 바뀐 행만 기록 (/api/products)
+catalog = ProductCatalog(CATALOG_DB_PATH)
 
-def save_cache(cache: dict) -> None:
-    DATA_DIR.mkdir(exist_ok=True)
-    CACHE_PATH.write_text(
-        json.dumps(cache, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+
+def migrate_json_cache() -> int:
+    """레거시 musinsa-cache.json을 SQLite로 가져오기 (저장소가 비어 있을 때만)."""
+    if not CACHE_PATH.exists() or crawl_cache.store.count() > 0:
+        return 0
+    n = crawl_cache.store.import_json(CACHE_PATH)
+    print(f"[cache] {CACHE_PATH.name} → {CACHE_DB_PATH.name}: {n}개 키 이전")
+    return n
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 브랜드 데이터 로드
 # ══════════════════════════════════════════════════════════════════════════════
 
+brands_snapshot = JsonSnapshot(BRANDS_PATH)
+
+
 def load_brands() -> List[Dict]:
+    """kpop-brands.json 브랜드 목록 (처음 사용할 때 읽고, 파일이 바뀌었을 때만 다시 읽음)."""
     try:
-        data = json.loads(BRANDS_PATH.read_text(encoding="utf-8"))
-        return data.get("brands", [])
+        return list(brands_snapshot.get().get("brands", []))
     except Exception as e:
         print(f"[brands] kpop-brands.json 로드 실패: {e}")
         return []
@@ -142,6 +265,14 @@ _STYLE_MAP: Dict[str, List[str]] = {
     "럭셔리 캐주얼": ["럭셔리", "하이엔드", "아방가르드", "아티스틱"],
 }
 
+# 체형 → 체형을 보완하는 핏/스타일 태그 키워드 ("표준"은 보너스 없음)
+_BODY_TYPE_MAP: Dict[str, List[str]] = {
+    "마른 체형": ["오버핏", "레이어드", "그래픽", "스트릿"],
+    "근육형":    ["베이직", "미니멀", "크린핏", "스포티"],
+    "통통":      ["오버핏", "젠더리스", "미니멀", "베이직"],
+    "마른 비만": ["레이어드", "오버핏", "테일러드"],
+}
+
 
 def calc_match_score(user_input: dict, brand: dict) -> int:
     score = 0
@@ -168,6 +299,11 @@ def calc_match_score(user_input: dict, brand: dict) -> int:
         if brand_min <= budget[1] and brand_max >= budget[0]:
             score += 25
 
+    # 체형 보너스 (+5)
+    body_keywords = _BODY_TYPE_MAP.get(user_input.get("body_type", ""), [])
+    if body_keywords and any(any(kw in bt for kw in body_keywords) for bt in brand_tags):
+        score += 5
+
     # 아이돌 레퍼런스 보너스 (+5)
     if any(ref.get("confirmed") for ref in brand.get("idol_references", [])):
         score += 5
@@ -181,6 +317,10 @@ def rank_brands(user_input: dict, brands: List[Dict]) -> List[Dict]:
     return [b for _, b in scored]
 
 
+class CrawlError(Exception):
+    """크롤링 실패 (차단/타임아웃/렌더링 오류) — 상품 0개(정상 응답)와 구분."""
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # CDN URL 유틸
 # ══════════════════════════════════════════════════════════════════════════════
@@ -202,55 +342,444 @@ def _cdn_url(goods_no: str) -> str:
 
 async def _crawl_brand_playwright(
     brand_data: Dict,
-    budget: Optional[Tuple[int, int]],
-    limit: int,
+    pages: Optional[int] = None,
+    categories: Optional[List[str]] = None,
 ) -> List[Dict]:
     """
     Playwright(Chromium)로 브랜드 페이지를 렌더링하여 상품 추출.
     debug-crawl/route.js Puppeteer 로직과 동일.
+    예산 필터/개수 제한 없이 추출된 전체 상품을 인기순 그대로 반환. 실패 시 CrawlError.
+
+    브랜드 하나만 크롤링 (자체 컨텍스트). 여러 브랜드는 crawl_brands()로 한 컨텍스트를 공유.
     """
-    musinsa_url = brand_data.get("musinsa_url", "")
-    if not musinsa_url:
+    if not brand_data.get("musinsa_url"):
         print(f"[playwright] {brand_data.get('name_ko', '?')}: musinsa_url 없음")
         return []
+    try:
+        async with _crawl_context() as ctx:
+            return await _crawl_brand_tabs(
+                ctx, asyncio.Semaphore(CRAWL_MAX_TABS), brand_data, pages, categories
+            )
+    except CrawlError:
+        raise
+    except Exception as e:   # 컨텍스트 생성 실패 (브라우저 기동 오류 등)
+        print(f"[playwright] {brand_data.get('name_ko', '?')} 실패: {e}")
+        CRAWL_RESULTS.inc(brand=brand_data.get("id", ""), outcome="failure")
+        raise CrawlError(f"playwright: {e}") from e
+
+
+async def crawl_brands(
+    brands: List[Dict],
+    pages: Optional[int] = None,
+    categories: Optional[List[str]] = None,
+    max_tabs: int = CRAWL_MAX_TABS,
+) -> AsyncIterator[Tuple[Dict, List[Dict], Optional[CrawlError]]]:
+    """
+    여러 브랜드를 공유 컨텍스트 하나의 탭들로 병렬 크롤링 (동시 탭 max_tabs개).
+    끝나는 순서대로 (브랜드, 상품, 오류) 반환 — 실패한 브랜드는 ([], CrawlError).
 
-    url = musinsa_url + "?sortCode=POPULAR"
+      async for brand, products, error in crawl_brands(top3, pages=2, categories=["all"]):
+          ...
+
+    pages / categories는 브랜드마다 적용 (기본: CRAWL_PAGES / CRAWL_CATEGORIES).
+    중간에 빠져나오면 남은 탭은 취소되고 컨텍스트가 닫힘.
+    """
+    async with _crawl_context() as ctx:
+        tasks = _start_tabs(ctx, brands, pages, categories, max_tabs)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is not None and not isinstance(error, CrawlError):
+                        error = CrawlError(f"playwright: {error}")
+                    yield tasks[task], (task.result() if error is None else []), error
+        finally:
+            await _cancel_all(tasks)
+
+
+def _start_tabs(
+    ctx: BrowserContext,
+    brands: List[Dict],
+    pages: Optional[int],
+    categories: Optional[List[str]],
+    max_tabs: int,
+) -> Dict["asyncio.Task", Dict]:
+    tabs = asyncio.Semaphore(max_tabs)
+    return {
+        asyncio.ensure_future(_crawl_brand_tabs(ctx, tabs, b, pages, categories)): b
+        for b in brands
+    }
+
+
+async def _cancel_all(tasks) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@asynccontextmanager
+async def _crawl_context() -> AsyncIterator[BrowserContext]:
+    """크롤링용 컨텍스트 (위장 스크립트, fast 모드 리소스 차단은 컨텍스트의 모든 탭에 적용)."""
+    async with browser_pool.context(
+        user_agent=_UA,
+        locale="ko-KR",
+        extra_http_headers={"Accept-Language": "ko-KR,ko;q=0.9"},
+    ) as ctx:
+        await ctx.add_init_script(
+            "Object.defineProperty(navigator,'webdriver',{get:()=>undefined})"
+        )
+        if CRAWL_FAST_MODE and not CRAWL_REPLAY_DIR:
+            await ctx.route("**/*", _block_heavy_requests)
+        yield ctx
+
+
+def _brand_categories(brand_data: Dict, categories: Optional[List[str]]) -> List[str]:
+    """크롤링할 카테고리 (브랜드가 가진 것 중 무신사 코드가 있는 것만, kpop-brands.json 순서)."""
+    wanted = CRAWL_CATEGORIES if categories is None else categories
+    if not wanted:
+        return []
+    own = brand_data.get("categories", [])
+    names = own if "all" in wanted else [c for c in own if c in wanted]
+    return [c for c in names if c in MUSINSA_CATEGORY_CODES]
+
+
+def _listing_urls(brand_data: Dict, categories: List[str]) -> List[str]:
+    """탭별 목록 URL — 카테고리가 없으면 전체 인기순 목록 하나."""
+    base = brand_data["musinsa_url"] + "?sortCode=POPULAR"
+    if not categories:
+        return [base]
+    return [f"{base}&categoryCode={MUSINSA_CATEGORY_CODES[c]}" for c in categories]
+
+
+async def _crawl_brand_tabs(
+    ctx: BrowserContext,
+    tabs: asyncio.Semaphore,
+    brand_data: Dict,
+    pages: Optional[int],
+    categories: Optional[List[str]],
+) -> List[Dict]:
+    """브랜드 하나 — 목록(카테고리)마다 탭 하나, 탭 결과를 인기순 순위별로 교차 병합."""
+    if not brand_data.get("musinsa_url"):
+        print(f"[playwright] {brand_data.get('name_ko', '?')}: musinsa_url 없음")
+        return []
     brand_name = brand_data.get("name_ko", "")
-    print(f"[playwright] 접속: {url}")
+    pages = max(1, pages or CRAWL_PAGES)
+    cats = _brand_categories(brand_data, categories)
+    replay_html = None
+    if CRAWL_REPLAY_DIR:
+        # 스냅샷은 전체 목록 첫 페이지뿐
+        try:
+            replay_html = load_snapshot(CRAWL_REPLAY_DIR, brand_data["id"])[0]
+        except OSError as e:
+            print(f"[playwright] {brand_name} 스냅샷 없음: {e}")
+            CRAWL_RESULTS.inc(brand=brand_data.get("id", ""), outcome="failure")
+            raise CrawlError(f"replay: {e}") from e
+        pages, cats = 1, []
+    urls = _listing_urls(brand_data, cats)
 
-    raw_items: List[Dict] = []
-    try:
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(
-                headless=True,
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-blink-features=AutomationControlled",
-                ],
-            )
-            page = await browser.new_page()
-            await page.set_user_agent(_UA)
-            await page.set_extra_http_headers({"Accept-Language": "ko-KR,ko;q=0.9"})
-            await page.add_init_script(
-                "Object.defineProperty(navigator,'webdriver',{get:()=>undefined})"
-            )
+    timing: Dict[str, float] = {"tabs": len(urls), "pages": pages}
+    t0 = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            _crawl_tab(ctx, tabs, brand_data, url, pages, replay_html, timing if i == 0 else None, t0)
+            for i, url in enumerate(urls)
+        ),
+        return_exceptions=True,
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for e in errors:
+        print(f"[playwright] {brand_name} 실패: {e}")
+    if len(errors) == len(results):
+        _record_timing(brand_data, timing, t0, 0, ok=False)
+        CRAWL_RESULTS.inc(brand=brand_data.get("id", ""), outcome="failure")
+        raise CrawlError(f"playwright: {errors[0]}") from errors[0]
 
+    raw_items = _merge_listings([r for r in results if not isinstance(r, BaseException)])
+    _record_timing(brand_data, timing, t0, len(raw_items), ok=True)
+    products = _normalize_items(raw_items, brand_name)
+    _count_result(brand_data, products)
+    print(f"[playwright] {brand_name}: 최종 {len(products)}개 상품 (탭 {len(urls)}개)")
+    return products
+
+
+async def _crawl_tab(
+    ctx: BrowserContext,
+    tabs: asyncio.Semaphore,
+    brand_data: Dict,
+    url: str,
+    pages: int,
+    replay_html: Optional[str],
+    timing: Optional[Dict[str, float]],
+    t0: float,
+) -> List[Dict]:
+    """탭 하나에서 목록 렌더링 → (pages > 1이면 스크롤로 추가 로드) → _JS_EXTRACT. timing은 첫 탭만."""
+    brand_name = brand_data.get("name_ko", "")
+    timing = timing if timing is not None else {}
+    async with tabs, browser_pool.new_page(ctx) as page:   # 탭마다 풀의 페이지 슬롯 하나
+        print(f"[playwright] 접속: {url}")
+        if replay_html is not None:
+            await page.route("**/*", replay_route(replay_html))
+        if CRAWL_FAST_MODE or replay_html is not None:
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+            timing["goto_ms"] = _ms_since(t0)
+            try:
+                # 상품 앵커가 목표 개수만큼 렌더링되면 즉시 추출
+                await page.wait_for_function(
+                    _JS_READY, arg=CRAWL_READY_COUNT, timeout=CRAWL_READY_TIMEOUT_MS
+                )
+            except PlaywrightTimeoutError:
+                print(f"[playwright] {brand_name}: 준비 대기 시간 초과 — 현재 상태로 추출")
+        else:
             await page.goto(url, wait_until="networkidle", timeout=30000)
+            timing["goto_ms"] = _ms_since(t0)
             await page.wait_for_timeout(5000)   # React 렌더링 대기
+        timing["ready_ms"] = _ms_since(t0)
 
-            raw_items = await page.evaluate(_JS_EXTRACT, brand_name)
-            print(
-                f"[playwright] {brand_name}: {len(raw_items)}개 추출, "
-                f"이미지: {sum(1 for i in raw_items if i.get('image_url'))}개"
-            )
-            await browser.close()
+        for n in range(2, pages + 1):
+            if not await _load_more(page, n * CRAWL_READY_COUNT):
+                break   # 더 불러올 상품 없음
+        if pages > 1:
+            timing["scroll_ms"] = round(_ms_since(t0) - timing["ready_ms"], 1)
+
+        t_extract = _ms_since(t0)
+        raw_items = await page.evaluate(_JS_EXTRACT, [brand_name, pages * CRAWL_READY_COUNT])
+        timing["extract_ms"] = round(_ms_since(t0) - t_extract, 1)
+        print(
+            f"[playwright] {brand_name}: {len(raw_items)}개 추출, "
+            f"이미지: {sum(1 for i in raw_items if i.get('image_url'))}개"
+        )
+        # 스냅샷은 전체 목록 첫 페이지만 (재생/벤치마크 기준과 같은 조건)
+        if CRAWL_RECORD_DIR and replay_html is None and pages == 1 and "categoryCode" not in url:
+            await _record_snapshot(page, brand_data, url, raw_items)
+        return raw_items
+
+
+async def _load_more(page: Page, target: int) -> bool:
+    """무한 스크롤 한 번 — 상품 앵커가 target개 이상이 되면 True."""
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    try:
+        await page.wait_for_function(_JS_READY, arg=target, timeout=CRAWL_READY_TIMEOUT_MS)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def _merge_listings(listings: List[List[Dict]]) -> List[Dict]:
+    """탭별 추출 결과를 순위별로 번갈아 합침 (각 목록의 1위, 2위, ...) — goods_no 중복 제거."""
+    if len(listings) == 1:
+        return listings[0]
+    merged: List[Dict] = []
+    seen: Set[str] = set()
+    for rank in range(max(len(items) for items in listings)):
+        for items in listings:
+            if rank >= len(items):
+                continue
+            item = items[rank]
+            key = item.get("goods_no") or item.get("product_url", "")
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+
+class TabBatcher:
+    """
+    CRAWL_BATCH_WINDOW_MS 안에 시작된 Playwright 크롤링(추천 상위 3개 브랜드의 캐시 미스,
+    배치/워커의 동시 작업 등)을 컨텍스트 하나의 탭들로 묶어 실행.
+    대기자가 취소되면(크롤링 시간 초과 등) 그 브랜드의 탭만 취소.
+    """
+
+    def __init__(self, window_ms: int) -> None:
+        self.window = window_ms / 1000
+        self._pending: List[Tuple[Dict, "asyncio.Future[List[Dict]]"]] = []
+
+        self.batches   = 0
+        self.brands    = 0
+        self.max_batch = 0
+
+    async def crawl(self, brand_data: Dict) -> List[Dict]:
+        if not brand_data.get("musinsa_url"):
+            return await _crawl_brand_playwright(brand_data)
+        loop = asyncio.get_running_loop()
+        fut: "asyncio.Future[List[Dict]]" = loop.create_future()
+        self._pending.append((brand_data, fut))
+        if len(self._pending) == 1:
+            loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        _bg_tasks.add(task)
+        task.add_done_callback(_bg_tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Dict, "asyncio.Future[List[Dict]]"]]) -> None:
+        batch = [(b, fut) for b, fut in batch if not fut.done()]
+        if not batch:
+            return
+        self.batches  += 1
+        self.brands   += len(batch)
+        self.max_batch = max(self.max_batch, len(batch))
+        if len(batch) > 1:
+            print(f"[playwright] {len(batch)}개 브랜드 → 컨텍스트 1개, 탭 최대 {CRAWL_MAX_TABS}개")
+        try:
+            async with _crawl_context() as ctx:
+                tasks = _start_tabs(ctx, [b for b, _ in batch], None, None, CRAWL_MAX_TABS)
+                for (_, fut), task in zip(batch, tasks):
+                    fut.add_done_callback(lambda f, t=task: t.cancel() if f.cancelled() else None)
+                    task.add_done_callback(lambda t, f=fut: _settle(f, t))
+                try:
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                finally:
+                    await _cancel_all(tasks)
+        except Exception as e:   # 컨텍스트 생성 실패
+            for b, fut in batch:
+                if not fut.done():
+                    print(f"[playwright] {b.get('name_ko', '?')} 실패: {e}")
+                    CRAWL_RESULTS.inc(brand=b.get("id", ""), outcome="failure")
+                    fut.set_exception(CrawlError(f"playwright: {e}"))
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": int(self.window * 1000),
+            "max_tabs":  CRAWL_MAX_TABS,
+            "batches":   self.batches,
+            "brands":    self.brands,
+            "max_batch": self.max_batch,
+        }
+
+
+def _settle(fut: "asyncio.Future[List[Dict]]", task: "asyncio.Task") -> None:
+    if fut.done():
+        return
+    if task.cancelled():
+        fut.cancel()
+    elif task.exception() is not None:
+        fut.set_exception(task.exception())
+    else:
+        fut.set_result(task.result())
+
+
+tab_batcher = TabBatcher(CRAWL_BATCH_WINDOW_MS)
+
+
+async def _block_heavy_requests(route: Route) -> None:
+    """fast 모드: 이미지/미디어/폰트/분석 스크립트 요청 차단."""
+    req = route.request
+    if req.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+        host in req.url for host in _BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 녹화/재생 스냅샷
+# ══════════════════════════════════════════════════════════════════════════════
+
+# 실행되는 <script>만 제거 (JSON 상태 스크립트는 http_extract 비교용으로 보존)
+_EXEC_SCRIPT = re.compile(
+    r"<script\b(?![^>]*\btype=[\"']application/(?:ld\+)?json)[^>]*>.*?</script\s*>",
+    re.S | re.I,
+)
 
+
+def snapshot_paths(base, brand_id: str) -> Tuple[Path, Path]:
+    """(렌더링된 HTML, 메타 JSON) 경로."""
+    base = Path(base)
+    return base / f"{brand_id}.html", base / f"{brand_id}.json"
+
+
+def strip_scripts(html: str) -> str:
+    """재생 시 사이트 JS가 렌더링된 DOM을 다시 바꾸지 않도록 실행 스크립트 제거."""
+    return _EXEC_SCRIPT.sub("", html)
+
+
+def load_snapshot(base, brand_id: str) -> Tuple[str, Dict]:
+    """저장된 스냅샷 (HTML, 메타). 메타 파일이 없으면 빈 dict. HTML이 없으면 FileNotFoundError."""
+    html_path, meta_path = snapshot_paths(base, brand_id)
+    html = html_path.read_text(encoding="utf-8")
+    meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+    return html, meta
+
+
+def save_snapshot(base, brand_data: Dict, url: str, html: str, raw_items: List[Dict]) -> Path:
+    """렌더링된 페이지 + 녹화 시점의 _JS_EXTRACT 결과(재생 정합성 기준값) 저장."""
+    html_path, meta_path = snapshot_paths(base, brand_data["id"])
+    html_path.parent.mkdir(parents=True, exist_ok=True)
+    html_path.write_text(strip_scripts(html), encoding="utf-8")
+    meta = {
+        "brand_id":    brand_data["id"],
+        "name_ko":     brand_data.get("name_ko", ""),
+        "url":         url,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "raw_items":   raw_items,
+    }
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return html_path
+
+
+async def _record_snapshot(page, brand_data: Dict, url: str, raw_items: List[Dict]) -> None:
+    try:
+        html = await page.content()
+        path = await asyncio.to_thread(save_snapshot, CRAWL_RECORD_DIR, brand_data, url, html, raw_items)
+        print(f"[playwright] 스냅샷 저장: {path}")
     except Exception as e:
-        print(f"[playwright] {brand_name} 실패: {e}")
-        return []
+        print(f"[playwright] {brand_data.get('name_ko', '?')} 스냅샷 저장 실패: {e}")
+
+
+def replay_route(html: str) -> Callable[[Route], Awaitable[None]]:
+    """재생 모드 라우트: 최상위 문서 요청만 스냅샷으로 응답, 나머지(이미지/XHR/iframe)는 차단."""
+
+    async def handler(route: Route) -> None:
+        req = route.request
+        if req.resource_type == "document" and req.frame.parent_frame is None:
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        else:
+            await route.abort()
+
+    return handler
+
+
+def _ms_since(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+
+def _record_timing(brand_data: Dict, timing: Dict[str, float], t0: float, items: int, ok: bool) -> None:
+    timing["total_ms"] = _ms_since(t0)
+    crawl_timings.append({
+        "brand_id": brand_data.get("id"),
+        "mode":     "replay" if CRAWL_REPLAY_DIR else ("fast" if CRAWL_FAST_MODE else "full"),
+        "ok":       ok,
+        "items":    items,
+        **timing,
+    })
+    print(f"[playwright] {brand_data.get('name_ko', '?')}: {timing['total_ms']:.0f}ms")
+
+
+def crawl_timing_stats() -> dict:
+    """최근 Playwright 크롤링 소요 시간 요약 (ms)."""
+    mode   = "fast" if CRAWL_FAST_MODE else "full"
+    recent = list(crawl_timings)[-5:]
+    totals = sorted(t["total_ms"] for t in crawl_timings if t["ok"])
+    if not totals:
+        return {"mode": mode, "count": 0, "recent": recent}
+    return {
+        "mode":   mode,
+        "count":  len(totals),
+        "avg_ms": round(sum(totals) / len(totals), 1),
+        "p50_ms": totals[len(totals) // 2],
+        "p95_ms": totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+        "recent": recent,
+    }
+
 
-    # 정규화 + 예산 필터
+def _normalize_items(raw_items: List[Dict], brand_name: str) -> List[Dict]:
+    """_JS_EXTRACT 결과 → 표준 상품 dict (가격 1,000원 미만/이름 없는 항목 제외)."""
     products: List[Dict] = []
     for item in raw_items:
         price = item.get("price_krw", 0)
@@ -258,8 +787,6 @@ async def _crawl_brand_playwright(
 
         if not name or price < 1000:
             continue
-        if budget and not (budget[0] <= price <= budget[1]):
-            continue
 
         goods_no  = item.get("goods_no") or ""
         image_url = item.get("image_url") or _cdn_url(goods_no)   # CDN fallback
@@ -274,46 +801,310 @@ async def _crawl_brand_playwright(
             "is_korean":     True,
             "source":        "musinsa",
         })
-        if len(products) >= limit:
-            break
-
-    print(f"[playwright] {brand_name}: 최종 {len(products)}개 상품")
     return products
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# 가격 인덱스 (예산 필터는 읽을 때 적용)
+# ══════════════════════════════════════════════════════════════════════════════
+
+def build_price_index(products: List[Dict]) -> List[List[int]]:
+    """[[price_krw, 인기순 위치], ...] — 가격 오름차순."""
+    return sorted([p.get("price_krw", 0), i] for i, p in enumerate(products))
+
+
+def select_products(
+    products: List[Dict],
+    budget: Optional[Tuple[int, int]],
+    limit: Optional[int],
+    price_index: Optional[List[List[int]]] = None,
+) -> List[Dict]:
+    """예산 범위 안의 상품을 인기순으로 최대 limit개 선택."""
+    if budget:
+        index = price_index if price_index is not None else build_price_index(products)
+        lo = bisect_left(index, [budget[0], -1])
+        hi = bisect_right(index, [budget[1], len(products)])
+        positions = sorted(i for _, i in index[lo:hi])
+        selected = [products[i] for i in positions]
+    else:
+        selected = products
+    return selected[:limit] if limit is not None else list(selected)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # 공개 함수
 # ══════════════════════════════════════════════════════════════════════════════
 
-async def search_brand(brand_data: Dict, budget_krw: str = "", limit: int = 4) -> List[Dict]:
-    """단일 브랜드 크롤링 (캐시 미사용)"""
-    budget = BUDGET_RANGE.get(budget_krw)
-    products = await _crawl_brand_playwright(brand_data, budget, limit)
+async def _crawl_brand_http(brand_data: Dict) -> List[Dict]:
+    """HTTP 추출 엔진 — 렌더링 없이 HTML/임베디드 JSON 파싱. 실패 시 예외."""
+    url = brand_data.get("musinsa_url", "")
+    if not url:
+        raise ValueError("musinsa_url 없음")
+    brand_name = brand_data.get("name_ko", "")
+    raw_items = await fetch_listing(url + "?sortCode=POPULAR", brand_name, _UA)
+    products = _normalize_items(raw_items, brand_name)
+    print(f"[http] {brand_name}: 최종 {len(products)}개 상품")
+    return products
+
+
+async def _crawl_brand(brand_data: Dict) -> List[Dict]:
+    """브랜드 전체 상품 크롤링 (예산 무관) + 브랜드 스타일 태그 보강. 실패 시 CrawlError."""
+    products: Optional[List[Dict]] = None
+    # HTTP 엔진은 전체 목록 첫 페이지만 읽으므로 다중 페이지/카테고리 설정이면 auto에서 건너뜀
+    deep = CRAWL_PAGES > 1 or bool(CRAWL_CATEGORIES)
+    if (CRAWL_BACKEND == "http" or (CRAWL_BACKEND == "auto" and not deep)) and not CRAWL_REPLAY_DIR:
+        try:
+            products = await _crawl_brand_http(brand_data)
+            backend_events["http_ok"] += 1
+            _count_result(brand_data, products)
+        except Exception as e:
+            backend_events["http_failed"] += 1
+            print(f"[http] {brand_data.get('name_ko', '?')} 추출 실패: {e}")
+            if CRAWL_BACKEND == "http":
+                CRAWL_RESULTS.inc(brand=brand_data.get("id", ""), outcome="failure")
+                raise CrawlError(f"http: {e}") from e
+
+    if products is None:
+        backend_events["playwright"] += 1
+        if CRAWL_BATCH_WINDOW_MS > 0:
+            products = await tab_batcher.crawl(brand_data)
+        else:
+            products = await _crawl_brand_playwright(brand_data)
 
     for p in products:
         p.setdefault("style_tags", brand_data.get("style_tags", [])[:3])
-
     return products
 
 
-async def search_brand_cached(brand_data: Dict, budget_krw: str = "", limit: int = 4) -> List[Dict]:
-    """캐시 우선 브랜드 크롤링 (TTL: 6h)"""
-    brand_id  = brand_data.get("id", brand_data.get("name_ko", "unknown"))
-    cache_key = f"{brand_id}__{budget_krw or 'all'}"
-
-    cache = load_cache()
-    cached = cache.get(cache_key)
-    if cached and (time.time() - cached.get("ts", 0)) < CACHE_TTL:
-        print(f"[cache] HIT: {cache_key} ({len(cached.get('products', []))}개)")
-        return cached.get("products", [])
-
-    products = await search_brand(brand_data, budget_krw, limit)
-
-    cache[cache_key] = {
-        "products":   products,
-        "ts":         time.time(),
-        "brand_name": brand_data.get("name_ko"),
-        "crawled_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+def _count_result(brand_data: Dict, products: List[Dict]) -> None:
+    CRAWL_RESULTS.inc(brand=brand_data.get("id", ""), outcome="success" if products else "empty")
+
+
+def backend_stats() -> dict:
+    http_tries = backend_events["http_ok"] + backend_events["http_failed"]
+    return {
+        "backend":       CRAWL_BACKEND,
+        **dict(backend_events),
+        "fallback_rate": round(backend_events["http_failed"] / http_tries, 3) if http_tries else 0.0,
+        "pages":         CRAWL_PAGES,
+        "categories":    CRAWL_CATEGORIES,
+        "tab_batches":   tab_batcher.stats(),
     }
-    save_cache(cache)
+
+
+async def search_brand(brand_data: Dict, budget_krw: str = "", limit: int = 4) -> List[Dict]:
+    """단일 브랜드 크롤링 (캐시 미사용). 실패 시 빈 목록."""
+    try:
+        products = await _crawl_brand(brand_data)
+    except CrawlError as e:
+        print(f"[crawl] {brand_data.get('name_ko', '?')}: {e}")
+        return []
+    return select_products(products, BUDGET_RANGE.get(budget_krw), limit)
+
+
+def _cache_key(brand_data: Dict) -> str:
+    """브랜드 단위 캐시 키 (예산 무관 — 전체 상품을 저장하고 읽을 때 필터)."""
+    return brand_data.get("id", brand_data.get("name_ko", "unknown"))
+
+
+def _crawl_host(brand_data: Dict) -> str:
+    """서킷 브레이커/동시성 한도 단위 (crawl_health.py)."""
+    return urlparse(brand_data.get("musinsa_url", "")).hostname or "unknown"
+
+
+def flush_hits() -> None:
+    """모아 둔 조회 수를 공유 저장소에 반영 (동기 — 스레드에서 호출)."""
+    global _unflushed_hits
+    deltas, _unflushed_hits = _unflushed_hits, Counter()
+    try:
+        crawl_cache.store.add_hits(deltas)
+    except Exception as e:
+        _unflushed_hits.update(deltas)   # 다음 주기에 재시도
+        print(f"[cache] 조회 수 저장 실패: {e}")
+
+
+def _schedule_hits_flush() -> None:
+    global _hits_flushed_at
+    now = time.time()
+    if now - _hits_flushed_at < HITS_FLUSH_INTERVAL:
+        return
+    _hits_flushed_at = now
+    task = asyncio.ensure_future(asyncio.to_thread(flush_hits))
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+
+
+def hit_counts() -> Counter:
+    """키별 조회 수 — 저장소 누적(모든 프로세스) + 이 프로세스의 미반영분. 동기."""
+    counts = Counter(crawl_cache.store.hits())
+    counts.update(_unflushed_hits)
+    return counts
+
+
+async def search_brand_cached(brand_data: Dict, budget_krw: str = "", limit: int = 4) -> List[Dict]:
+    """
+    캐시 우선 브랜드 크롤링 (TTL: 6h — 빈 결과/실패는 엔트리의 짧은 "ttl", stale-while-revalidate).
+    브랜드당 1회 크롤링한 전체 상품에서 예산/개수 필터를 읽을 때 적용.
+
+    - fresh: 즉시 반환 (TTL의 CACHE_REFRESH_AHEAD 이상 지났으면 백그라운드 갱신 예약)
+    - stale (TTL ~ CACHE_STALE_TTL): 즉시 반환 + 백그라운드 갱신
+    - 없음: 크롤링 완료까지 대기
+    """
+    cache_key = _cache_key(brand_data)
+    budget    = BUDGET_RANGE.get(budget_krw)
+    cache_hits[cache_key] += 1
+    _unflushed_hits[cache_key] += 1
+    _schedule_hits_flush()
+
+    with stage_timer("cache_lookup"):
+        cached = await crawl_cache.get(cache_key)
+    if cached:
+        age = time.time() - cached.get("ts", 0)
+        ttl = cached.get("ttl", CACHE_TTL)
+        if age >= ttl:
+            cache_events["stale"] += 1
+            CACHE_REQUESTS.inc(cache="musinsa", result="stale")
+            print(f"[cache] STALE: {cache_key} ({int(age)}s) — 백그라운드 갱신")
+            schedule_refresh(brand_data)
+        else:
+            cache_events["fresh"] += 1
+            CACHE_REQUESTS.inc(cache="musinsa", result="fresh")
+            print(f"[cache] HIT: {cache_key} ({len(cached.get('products', []))}개)")
+            if age >= ttl * CACHE_REFRESH_AHEAD:
+                schedule_refresh(brand_data)
+        products = select_products(
+            cached.get("products", []), budget, limit, cached.get("price_index")
+        )
+        return [dict(p) for p in products]
+
+    # 같은 키의 동시 미스는 크롤링 1회로 병합 (TTL 경계의 thundering herd 방지)
+    cache_events["miss"] += 1
+    CACHE_REQUESTS.inc(cache="musinsa", result="miss")
+    products = select_products(await refresh_brand(brand_data), budget, limit)
+    # 호출자마다 상품 dict를 보강(setdefault)하므로 공유 결과는 복사해서 반환
+    return [dict(p) for p in products]
+
+
+async def cached_products(
+    brand_data: Dict, budget_krw: str = "", limit: int = 4
+) -> Optional[List[Dict]]:
+    """
+    마지막으로 저장된 상품 (나이 무관, 크롤링 없음). 캐시에 없으면 None.
+    요청 데드라인을 넘긴 브랜드의 빈자리를 채울 때 사용.
+    """
+    cache_key = _cache_key(brand_data)
+    entry = crawl_cache.memory.get(cache_key)
+    if entry is None:
+        entry = await asyncio.to_thread(crawl_cache.store.get, cache_key)
+    if not entry:
+        return None
+    products = select_products(
+        entry.get("products", []), BUDGET_RANGE.get(budget_krw), limit, entry.get("price_index")
+    )
+    return [dict(p) for p in products]
+
+
+async def refresh_brand(brand_data: Dict) -> List[Dict]:
+    """캐시와 무관하게 브랜드 전체 상품을 크롤링 후 저장. 진행 중인 크롤링이 있으면 합류."""
+    cache_key = _cache_key(brand_data)
+    return await _crawl_flight.do(cache_key, lambda: _crawl_and_store(brand_data, cache_key))
+
+
+def schedule_refresh(brand_data: Dict) -> None:
+    """백그라운드 갱신 예약 (이미 진행 중이면 무시). 요청 경로를 막지 않음."""
+    if _cache_key(brand_data) in _crawl_flight:
+        return
+    cache_events["background_refresh"] += 1
+    task = asyncio.ensure_future(refresh_brand(brand_data))
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_done)
+
+
+def _bg_done(task: "asyncio.Task") -> None:
+    _bg_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f"[cache] 백그라운드 갱신 실패: {task.exception()}")
+
+
+async def _crawl_and_store(brand_data: Dict, cache_key: str) -> List[Dict]:
+    if CRAWL_MODE == "worker":
+        return await _crawl_via_worker(brand_data, cache_key)
+    try:
+        async with crawl_health.slot(_crawl_host(brand_data)) as health:
+            try:
+                with stage_timer("crawl"):
+                    products = await asyncio.wait_for(_crawl_brand(brand_data), CRAWL_HARD_TIMEOUT)
+            except asyncio.TimeoutError:
+                health.record("failure")
+                cache_events["crawl_timeout"] += 1
+                CRAWL_RESULTS.inc(brand=brand_data.get("id", ""), outcome="failure")
+                print(f"[cache] {cache_key}: 크롤링 {CRAWL_HARD_TIMEOUT:.0f}s 초과 — 취소")
+                return await _store_failure(brand_data, cache_key)
+            except CrawlError:
+                health.record("failure")
+                return await _store_failure(brand_data, cache_key)
+            health.record("success" if products else "empty")
+    except CircuitOpen as e:
+        # 호스트가 차단/스로틀링 중 — 브라우저를 띄우지 않고 캐시/fallback에 맡김
+        cache_events["breaker_open"] += 1
+        print(f"[cache] {cache_key}: 크롤링 생략 — {e}")
+        return []
+
+    now = time.time()
+    await crawl_cache.put(cache_key, {
+        "products":    products,
+        "price_index": build_price_index(products),
+        "ts":          now,
+        "ttl":         CACHE_TTL if products else CRAWL_EMPTY_TTL,
+        "outcome":     "ok" if products else "empty",
+        "brand_name":  brand_data.get("name_ko"),
+        "crawled_at":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+    })
+    if not products:
+        return products   # 빈 목록은 카탈로그에 반영하지 않음 (전 상품 삭제로 기록되지 않도록)
+    try:
+        diff = await catalog.sync(cache_key, products, now)
+        if not diff["unchanged"]:
+            print(f"[catalog] {cache_key}: +{diff['inserted']} ~{diff['updated']} -{diff['removed']}")
+    except Exception as e:
+        print(f"[catalog] {cache_key} 반영 실패: {e}")
     return products
+
+
+async def _store_failure(brand_data: Dict, cache_key: str) -> List[Dict]:
+    """
+    크롤링 실패: 이전 정상 결과가 있으면 덮어쓰지 않고 그대로 반환,
+    없으면 짧은 TTL(CRAWL_FAILED_TTL)의 빈 엔트리 저장 — 매 요청 재크롤링 방지.
+    """
+    cache_events["crawl_failed"] += 1
+    previous = await asyncio.to_thread(crawl_cache.store.get, cache_key)
+    if previous and previous.get("products"):
+        return list(previous["products"])
+    now = time.time()
+    await crawl_cache.put(cache_key, {
+        "products":    [],
+        "price_index": [],
+        "ts":          now,
+        "ttl":         CRAWL_FAILED_TTL,
+        "outcome":     "failed",
+        "brand_name":  brand_data.get("name_ko"),
+        "crawled_at":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+    })
+    return []
+
+
+async def _crawl_via_worker(brand_data: Dict, cache_key: str) -> List[Dict]:
+    """CRAWL_MODE=worker: 작업 큐에 넣고 워커 완료를 기다린 뒤 공유 저장소에서 결과를 읽음."""
+    from crawl_worker import dispatcher   # crawl_worker가 이 모듈을 import하므로 지연 import
+
+    with stage_timer("crawl"):
+        error = await dispatcher.crawl(brand_data)
+    if error:
+        cache_events["worker_failed"] += 1
+        print(f"[cache] {cache_key}: 워커 크롤링 실패 — {error}")
+    # 실패해도 저장소를 읽음 — 워커가 이전 정상 결과를 남겨 두었으면 그것을 반환 (인라인 모드와 동일)
+    entry = await asyncio.to_thread(crawl_cache.store.get, cache_key)
+    if not entry:
+        return []
+    crawl_cache.memory.put(cache_key, entry)
+    return entry.get("products", [])
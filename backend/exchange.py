@@ -0,0 +1,128 @@
+"""
+환율 서비스 (Yahoo Finance KRW → JPY)
+=====================================
+요청마다 Yahoo를 호출하던 구조를 주기적 백그라운드 갱신 + 메모리 값 제공으로 바꿉니다.
+
+  - RATE_REFRESH_INTERVAL 초마다 KRWJPY=X 갱신 (clients.py 공유 클라이언트, keep-alive)
+  - 요청은 마지막 정상 값을 메모리에서 즉시 반환 — Yahoo 응답을 기다리지 않음
+  - 값의 나이(age_s)와 stale 여부(RATE_MAX_AGE 초과), fallback 여부를 함께 노출
+  - 한 번도 받아오지 못했으면 고정 fallback 값(0.0973)을 fallback=True로 표시
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+from clients import clients
+from metrics import stage_timer
+
+YAHOO_CHART_URL       = os.getenv(
+    "YAHOO_CHART_URL", "https://query1.finance.yahoo.com/v8/finance/chart/KRWJPY=X"
+)
+RATE_REFRESH_INTERVAL = int(os.getenv("RATE_REFRESH_INTERVAL", "300"))    # 5분
+RATE_MAX_AGE          = int(os.getenv("RATE_MAX_AGE", "3600"))            # 1시간 넘으면 stale
+FALLBACK_RATE         = 0.0973
+
+
+class ExchangeRateService:
+    def __init__(
+        self,
+        interval: int = RATE_REFRESH_INTERVAL,
+        max_age: int = RATE_MAX_AGE,
+    ) -> None:
+        self.interval = interval
+        self.max_age  = max_age
+
+        self._task:   Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Task] = None
+
+        self.rate:       Optional[float] = None
+        self.fetched_at: Optional[float] = None
+        self.last_error: Optional[str]   = None
+        self.failures = 0
+
+    # ── 갱신 ──────────────────────────────────────────────────────────────────
+
+    async def refresh(self) -> bool:
+        """Yahoo에서 환율을 받아 갱신. 실패해도 마지막 정상 값은 유지."""
+        try:
+            with stage_timer("yahoo"):
+                r = await clients.http("yahoo").get(
+                    YAHOO_CHART_URL, params={"interval": "1d", "range": "1d"}
+                )
+            r.raise_for_status()
+            data = r.json()
+            rate = float(data["chart"]["result"][0]["meta"]["regularMarketPrice"])
+            if rate <= 0:
+                raise ValueError(f"비정상 환율 값: {rate}")
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e) or type(e).__name__
+            print(f"[exchange-rate] 갱신 실패: {self.last_error}")
+            return False
+        self.rate, self.fetched_at, self.last_error = rate, time.time(), None
+        return True
+
+    def refresh_soon(self) -> None:
+        """백그라운드 갱신 1회 예약 (이미 진행 중이면 무시)."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self.refresh())
+
+    async def run_forever(self) -> None:
+        while True:
+            await self.refresh()
+            # 아직 값이 없으면 짧은 간격으로 재시도
+            retry = self.interval if self.rate is not None else min(30, self.interval)
+            await asyncio.sleep(retry)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run_forever())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._refreshing = None
+
+    # ── 조회 ──────────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        """현재 환율 (메모리, 논블로킹)."""
+        if self.rate is None:
+            # 아직 한 번도 못 받아옴 — 갱신 루프가 없으면 1회 시도 예약
+            if self._task is None:
+                self.refresh_soon()
+            return {
+                "krw_to_jpy": FALLBACK_RATE,
+                "source":     "fallback",
+                "pair":       "KRWJPY=X",
+                "fetched_at": None,
+                "age_s":      None,
+                "stale":      True,
+                "fallback":   True,
+                "last_error": self.last_error,
+            }
+
+        age = time.time() - self.fetched_at
+        stale = age > self.max_age
+        if stale and self._task is None:
+            self.refresh_soon()
+        return {
+            "krw_to_jpy": self.rate,
+            "source":     "Yahoo Finance",
+            "pair":       "KRWJPY=X",
+            "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.fetched_at)),
+            "age_s":      round(age, 1),
+            "stale":      stale,
+            "fallback":   False,
+            "last_error": self.last_error,
+        }
+
+
+rate_service = ExchangeRateService()
@@ -0,0 +1,151 @@
+"""
+경량 HTTP 추출 엔진
+===================
+Chromium 렌더링 없이 브랜드 목록 페이지를 공유 httpx 클라이언트(clients.py)로
+받아 상품을 추출합니다.
+파싱에 실패하면 crawler.py가 Playwright 경로로 fallback 합니다.
+
+추출 순서:
+  1. 임베디드 JSON 상태 (<script id="__NEXT_DATA__">, window.__*STATE__ 등)에서
+     goodsNo + 상품명 + 가격을 가진 객체를 수집
+  2. 서버 렌더링 HTML의 /products/{goodsNo} 앵커 + 근처 "xx,xxx원" 가격
+
+반환 형식은 _JS_EXTRACT 결과와 동일한 raw dict
+  {name, brand, price_krw, image_url, product_url, goods_no}
+이며 crawler._normalize_items()로 정규화됩니다.
+"""
+
+import html as html_lib
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from clients import clients
+
+
+class ExtractError(Exception):
+    """HTML을 받았지만 상품을 추출하지 못함 → Playwright fallback 대상."""
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 파싱
+# ══════════════════════════════════════════════════════════════════════════════
+
+_RE_SCRIPT_JSON = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S
+)
+_RE_STATE_ASSIGN = re.compile(
+    r"window\.__[A-Z_]*STATE__\s*=\s*(\{.*?\})\s*;?\s*</script>", re.S
+)
+_RE_ANCHOR = re.compile(
+    r'<a\b[^>]*href="([^"]*/products/(\d+)[^"]*)"[^>]*>(.*?)</a>', re.S | re.I
+)
+_RE_TAG   = re.compile(r"<[^>]+>")
+_RE_PRICE = re.compile(r"(\d{1,3}(?:,\d{3})+)\s*원")
+
+_NAME_KEYS  = ("goodsName", "goodsNm", "productName", "name")
+_PRICE_KEYS = ("finalPrice", "salePrice", "price", "normalPrice")
+_IMAGE_KEYS = ("thumbnail", "imageUrl", "goodsImage", "image")
+
+
+def _walk(node: Any) -> Iterator[Dict]:
+    if isinstance(node, dict):
+        yield node
+        for v in node.values():
+            yield from _walk(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _walk(v)
+
+
+def _first(d: Dict, keys) -> Any:
+    for k in keys:
+        v = d.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def _abs_image(url: Optional[str]) -> Optional[str]:
+    if not url or not isinstance(url, str):
+        return None
+    if url.startswith("//"):
+        return "https:" + url
+    if url.startswith("/"):
+        return "https://image.msscdn.net" + url
+    return url
+
+
+def _to_price(v: Any) -> int:
+    if isinstance(v, (int, float)):
+        return int(v)
+    digits = re.sub(r"[^0-9]", "", str(v or ""))
+    return int(digits) if digits else 0
+
+
+def _from_json_state(doc: str, brand_name: str) -> List[Dict]:
+    blobs = [m.group(1) for m in _RE_SCRIPT_JSON.finditer(doc)]
+    blobs += [m.group(1) for m in _RE_STATE_ASSIGN.finditer(doc)]
+
+    items: List[Dict] = []
+    seen = set()
+    for blob in blobs:
+        try:
+            state = json.loads(blob)
+        except ValueError:
+            continue
+        for d in _walk(state):
+            goods_no = d.get("goodsNo") or d.get("goods_no")
+            name     = _first(d, _NAME_KEYS)
+            price    = _to_price(_first(d, _PRICE_KEYS))
+            if not goods_no or not name or not isinstance(name, str) or str(goods_no) in seen:
+                continue
+            goods_no = str(goods_no)
+            seen.add(goods_no)
+            items.append({
+                "name":        name.strip(),
+                "brand":       brand_name,
+                "price_krw":   price,
+                "image_url":   _abs_image(_first(d, _IMAGE_KEYS)),
+                "product_url": f"https://www.musinsa.com/products/{goods_no}",
+                "goods_no":    goods_no,
+            })
+    return items
+
+
+def _from_html(doc: str, brand_name: str) -> List[Dict]:
+    items: List[Dict] = []
+    seen = set()
+    for m in _RE_ANCHOR.finditer(doc):
+        href, goods_no, inner = m.groups()
+        name = html_lib.unescape(_RE_TAG.sub("", inner)).strip()
+        if len(name) <= 2 or goods_no in seen:
+            continue
+        seen.add(goods_no)
+        # 카드 안의 가격은 보통 상품명 앵커 뒤쪽에 위치
+        pm = _RE_PRICE.search(doc, m.end(), m.end() + 2000)
+        items.append({
+            "name":        name,
+            "brand":       brand_name,
+            "price_krw":   _to_price(pm.group(1)) if pm else 0,
+            "image_url":   None,
+            "product_url": href if href.startswith("http") else f"https://www.musinsa.com{href}",
+            "goods_no":    goods_no,
+        })
+    return items
+
+
+def parse_listing(doc: str, brand_name: str) -> List[Dict]:
+    """브랜드 목록 HTML → raw 상품 목록. 가격이 있는 상품이 하나도 없으면 ExtractError."""
+    for extract in (_from_json_state, _from_html):
+        items = extract(doc, brand_name)
+        if any(i["price_krw"] >= 1000 for i in items):
+            return items
+    raise ExtractError("상품 데이터를 찾지 못함 (클라이언트 렌더링 페이지로 추정)")
+
+
+async def fetch_listing(url: str, brand_name: str, user_agent: str) -> List[Dict]:
+    """목록 페이지 요청 + 파싱. 네트워크/HTTP 오류는 httpx 예외, 파싱 실패는 ExtractError."""
+    r = await clients.http("musinsa").get(url, headers={"User-Agent": user_agent})
+    r.raise_for_status()
+    return parse_listing(r.text, brand_name)
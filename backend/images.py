@@ -0,0 +1,295 @@
+"""
+상품 이미지 프록시 (리사이즈 썸네일 디스크 캐시)
+================================================
+GET /api/img/{goods_no}?w=300
+
+msscdn 원본(_1_500.jpg)을 상품당 한 번만 받아 결과 그리드에서 쓰는 크기(IMAGE_SIZES)로
+한꺼번에 줄여 디스크에 저장하고, 이후 요청은 디스크에서 바로 응답합니다.
+
+  - 원본 URL: 카탈로그(catalog.py)의 image_url, 없으면 goods_no로 만든 CDN URL
+  - 같은 goods_no의 동시 요청은 원본 다운로드 1회로 병합 (single-flight)
+  - 디스크 LRU: data/img-cache, 전체 크기 IMAGE_CACHE_MAX_MB 초과 시 오래 안 쓴 파일부터 삭제
+    (파일 mtime = 마지막 사용 시각 → 재시작 후에도 순서 유지)
+  - ETag(내용 해시) + If-None-Match → 304, Cache-Control 장기 캐시
+  - 원본이 404면 IMAGE_NEGATIVE_TTL 동안 다시 받지 않음
+
+Pillow는 선택 의존성입니다 — 없으면 리사이즈 없이 원본 한 벌만 캐시해 모든 크기 요청에 응답.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from clients import clients
+from crawler import DATA_DIR, _cdn_url, catalog
+from metrics import CACHE_REQUESTS, stage_timer
+from singleflight import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - 선택 의존성
+    Image = None
+
+IMAGE_CACHE_DIR      = DATA_DIR / "img-cache"
+IMAGE_CACHE_MAX_MB   = int(os.getenv("IMAGE_CACHE_MAX_MB", "512"))
+IMAGE_SIZES          = tuple(sorted(int(w) for w in os.getenv("IMAGE_SIZES", "150,300,500").split(",")))
+IMAGE_DEFAULT_WIDTH  = IMAGE_SIZES[-1]
+IMAGE_QUALITY        = int(os.getenv("IMAGE_QUALITY", "82"))
+IMAGE_NEGATIVE_TTL   = int(os.getenv("IMAGE_NEGATIVE_TTL", "600"))
+IMAGE_CACHE_CONTROL  = "public, max-age=2592000"    # 30일
+
+_ALLOWED_HOSTS = ("msscdn.net", "musinsa.com")
+_MEDIA_TYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp", "gif": "image/gif"}
+_TOUCH_AFTER = 3600   # 마지막 사용 시각(mtime) 갱신 간격 — 히트마다 디스크 쓰기 방지
+
+Served = Tuple[bytes, str, str]   # (바이트, etag, media_type)
+
+
+class ImageError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class DiskLRU:
+    """파일 단위 디스크 LRU. 인덱스는 메모리(OrderedDict) — put은 스레드에서 호출되므로 잠금."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root      = root
+        self.max_bytes = max_bytes
+        # key → (경로, 크기, etag, mtime)
+        self._index: "OrderedDict[str, Tuple[Path, int, str, float]]" = OrderedDict()
+        self._bytes  = 0
+        self._loaded = False
+        self._lock   = threading.Lock()
+        self.evictions = 0
+
+    def load(self) -> None:
+        """디렉터리 스캔 → mtime 오래된 순으로 인덱스 구성. 파일명: {key}.{etag}.{ext}"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+    def _load(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.root.iterdir():
+            parts = path.name.split(".")
+            if len(parts) != 3 or parts[2] not in _MEDIA_TYPES:
+                continue
+            st = path.stat()
+            entries.append((st.st_mtime, parts[0], path, st.st_size, parts[1]))
+        for mtime, key, path, size, etag in sorted(entries):
+            self._drop(key)
+            self._index[key] = (path, size, etag, mtime)
+            self._bytes += size
+        self._loaded = True
+        self._evict()
+
+    def get(self, key: str) -> Optional[Tuple[Path, str]]:
+        self.load()
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            self._index.move_to_end(key)
+            path, size, etag, mtime = entry
+            now = time.time()
+            if now - mtime > _TOUCH_AFTER:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._index[key] = (path, size, etag, now)
+        return path, etag
+
+    def put(self, key: str, data: bytes, ext: str) -> str:
+        """파일 기록 (임시 파일 → rename) 후 용량 초과분 삭제. etag 반환."""
+        self.load()
+        etag = hashlib.sha1(data).hexdigest()[:16]
+        path = self.root / f"{key}.{etag}.{ext}"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._drop(key, keep=path)
+            self._index[key] = (path, len(data), etag, time.time())
+            self._bytes += len(data)
+            self._evict()
+        return etag
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def _drop(self, key: str, keep: Optional[Path] = None) -> None:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        if entry[0] != keep:
+            try:
+                entry[0].unlink()
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._index:
+            key = next(iter(self._index))
+            self._drop(key)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries":   len(self._index),
+            "bytes":     self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+def _make_variants(data: bytes) -> Dict[int, Tuple[bytes, str]]:
+    """원본 → {폭: (바이트, 확장자)}. Pillow가 없으면 {0: 원본} (모든 폭 공용)."""
+    if Image is None:
+        return {0: (data, _sniff_ext(data))}
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        variants = {}
+        for width in IMAGE_SIZES:
+            thumb = img.copy()
+            if thumb.width > width:
+                thumb.thumbnail((width, width * 10), Image.LANCZOS)
+            buf = io.BytesIO()
+            thumb.save(buf, "JPEG", quality=IMAGE_QUALITY, optimize=True, progressive=True)
+            variants[width] = (buf.getvalue(), "jpg")
+    return variants
+
+
+def _sniff_ext(data: bytes) -> str:
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[:3] == b"GIF":
+        return "gif"
+    return "jpg"
+
+
+class ImageProxy:
+    def __init__(self, cache: DiskLRU) -> None:
+        self.cache = cache
+        self._flight: SingleFlight[Dict[str, Served]] = SingleFlight("image")
+        self._missing: Dict[str, float] = {}     # goods_no → 재시도 가능 시각 (원본 404)
+
+        self.hits      = 0
+        self.misses    = 0
+        self.fetches   = 0
+        self.not_found = 0
+        self.failures  = 0
+
+    @staticmethod
+    def _key(goods_no: str, width: int) -> str:
+        return f"{goods_no}_{width if Image is not None else 0}"
+
+    async def get(self, goods_no: str, width: int = IMAGE_DEFAULT_WIDTH) -> Served:
+        """(바이트, etag, media_type). 실패 시 ImageError(404 | 502)."""
+        key = self._key(goods_no, width)
+        data = await self._read(key)
+        if data is not None:
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache="image", result="hit")
+            return data
+
+        self.misses += 1
+        CACHE_REQUESTS.inc(cache="image", result="miss")
+        if self._missing.get(goods_no, 0) > time.time():
+            raise ImageError(404, "이미지 없음")
+        # 디스크에서 다시 읽지 않고 가져온 결과로 응답 (용량 초과/동시 put으로 바로 밀려나도 됨)
+        variants = await self._flight.do(goods_no, lambda: self._fetch(goods_no))
+        data = variants.get(key)
+        if data is None:
+            raise ImageError(502, "이미지 변환 실패")
+        return data
+
+    async def _read(self, key: str) -> Optional[Served]:
+        return await asyncio.to_thread(self._read_sync, key)
+
+    def _read_sync(self, key: str) -> Optional[Served]:
+        """인덱스 조회(+ 오래된 항목 mtime 갱신) + 파일 읽기 — 스레드에서 실행."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        path, etag = entry
+        try:
+            body = path.read_bytes()
+        except OSError:
+            self.cache.discard(key)
+            return None
+        return body, etag, _MEDIA_TYPES[path.suffix.lstrip(".")]
+
+    async def _source_url(self, goods_no: str) -> str:
+        product = await catalog.get(goods_no)
+        url = (product or {}).get("image_url") or ""
+        host = urlparse(url).hostname or ""
+        if url and any(host == h or host.endswith("." + h) for h in _ALLOWED_HOSTS):
+            return url
+        return _cdn_url(goods_no)
+
+    async def _fetch(self, goods_no: str) -> Dict[str, Served]:
+        """원본을 받아 폭별 변형을 저장하고 {캐시 키: (바이트, etag, media_type)} 반환."""
+        url = await self._source_url(goods_no)
+        self.fetches += 1
+        try:
+            with stage_timer("msscdn"):
+                r = await clients.http("msscdn").get(url)
+        except Exception as e:
+            self.failures += 1
+            raise ImageError(502, f"원본 요청 실패: {e}")
+        if r.status_code == 404:
+            self.not_found += 1
+            now = time.time()
+            if len(self._missing) > 10_000:
+                self._missing = {g: t for g, t in self._missing.items() if t > now}
+            self._missing[goods_no] = now + IMAGE_NEGATIVE_TTL
+            raise ImageError(404, "이미지 없음")
+        if r.status_code != 200:
+            self.failures += 1
+            raise ImageError(502, f"원본 응답 {r.status_code}")
+
+        try:
+            variants = await asyncio.to_thread(_make_variants, r.content)
+        except Exception as e:
+            self.failures += 1
+            raise ImageError(502, f"이미지 변환 실패: {e}")
+        result: Dict[str, Served] = {}
+        for width, (body, ext) in variants.items():
+            key = f"{goods_no}_{width}"
+            etag = await asyncio.to_thread(self.cache.put, key, body, ext)
+            result[key] = (body, etag, _MEDIA_TYPES[ext])
+        self._missing.pop(goods_no, None)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "resize":    Image is not None,
+            "sizes":     list(IMAGE_SIZES),
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "fetches":   self.fetches,
+            "not_found": self.not_found,
+            "failures":  self.failures,
+            "flight":    self._flight.stats(),
+            "disk":      self.cache.stats(),
+        }
+
+
+image_proxy = ImageProxy(DiskLRU(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_MB * 1024 * 1024))
@@ -0,0 +1,464 @@
+"""
+API 부하 테스트 (오프라인)
+==========================
+실행: cd backend && python loadtest.py [--concurrency 20] [--requests 200]
+          [--latency musinsa=300 openai=800] [--fail musinsa=0.1] [-o result.json]
+      python loadtest.py --compare old.json new.json
+
+실제 무신사 / OpenAI / Yahoo / Stripe 대신 로컬 스텁 서버를 띄우고,
+스텁을 바라보도록 환경변수를 바꾼 FastAPI 앱(uvicorn 하위 프로세스)에 부하를 겁니다.
+
+  - 스텁: 업스트림별 지연(ms)과 실패율 주입 (--latency / --fail name=value)
+      musinsa  /musinsa/brand/{slug}/products   __NEXT_DATA__ 포함 목록 HTML (실패: 503)
+      openai   /openai/v1/chat/completions      플랜 JSON                     (실패: 500)
+      yahoo    /yahoo/v8/finance/chart/KRWJPY=X                               (실패: 503)
+      stripe   /stripe/v1/checkout/sessions, /stripe/v1/account              (실패: 500)
+  - 앱: DATA_DIR을 임시 디렉터리로 (빈 캐시에서 시작, 브랜드 musinsa_url은 스텁 주소)
+  - 시나리오: /api/exchange-rate → /api/recommend → /api/checkout 순서로 각각
+    --requests 회를 --concurrency 동시성으로 호출
+  - 결과: 시나리오별 p50/p95/p99 지연, 처리량, 오류 수 + 앱 프로세스 최대 RSS(VmHWM),
+    브라우저 기동 횟수, 캐시 통계 → JSON 저장 (bench-results/)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent
+RESULTS_DIR = BACKEND_DIR / "bench-results"
+UPSTREAMS   = ("musinsa", "openai", "yahoo", "stripe")
+
+GREEN  = "\033[92m"
+RED    = "\033[91m"
+YELLOW = "\033[93m"
+RESET  = "\033[0m"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 스텁 업스트림 (python loadtest.py --serve-stubs 로 별도 프로세스 실행)
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _listing_html(slug: str, n: int = 12) -> str:
+    rng = random.Random(slug)
+    goods = [
+        {
+            "goodsNo":    str(rng.randint(1_000_000, 9_999_999)),
+            "goodsName":  f"{slug} 상품 {i + 1}",
+            "finalPrice": rng.choice([29_000, 49_000, 89_000, 129_000, 189_000, 259_000, 390_000]),
+            "thumbnail":  f"//image.msscdn.net/images/goods_img/{slug}/{i}.jpg",
+        }
+        for i in range(n)
+    ]
+    state = json.dumps({"props": {"pageProps": {"goods": goods}}}, ensure_ascii=False)
+    return (
+        "<html><head><title>stub</title></head><body><div id=\"__next\"></div>"
+        f'<script id="__NEXT_DATA__" type="application/json">{state}</script></body></html>'
+    )
+
+
+def _ai_plan(prompt: str) -> dict:
+    return {
+        "idol_name":      "스텁 아이돌",
+        "idol_style_ref": "부하 테스트용 스타일 설명입니다.",
+        "product_descriptions": {},
+        "korean_brands_fallback": [
+            {"brand": "스텁", "product_name": f"fallback {i}", "product_description": "",
+             "price_krw": 50_000, "style_tags": [], "is_korean": True, "source": "ai_fallback"}
+            for i in range(3)
+        ],
+        "other_brands": [
+            {"brand": "STUB", "product_name": f"other {i}", "product_description": "",
+             "price_krw": 120_000, "style_tags": [], "is_korean": False, "source": "ai"}
+            for i in range(2)
+        ],
+    }
+
+
+def build_stub_app(latency: Dict[str, float], fail: Dict[str, float], konbini: bool):
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import HTMLResponse, JSONResponse
+    from starlette.routing import Route
+
+    rng = random.Random(0)
+    counts: Dict[str, int] = {u: 0 for u in UPSTREAMS}
+
+    async def _inject(name: str) -> bool:
+        """지연 후 실패 여부 반환."""
+        counts[name] += 1
+        ms = latency.get(name, 0)
+        if ms:
+            await asyncio.sleep(ms / 1000 * rng.uniform(0.7, 1.3))
+        return rng.random() < fail.get(name, 0)
+
+    async def musinsa(request: Request):
+        if await _inject("musinsa"):
+            return HTMLResponse("unavailable", status_code=503)
+        return HTMLResponse(_listing_html(request.path_params["slug"]))
+
+    async def openai_chat(request: Request):
+        body = await request.json()
+        if await _inject("openai"):
+            return JSONResponse({"error": {"message": "stub failure", "type": "server_error"}}, 500)
+        content = json.dumps(_ai_plan(body["messages"][0]["content"]), ensure_ascii=False)
+        return JSONResponse({
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 900, "completion_tokens": 900, "total_tokens": 1800},
+        })
+
+    async def yahoo(request: Request):
+        if await _inject("yahoo"):
+            return JSONResponse({"chart": {"error": "stub failure"}}, 503)
+        return JSONResponse({"chart": {"result": [{"meta": {"regularMarketPrice": 0.1071}}]}})
+
+    def _stripe_error(status: int, message: str, etype: str = "api_error") -> JSONResponse:
+        return JSONResponse({"error": {"message": message, "type": etype}}, status)
+
+    async def stripe_session(request: Request):
+        form = await request.form()
+        if await _inject("stripe"):
+            return _stripe_error(500, "stub failure")
+        methods = [v for k, v in form.multi_items() if k.startswith("payment_method_types")]
+        if "konbini" in methods and not konbini:
+            return _stripe_error(400, "konbini is not enabled", "invalid_request_error")
+        sid = f"cs_test_{rng.getrandbits(48):012x}"
+        return JSONResponse({"id": sid, "object": "checkout.session",
+                             "url": f"https://checkout.stripe.com/c/pay/{sid}"})
+
+    async def stripe_account(request: Request):
+        if await _inject("stripe"):
+            return _stripe_error(500, "stub failure")
+        return JSONResponse({"id": "acct_stub", "object": "account",
+                             "capabilities": {"konbini_payments": "active" if konbini else "inactive"}})
+
+    async def stats(request: Request):
+        return JSONResponse(counts)
+
+    return Starlette(routes=[
+        Route("/musinsa/brand/{slug}/products", musinsa),
+        Route("/openai/v1/chat/completions", openai_chat, methods=["POST"]),
+        Route("/yahoo/v8/finance/chart/KRWJPY=X", yahoo),
+        Route("/stripe/v1/checkout/sessions", stripe_session, methods=["POST"]),
+        Route("/stripe/v1/account", stripe_account),
+        Route("/_stats", stats),
+    ])
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 프로세스 관리
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _peak_rss_mb(pid: int) -> Optional[float]:
+    """프로세스 최대 RSS (Linux /proc VmHWM). 다른 OS면 None."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+async def _wait_ready(url: str, proc: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"프로세스 종료됨 (code {proc.returncode}): {url}")
+            try:
+                await client.get(url, timeout=1)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"기동 대기 시간 초과: {url}")
+
+
+def _prepare_data_dir(stub_base: str) -> Path:
+    """임시 DATA_DIR — 브랜드 카탈로그의 musinsa_url을 스텁 주소로 교체."""
+    data_dir = Path(tempfile.mkdtemp(prefix="seoulfit-loadtest-"))
+    catalog = json.loads((BACKEND_DIR / "data" / "kpop-brands.json").read_text(encoding="utf-8"))
+    for b in catalog.get("brands", []):
+        slug = b["musinsa_url"].rstrip("/").split("/")[-2] if b.get("musinsa_url") else b["id"]
+        b["musinsa_url"] = f"{stub_base}/musinsa/brand/{slug}/products"
+    (data_dir / "kpop-brands.json").write_text(
+        json.dumps(catalog, ensure_ascii=False), encoding="utf-8"
+    )
+    return data_dir
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 부하 생성
+# ══════════════════════════════════════════════════════════════════════════════
+
+_STYLES  = ["스트릿", "캐주얼", "미니멀", "페미닌", "빈티지", "스포티", "Y2K", "오피스룩"]
+_BUDGETS = ["~5만원", "5~15만원", "15~30만원", "30만원+", ""]
+_BODIES  = ["마른 체형", "근육형", "통통", "마른 비만", "표준", ""]
+
+
+def _recommend_body(rng: random.Random) -> dict:
+    return {
+        "height":     rng.randint(150, 190),
+        "weight":     rng.randint(40, 90),
+        "body_type":  rng.choice(_BODIES),
+        "styles":     rng.sample(_STYLES, rng.randint(1, 3)),
+        "colors":     rng.sample(["블랙", "화이트", "네이비", "베이지"], rng.randint(0, 2)),
+        "budget_krw": rng.choice(_BUDGETS),
+    }
+
+
+def _checkout_body(rng: random.Random) -> dict:
+    return {
+        "product_name": "스텁 상품",
+        "brand":        "스텁",
+        "price_jpy":    rng.choice([3000, 5800, 12000]),
+        "email":        "loadtest@example.com",
+    }
+
+
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return round(values[lo] + (values[hi] - values[lo]) * (k - lo), 2)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    method: str,
+    path: str,
+    make_body: Optional[Callable[[random.Random], dict]],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    rng = random.Random(name)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    degraded = fallback = 0
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal degraded, fallback
+        for _ in queue:
+            body = make_body(rng) if make_body else None
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, path, json=body)
+                status = str(r.status_code)
+                if name == "recommend" and r.status_code == 200:
+                    data = r.json()
+                    degraded += bool(data.get("degraded"))
+                    fallback += data.get("source_korean") == "ai_fallback"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    result = {
+        "requests":    requests,
+        "concurrency": concurrency,
+        "elapsed_s":   round(elapsed, 2),
+        "rps":         round(requests / elapsed, 1) if elapsed else None,
+        "p50_ms":      _percentile(latencies, 50),
+        "p95_ms":      _percentile(latencies, 95),
+        "p99_ms":      _percentile(latencies, 99),
+        "max_ms":      round(latencies[-1], 2) if latencies else None,
+        "statuses":    statuses,
+        "errors":      sum(n for s, n in statuses.items() if not s.startswith("2")),
+    }
+    if name == "recommend":
+        result["degraded"] = degraded
+        result["ai_fallback"] = fallback
+    return result
+
+
+def _print_scenario(name: str, r: Dict[str, Any]) -> None:
+    color = GREEN if not r["errors"] else YELLOW
+    print(
+        f"  {color}{name:<14}{RESET} {r['rps']:>8} req/s   "
+        f"p50 {r['p50_ms']:>9} ms   p95 {r['p95_ms']:>9} ms   p99 {r['p99_ms']:>9} ms   "
+        f"오류 {r['errors']}"
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    stub_port, api_port = _free_port(), _free_port()
+    stub_base = f"http://127.0.0.1:{stub_port}"
+    api_base  = f"http://127.0.0.1:{api_port}"
+    data_dir  = _prepare_data_dir(stub_base)
+    log_path  = data_dir / "api.log"
+
+    stub_cmd = [sys.executable, __file__, "--serve-stubs", "--port", str(stub_port),
+                "--latency", *args.latency, "--fail", *args.fail]
+    if args.no_konbini:
+        stub_cmd.append("--no-konbini")
+    stub = subprocess.Popen(stub_cmd, cwd=BACKEND_DIR)
+
+    env = {
+        **os.environ,
+        "DATA_DIR":          str(data_dir),
+        "OPENAI_API_KEY":    "sk-loadtest",
+        "OPENAI_BASE_URL":   f"{stub_base}/openai/v1",
+        "STRIPE_SECRET_KEY": "sk_test_loadtest",
+        "STRIPE_API_BASE":   f"{stub_base}/stripe",
+        "YAHOO_CHART_URL":   f"{stub_base}/yahoo/v8/finance/chart/KRWJPY=X",
+        "CACHE_PREWARM":     "0",
+        "AI_PLAN_WARMUP":    "0",
+        "LOG_FORMAT":        "text",
+        **dict(kv.split("=", 1) for kv in args.env),
+    }
+    with open(log_path, "w") as log:
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(api_port),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+
+    scenarios = {
+        "exchange-rate": ("GET",  "/api/exchange-rate", None),
+        "recommend":     ("POST", "/api/recommend",     _recommend_body),
+        "checkout":      ("POST", "/api/checkout",      _checkout_body),
+    }
+    results: Dict[str, Any] = {}
+    try:
+        await _wait_ready(f"{stub_base}/_stats", stub)
+        await _wait_ready(f"{api_base}/api/exchange-rate", api)
+        print(f"{YELLOW}── 부하 테스트 (동시성 {args.concurrency}, 시나리오당 {args.requests}회) ──{RESET}")
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=api_base, timeout=args.timeout, limits=limits) as client:
+            for name in args.scenarios:
+                method, path, make_body = scenarios[name]
+                results[name] = await run_scenario(
+                    client, name, method, path, make_body, args.requests, args.concurrency
+                )
+                _print_scenario(name, results[name])
+            status = (await client.get("/api/crawler/status")).json()
+        upstream_calls = httpx.get(f"{stub_base}/_stats").json()
+        peak_rss = _peak_rss_mb(api.pid)
+    finally:
+        for proc in (api, stub):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    report = {
+        "timestamp":  time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "concurrency": args.concurrency,
+            "requests":    args.requests,
+            "latency_ms":  _pairs(args.latency),
+            "fail_rate":   _pairs(args.fail),
+            "konbini":     not args.no_konbini,
+            "env":         _pairs(args.env, float_values=False),
+        },
+        "scenarios":       results,
+        "peak_rss_mb":     peak_rss,
+        "browser_launches": status.get("browser_pool", {}).get("launches"),
+        "upstream_calls":  upstream_calls,
+        "cache":           status.get("cache"),
+        "ai_plans":        status.get("ai_plans"),
+        "extractor":       status.get("extractor"),
+    }
+    print(
+        f"  최대 RSS {peak_rss} MB   브라우저 기동 {report['browser_launches']}회   "
+        f"업스트림 호출 {upstream_calls}"
+    )
+    if args.keep_data:
+        print(f"  데이터/로그: {data_dir}")
+    else:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return report
+
+
+def _pairs(items: List[str], float_values: bool = True) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for kv in items:
+        k, _, v = kv.partition("=")
+        out[k] = float(v) if float_values else v
+    return out
+
+
+def compare(old_path: str, new_path: str) -> None:
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{YELLOW}── {old_path} → {new_path} ──{RESET}")
+    for name, n in new["scenarios"].items():
+        o = old["scenarios"].get(name)
+        if not o:
+            continue
+        cells = []
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            a, b = o.get(key), n.get(key)
+            if not a or b is None:
+                cells.append(f"{key} {b}")
+                continue
+            pct = (b - a) / a * 100
+            better = pct > 0 if key == "rps" else pct < 0
+            color = GREEN if better else RED if abs(pct) >= 5 else RESET
+            cells.append(f"{key} {a}→{b} ({color}{pct:+.0f}%{RESET})")
+        print(f"  {name:<14} " + "   ".join(cells))
+    print(f"  peak_rss_mb {old.get('peak_rss_mb')}→{new.get('peak_rss_mb')}   "
+          f"browser_launches {old.get('browser_launches')}→{new.get('browser_launches')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 API 부하 테스트")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="시나리오당 요청 수")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    parser.add_argument("--scenarios", nargs="+", default=["exchange-rate", "recommend", "checkout"],
+                        choices=["exchange-rate", "recommend", "checkout"])
+    parser.add_argument("--latency", nargs="*", default=["musinsa=300", "openai=800", "yahoo=50", "stripe=250"],
+                        metavar="NAME=MS", help="업스트림별 스텁 지연")
+    parser.add_argument("--fail", nargs="*", default=[], metavar="NAME=RATE", help="업스트림별 실패율 (0~1)")
+    parser.add_argument("--no-konbini", action="store_true", help="스텁 Stripe 계정에서 konbini 비활성화")
+    parser.add_argument("--env", nargs="*", default=[], metavar="KEY=VALUE", help="앱 프로세스 추가 환경변수")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본: bench-results/loadtest-<시각>.json)")
+    parser.add_argument("--keep-data", action="store_true", help="임시 DATA_DIR(캐시, api.log) 유지")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="결과 JSON 두 개 비교")
+    parser.add_argument("--serve-stubs", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    elif args.serve_stubs:
+        import uvicorn
+
+        app = build_stub_app(_pairs(args.latency), _pairs(args.fail), konbini=not args.no_konbini)
+        uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+    else:
+        report = asyncio.run(run(args))
+        out = Path(args.output) if args.output else RESULTS_DIR / f"loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"  결과 저장: {out}")
@@ -0,0 +1,165 @@
+"""
+구조화 로그 + 요청 ID
+=====================
+백엔드 전체가 print("[태그] 메시지") 한 줄 로그를 씁니다.
+LOG_FORMAT=json이면 이 줄들을 logging 레코드로 보내 JSON 포매터로 출력합니다
+(호출부 수정 없이 모든 모듈 로그가 구조화됨, 스레드별 줄 버퍼).
+
+  {"ts": "...", "tag": "cache", "msg": "HIT: musinsa_standard (12개)", "request_id": "3f2a..."}
+
+  - request_id: RequestIdMiddleware가 요청마다 설정 (X-Request-ID 헤더가 있으면 그대로 사용,
+    응답 헤더에도 포함). contextvar라서 요청 안에서 만든 Task와 스트리밍 본문 생성 중 로그에도 전달됨
+  - 요청 밖(백그라운드 루프, CLI)에서는 request_id가 null
+"""
+
+import contextvars
+import io
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import HTTP_REQUESTS, HTTP_SECONDS
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "request_id", default=None
+)
+
+_TAGGED = re.compile(r"^\[([\w\-]+)\]\s*(.*)$", re.S)
+
+
+def _timestamp(created: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(created)) + f".{int(created % 1 * 1000):03d}Z"
+
+
+class RequestIdFilter(logging.Filter):
+    """레코드에 request_id가 없으면 현재 컨텍스트(요청)의 값을 채움."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """"[태그] 메시지" → {"ts", "tag", "msg", "request_id"} 한 줄."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = record.getMessage()
+        m = _TAGGED.match(line)
+        tag, msg = (m.group(1), m.group(2)) if m else (None, line)
+        return json.dumps(
+            {
+                "ts":         _timestamp(record.created),
+                "tag":        tag,
+                "msg":        msg,
+                "request_id": getattr(record, "request_id", None),
+            },
+            ensure_ascii=False,
+        )
+
+
+class PrintToLog(io.TextIOBase):
+    """
+    print() 출력을 줄 단위 logging 레코드로 전달.
+    버퍼는 스레드별 (Stripe 실행기 / asyncio.to_thread의 print가 한 줄로 섞이지 않음),
+    request_id는 줄이 시작될 때의 컨텍스트 값 — 줄을 마친 스레드/요청이 아니라.
+    실제 출력은 logging 핸들러가 잠금을 잡고 한 레코드씩 씀.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self.logger = logger
+        self._local = threading.local()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        local = self._local
+        buf = getattr(local, "buf", "")
+        if not buf:
+            local.request_id = request_id_var.get()
+        buf += s
+        while "\n" in buf:
+            line, buf = buf.split("\n", 1)
+            if line.strip():
+                self.logger.info(line, extra={"request_id": local.request_id})
+            local.request_id = request_id_var.get()   # 다음 줄은 지금 시작
+        local.buf = buf
+        return len(s)
+
+    def flush(self) -> None:
+        for handler in self.logger.handlers:
+            handler.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def setup_logging() -> None:
+    """
+    LOG_FORMAT=json이면 print() 줄을 "seoulfit" 로거(JSON 포매터 + request_id 필터)로 보냄.
+    text: 그대로.
+    """
+    if os.getenv("LOG_FORMAT", "text") != "json" or isinstance(sys.stdout, PrintToLog):
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestIdFilter())
+    logger = logging.getLogger("seoulfit")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    sys.stdout = PrintToLog(logger)
+
+
+class RequestIdMiddleware:
+    """
+    요청 ID 설정 + 엔드포인트별 요청 수 / 처리 시간 메트릭.
+    순수 ASGI 미들웨어 — send를 감싸 마지막 본문 청크(more_body=False)를 보낸 시점까지 측정
+    (StreamingResponse의 SSE / NDJSON도 헤더 전송이 아니라 스트림 끝까지).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        rid = headers.get("x-request-id") or uuid.uuid4().hex[:16]
+        token = request_id_var.set(rid)
+        t0 = time.perf_counter()
+        status = 500
+        elapsed: Optional[float] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = rid
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                elapsed = time.perf_counter() - t0
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 경로 템플릿 기준 (/api/products/{goods_no}) — 라벨 수 폭증 방지
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            if elapsed is None:   # 본문을 끝까지 보내지 못함 (예외 / 연결 끊김)
+                elapsed = time.perf_counter() - t0
+            HTTP_SECONDS.observe(elapsed, method=scope["method"], path=path)
+            HTTP_REQUESTS.inc(method=scope["method"], path=path, status=str(status))
+            request_id_var.reset(token)
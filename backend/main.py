@@ -7,34 +7,108 @@ SEOULFIT Backend — FastAPI
   1. POST /api/recommend
      → kpop-brands.json에서 matchScore로 브랜드 랭킹
      → 상위 3개 브랜드를 무신사 API 크롤링 (6h 캐시)
-     → OpenAI로 아이돌 레퍼런스 + 해외 브랜드 생성
+     → OpenAI로 아이돌 레퍼런스 + 해외 브랜드 생성 (구간화 프로필 단위 캐시)
      → 크롤링 실패 시 AI fallback 사용
+     POST /api/recommend/stream  → 같은 흐름을 SSE로 (브랜드 → 상품 → 아이돌 순 즉시 전송)
+     POST /api/recommend/batch   → 다수 프로필 일괄 (브랜드 크롤링 중복 제거, NDJSON)
 
-  2. GET  /api/exchange-rate  → Yahoo Finance 실시간 KRW→JPY
+  2. GET  /api/exchange-rate  → Yahoo Finance KRW→JPY (주기 갱신 값, 나이/stale 포함)
 
   3. POST /api/checkout       → Stripe Checkout (JPY, card + konbini)
+
+  4. GET  /api/products/{goods_no}, POST /api/products/batch
+                              → 크롤링 결과 카탈로그(goods_no 인덱스)에서 조회
+     GET  /api/img/{goods_no}?w=300 → 상품 이미지 프록시 (리사이즈 썸네일 디스크 캐시)
+
+CRAWL_MODE=worker이면 크롤링은 별도 워커 프로세스가 담당 (crawl_worker.py).
 """
 
 import asyncio
-import json
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-import httpx
 import stripe
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from openai import AsyncOpenAI
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from crawler import load_brands, rank_brands, search_brand_cached
+from ai_plan import ai_plans, normalize_profile
+from batch import BATCH_MAX_PROFILES, run_batch
+from browser_pool import browser_pool
+from crawl_health import crawl_health
+from crawl_worker import dispatcher, job_queue
+from crawler import (
+    CRAWL_MODE,
+    backend_stats,
+    brands_snapshot,
+    cache_events,
+    catalog,
+    cached_products,
+    crawl_cache,
+    crawl_timing_stats,
+    flush_hits,
+    migrate_json_cache,
+    search_brand_cached,
+)
+from clients import clients
+from exchange import rate_service
+from images import IMAGE_CACHE_CONTROL, IMAGE_SIZES, ImageError, image_proxy
+from logs import RequestIdMiddleware, setup_logging
+from metrics import RECOMMEND_RESULTS, render as render_metrics, stage_timer
+from payments import checkout_service
+from ranking import brand_index
+from refresher import refresher
+from serialization import JSON_RESPONSE_CLASS, dumps_text, stats as serialization_stats
 
 load_dotenv()
+setup_logging()
+
+
+# ── Lifespan ───────────────────────────────────────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(migrate_json_cache)
+    rate_service.start()
+    checkout_service.start()
+    await asyncio.to_thread(image_proxy.cache.load)
+    # Chromium 상주 기동 실패는 치명적이지 않음 — 첫 크롤링에서 재시도
+    # (CRAWL_MODE=worker면 크롤링은 crawl_worker.py 프로세스가 담당 — 브라우저 없음)
+    if CRAWL_MODE != "worker":
+        try:
+            await browser_pool.start()
+        except Exception as e:
+            print(f"[browser-pool] 사전 기동 실패: {e}")
+    # 만료 전 백그라운드 갱신 (별도 프로세스로 돌릴 때는 python refresher.py)
+    if os.getenv("CACHE_PREWARM", "") == "1":
+        refresher.start()
+    # 인기 프로필 AI 플랜 만료 전 재생성 (또는: python ai_plan.py --once)
+    if os.getenv("AI_PLAN_WARMUP", "") == "1":
+        ai_plans.start()
+    yield
+    await ai_plans.stop()
+    await rate_service.stop()
+    await checkout_service.stop()
+    await refresher.stop()
+    await browser_pool.close()
+    await clients.aclose()
+    await asyncio.to_thread(flush_hits)
+    crawl_cache.store.close()
+    ai_plans.cache.store.close()
+    catalog.close()
+    job_queue.close()
+
 
 # ── App ────────────────────────────────────────────────────────────────────────
-app = FastAPI(title="SEOULFIT API", version="2.1.0")
+app = FastAPI(
+    title="SEOULFIT API",
+    version="2.1.0",
+    lifespan=lifespan,
+    default_response_class=JSON_RESPONSE_CLASS,   # orjson (serialization.py)
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -42,36 +116,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestIdMiddleware)
 
-stripe.api_key      = os.getenv("STRIPE_SECRET_KEY", "")
-openai_client       = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
-FRONTEND_URL        = os.getenv("FRONTEND_URL", "http://localhost:5500")
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5500")
+# /api/recommend 전체 응답 데드라인(초) — 넘기면 준비된 결과 + 캐시/fallback으로 응답
+RECOMMEND_DEADLINE = float(os.getenv("RECOMMEND_DEADLINE", "12"))
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 1. 환율  (Yahoo Finance KRW → JPY)
 # ══════════════════════════════════════════════════════════════════════════════
 
-async def _fetch_krw_jpy() -> float:
-    url = "https://query1.finance.yahoo.com/v8/finance/chart/KRWJPY=X"
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.get(
-                url,
-                params={"interval": "1d", "range": "1d"},
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            data = r.json()
-            return float(data["chart"]["result"][0]["meta"]["regularMarketPrice"])
-    except Exception as e:
-        print(f"[exchange-rate] 오류: {e}")
-        return 0.0973  # fallback
-
-
 @app.get("/api/exchange-rate")
 async def get_exchange_rate():
-    rate = await _fetch_krw_jpy()
-    return {"krw_to_jpy": rate, "source": "Yahoo Finance", "pair": "KRWJPY=X"}
+    """마지막으로 갱신된 환율을 즉시 반환 (백그라운드 주기 갱신, Yahoo 대기 없음)."""
+    return rate_service.snapshot()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -88,83 +147,24 @@ class RecommendRequest(BaseModel):
     email:      str            = ""
 
 
-async def _ai_idol_ref(req: RecommendRequest, brands_info: str) -> dict:
+async def _ai_idol_ref(req: RecommendRequest, top3: List[dict]) -> dict:
     """
     OpenAI로 아이돌 레퍼런스 + 해외 브랜드 생성.
     무신사 브랜드 랭킹 결과를 컨텍스트로 제공.
+    구간화한 프로필 단위로 캐시 (ai_plan.py) — 반복 프로필은 토큰 없이 즉시 응답.
     """
-    prompt = f"""당신은 K-POP 아이돌 공항 패션 전문 스타일리스트입니다.
-
-사용자 정보:
-- 키: {req.height}cm, 체중: {req.weight}kg, 체형: {req.body_type}
-- 원하는 스타일: {', '.join(req.styles) or '미기재'}
-- 선호 색상: {', '.join(req.colors) or '미기재'}
-- 예산 (KRW): {req.budget_krw or '미기재'}
-
-이 사용자에게 추천된 무신사 브랜드 (matchScore 결과):
-{brands_info}
-
-아래 JSON만 반환 (한국어):
-{{
-  "idol_name": "가장 잘 어울리는 아이돌 이름 (예: BTS RM, aespa 카리나)",
-  "idol_style_ref": "이 사용자에게 어울리는 공항 패션 스타일 설명 (3문장, 위 브랜드 언급 포함)",
-  "product_descriptions": {{
-    "brand_id_1": "이 브랜드 상품이 이 체형/스타일에 어울리는 이유 (1~2문장)",
-    "brand_id_2": "이 브랜드 상품이 이 체형/스타일에 어울리는 이유",
-    "brand_id_3": "이 브랜드 상품이 이 체형/스타일에 어울리는 이유"
-  }},
-  "korean_brands_fallback": [
-    {{
-      "brand": "한국 브랜드명",
-      "product_name": "구체적 상품명",
-      "product_description": "설명 2문장",
-      "price_krw": 숫자,
-      "style_tags": ["태그1", "태그2"],
-      "is_korean": true,
-      "source": "ai_fallback"
-    }}
-  ],
-  "other_brands": [
-    {{
-      "brand": "해외 브랜드 (아이돌 착용 브랜드 우선)",
-      "product_name": "상품명",
-      "product_description": "설명 2문장",
-      "price_krw": 숫자,
-      "style_tags": ["태그1", "태그2"],
-      "is_korean": false,
-      "source": "ai"
-    }}
-  ]
-}}
-
-- korean_brands_fallback: 3개 (크롤링 실패 시 표시)
-- other_brands: 2개
-- 예산({req.budget_krw})에 맞는 price_krw 설정
-"""
-    resp = await openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        response_format={"type": "json_object"},
-        max_tokens=1800,
+    profile = normalize_profile(
+        req.height, req.weight, req.body_type, req.styles, req.colors,
+        req.budget_krw, [b["id"] for b in top3],
     )
-    return json.loads(resp.choices[0].message.content)
+    return await ai_plans.get(profile, _brands_info(top3))
 
 
-@app.post("/api/recommend")
-async def recommend(req: RecommendRequest):
-    """
-    K-POP 아이돌 공항 패션 AI 추천.
-
-    1. kpop-brands.json에서 matchScore로 브랜드 랭킹
-    2. 상위 3개 브랜드 무신사 크롤링 (6h 캐시)
-    3. OpenAI로 아이돌 레퍼런스 + 해외 브랜드
-    """
+def _rank_top3(req: RecommendRequest) -> List[dict]:
+    """matchScore 상위 3개 브랜드 (컴파일된 카탈로그, 파일 변경 시 자동 재로드)."""
     if not os.getenv("OPENAI_API_KEY"):
         raise HTTPException(status_code=400, detail="OPENAI_API_KEY 환경변수를 설정해주세요.")
-
-    # ① matchScore로 브랜드 랭킹
-    all_brands = load_brands()
-    if not all_brands:
+    if not brand_index.brands():
         raise HTTPException(status_code=500, detail="kpop-brands.json 로드 실패")
 
     user_input = {
@@ -172,57 +172,360 @@ async def recommend(req: RecommendRequest):
         "budget_krw": req.budget_krw,
         "body_type":  req.body_type,
     }
-    ranked   = rank_brands(user_input, all_brands)
-    top3     = ranked[:3]
+    with stage_timer("ranking"):
+        return brand_index.top_k(user_input, 3)
 
-    # AI에게 넘길 브랜드 요약
-    brands_info = "\n".join(
+
+def _brands_info(top3: List[dict]) -> str:
+    """AI에게 넘길 브랜드 요약."""
+    return "\n".join(
         f"- {b['name_ko']} ({b['id']}): {', '.join(b.get('style_tags', []))}"
         for b in top3
     )
 
-    # ② 무신사 크롤링 + AI 생성 병렬 실행
-    crawl_tasks = [
-        search_brand_cached(b, req.budget_krw, limit=2) for b in top3
-    ]
-    ai_task = _ai_idol_ref(req, brands_info)
 
-    crawl_results_nested, ai_plan = await asyncio.gather(
-        asyncio.gather(*crawl_tasks, return_exceptions=True),
-        ai_task,
-        return_exceptions=True,
-    )
-
-    if isinstance(ai_plan, Exception):
-        raise HTTPException(status_code=500, detail=f"OpenAI 오류: {ai_plan}")
-
-    # ③ 크롤링 결과 병합 + AI 설명 보강
+def _decorate(products: List[dict], brand: dict, desc_map: dict, body_type: str) -> List[dict]:
+    """크롤링 상품에 스타일 태그 / AI 설명 보강."""
+    for p in products:
+        p.setdefault("style_tags",
+                     brand.get("style_tags", ["스타일리시", "트렌디"])[:3])
+        p.setdefault("product_description",
+                     desc_map.get(brand["id"],
+                                  f"{body_type or '기본'} 체형에 잘 어울리는 아이템입니다."))
+    return products
+
+
+async def _fill_gap(brand: dict, budget_krw: str) -> Tuple[List[dict], str]:
+    """데드라인 초과/오류 브랜드 → 마지막 캐시 상품, 없으면 AI fallback으로 채울 자리."""
+    cached = await cached_products(brand, budget_krw, limit=2)
+    if cached:
+        return cached, "cache"
+    return [], "ai_fallback"
+
+
+def _assemble(
+    req: RecommendRequest,
+    top3: List[dict],
+    crawled: List[List[dict]],
+    ai_plan: dict,
+    degraded: Dict[str, dict],
+) -> dict:
+    """브랜드별 크롤링 결과(top3 순서) + AI 결과 → 응답 본문."""
     desc_map: dict = ai_plan.get("product_descriptions", {})
-
     musinsa_products: List[dict] = []
-    for i, result in enumerate(crawl_results_nested):
-        if isinstance(result, Exception):
-            print(f"[recommend] 크롤링 오류 ({top3[i]['id']}): {result}")
-            continue
-        brand = top3[i]
-        for p in result:
-            p.setdefault("style_tags",
-                         brand.get("style_tags", ["스타일리시", "트렌디"])[:3])
-            p.setdefault("product_description",
-                         desc_map.get(brand["id"],
-                                      f"{req.body_type or '기본'} 체형에 잘 어울리는 아이템입니다."))
-            musinsa_products.append(p)
+    for brand, products in zip(top3, crawled):
+        musinsa_products.extend(_decorate(products, brand, desc_map, req.body_type))
+
+    # 크롤링 실패 시 AI fallback / 데드라인으로 빠진 자리는 fallback으로 보충
+    fallback = ai_plan.get("korean_brands_fallback", [])
+    korean_brands = musinsa_products[:3] or fallback
+    if degraded and musinsa_products and len(korean_brands) < 3:
+        korean_brands = korean_brands + fallback[:3 - len(korean_brands)]
 
-    # ④ 크롤링 실패 시 AI fallback
-    korean_brands = musinsa_products[:3] or ai_plan.get("korean_brands_fallback", [])
+    source_korean = "musinsa" if musinsa_products else "ai_fallback"
+    RECOMMEND_RESULTS.inc(source_korean=source_korean)
 
     return {
         "idol_name":      ai_plan.get("idol_name", "K-POP"),
         "idol_style_ref": ai_plan.get("idol_style_ref", ""),
         "korean_brands":  korean_brands[:3],
         "other_brands":   ai_plan.get("other_brands", [])[:2],
-        "source_korean":  "musinsa" if musinsa_products else "ai_fallback",
+        "source_korean":  source_korean,
         "matched_brands": [b["id"] for b in top3],   # 디버그용
+        "degraded":       degraded,                  # {brand_id | "ai": {reason, filled_from}}
+    }
+
+
+@app.post("/api/recommend")
+async def recommend(req: RecommendRequest):
+    """
+    K-POP 아이돌 공항 패션 AI 추천.
+
+    1. kpop-brands.json에서 matchScore로 브랜드 랭킹
+    2. 상위 3개 브랜드 무신사 크롤링 (6h 캐시)
+    3. OpenAI로 아이돌 레퍼런스 + 해외 브랜드
+
+    RECOMMEND_DEADLINE 초가 지나면 남은 작업을 기다리지 않고 준비된 결과로 응답.
+    빠진 브랜드는 마지막 캐시 / korean_brands_fallback으로 채우고 degraded에 표시.
+    """
+    # ① matchScore로 브랜드 랭킹
+    top3 = _rank_top3(req)
+
+    # ② 무신사 크롤링 + AI 생성 병렬 실행 (데드라인까지)
+    crawl_tasks = [
+        asyncio.ensure_future(search_brand_cached(b, req.budget_krw, limit=2)) for b in top3
+    ]
+    ai_task = asyncio.ensure_future(_ai_idol_ref(req, top3))
+    _, pending = await asyncio.wait([*crawl_tasks, ai_task], timeout=RECOMMEND_DEADLINE)
+    # 대기만 취소 — 크롤링 자체는 single-flight로 백그라운드에서 끝까지 진행되어 캐시에 저장
+    for task in pending:
+        task.cancel()
+
+    degraded: Dict[str, dict] = {}
+    if ai_task in pending:
+        ai_plan: dict = {}
+        degraded["ai"] = {"reason": "deadline", "filled_from": "default"}
+    elif ai_task.exception() is not None:
+        # 데드라인 초과와 같게 처리 — 이미 받은 크롤링 결과는 버리지 않음 (스트리밍 경로와 동일)
+        print(f"[recommend] OpenAI 오류: {ai_task.exception()}")
+        ai_plan = {}
+        degraded["ai"] = {"reason": "error", "filled_from": "default"}
+    else:
+        ai_plan = ai_task.result()
+
+    # ③ 크롤링 결과 병합 + AI 설명 보강 / 실패 시 AI fallback
+    crawled: List[List[dict]] = []
+    for brand, task in zip(top3, crawl_tasks):
+        if task in pending or task.exception() is not None:
+            reason = "deadline" if task in pending else "error"
+            if reason == "error":
+                print(f"[recommend] 크롤링 오류 ({brand['id']}): {task.exception()}")
+            products, filled_from = await _fill_gap(brand, req.budget_krw)
+            degraded[brand["id"]] = {"reason": reason, "filled_from": filled_from}
+        else:
+            products = task.result()
+        crawled.append(products)
+
+    if degraded:
+        print(f"[recommend] 부분 응답: {degraded}")
+    # 본문이 JSON 기본 타입뿐이라 응답 객체를 직접 만들어 jsonable_encoder 순회를 생략
+    return JSON_RESPONSE_CLASS(_assemble(req, top3, crawled, ai_plan, degraded))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps_text(data)}\n\n"
+
+
+async def _recommend_events(req: RecommendRequest, top3: List[dict]) -> AsyncIterator[str]:
+    """
+    brands → products(브랜드별, 크롤링 완료 순) / idol(AI 응답 시) → done.
+    AI 오류는 error 이벤트로 알리고 크롤링 결과만으로 done을 보냄.
+    RECOMMEND_DEADLINE이 지나면 남은 브랜드는 캐시/fallback으로 채워 보내고 종료.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + RECOMMEND_DEADLINE
+
+    yield _sse("brands", {
+        "matched_brands": [
+            {"id": b["id"], "name_ko": b["name_ko"], "style_tags": b.get("style_tags", [])}
+            for b in top3
+        ],
+    })
+
+    crawl_tasks: Dict[asyncio.Future, int] = {
+        asyncio.ensure_future(search_brand_cached(b, req.budget_krw, limit=2)): i
+        for i, b in enumerate(top3)
+    }
+    ai_task = asyncio.ensure_future(_ai_idol_ref(req, top3))
+    pending = {*crawl_tasks, ai_task}
+
+    crawled: List[List[dict]] = [[] for _ in top3]
+    ai_plan: dict = {}
+    degraded: Dict[str, dict] = {}
+
+    def products_event(i: int) -> str:
+        # done에서 AI 설명으로 다시 보강하므로 사본을 꾸밈
+        brand = top3[i]
+        products = _decorate(
+            [dict(p) for p in crawled[i]],
+            brand,
+            ai_plan.get("product_descriptions", {}),
+            req.body_type,
+        )
+        data = {"brand_id": brand["id"], "products": products}
+        if brand["id"] in degraded:
+            data["degraded"] = degraded[brand["id"]]
+        return _sse("products", data)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break   # 데드라인
+            for task in done:
+                if task is ai_task:
+                    if task.exception() is not None:
+                        print(f"[recommend] OpenAI 오류: {task.exception()}")
+                        yield _sse("error", {"stage": "ai", "detail": f"OpenAI 오류: {task.exception()}"})
+                        continue
+                    ai_plan = task.result()
+                    yield _sse("idol", {
+                        "idol_name":            ai_plan.get("idol_name", "K-POP"),
+                        "idol_style_ref":       ai_plan.get("idol_style_ref", ""),
+                        "product_descriptions": ai_plan.get("product_descriptions", {}),
+                        "other_brands":         ai_plan.get("other_brands", [])[:2],
+                    })
+                    continue
+
+                i = crawl_tasks[task]
+                if task.exception() is not None:
+                    print(f"[recommend] 크롤링 오류 ({top3[i]['id']}): {task.exception()}")
+                else:
+                    crawled[i] = task.result()
+                yield products_event(i)
+    finally:
+        # 데드라인 / 클라이언트 연결 종료 — 대기만 취소, 크롤링은 single-flight로 계속 진행
+        for task in pending:
+            task.cancel()
+
+    # 데드라인을 넘긴 부분은 캐시/fallback으로 채움
+    if ai_task in pending:
+        degraded["ai"] = {"reason": "deadline", "filled_from": "default"}
+        yield _sse("error", {"stage": "ai", "detail": "데드라인 초과"})
+    for task, i in crawl_tasks.items():
+        if task in pending:
+            crawled[i], filled_from = await _fill_gap(top3[i], req.budget_krw)
+            degraded[top3[i]["id"]] = {"reason": "deadline", "filled_from": filled_from}
+            yield products_event(i)
+
+    yield _sse("done", _assemble(req, top3, crawled, ai_plan, degraded))
+
+
+@app.post("/api/recommend/stream")
+async def recommend_stream(req: RecommendRequest):
+    """
+    /api/recommend의 Server-Sent Events 버전 (text/event-stream).
+
+      event: brands    랭킹 직후 매칭 브랜드
+      event: products  브랜드별 무신사 상품 (크롤링이 끝나는 순서대로)
+      event: idol      AI 아이돌 레퍼런스 + 해외 브랜드
+      event: error     AI 실패 / 데드라인 초과 (크롤링 결과는 계속 전송)
+      event: done      /api/recommend와 같은 최종 응답 본문 (degraded 포함)
+    """
+    top3 = _rank_top3(req)
+    return StreamingResponse(
+        _recommend_events(req, top3),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class BatchRequest(BaseModel):
+    profiles: List[RecommendRequest]
+
+
+async def finish_batch_item(req: RecommendRequest, top3: List[dict], crawled: List[List[dict]]) -> dict:
+    """일괄 추천의 프로필 1개 완성 — AI 플랜(캐시) + 응답 조립 (/api/recommend와 같은 본문)."""
+    ai_plan = await _ai_idol_ref(req, top3)
+    return _assemble(req, top3, crawled, ai_plan, {})
+
+
+@app.post("/api/recommend/batch")
+async def recommend_batch(batch: BatchRequest):
+    """
+    여러 프로필 일괄 추천 (캠페인 사전 계산용). 응답은 NDJSON, 완료 순서대로 한 줄씩:
+      {"index": i, "result": {...}}  또는  {"index": i, "error": "..."}
+    랭킹은 한 번에, 브랜드 크롤링은 프로필 간 중복 제거 후 브랜드당 1회 (batch.py).
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        raise HTTPException(status_code=400, detail="OPENAI_API_KEY 환경변수를 설정해주세요.")
+    if not batch.profiles:
+        raise HTTPException(status_code=400, detail="profiles가 비어 있습니다.")
+    if len(batch.profiles) > BATCH_MAX_PROFILES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_MAX_PROFILES}개 프로필까지 가능합니다.")
+    if not brand_index.brands():
+        raise HTTPException(status_code=500, detail="kpop-brands.json 로드 실패")
+
+    reqs = batch.profiles
+
+    async def lines() -> AsyncIterator[str]:
+        async for item in run_batch(
+            [{"styles": r.styles, "budget_krw": r.budget_krw, "body_type": r.body_type} for r in reqs],
+            lambda i, top3, crawled: finish_batch_item(reqs[i], top3, crawled),
+        ):
+            yield dumps_text(item) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 상품 조회  (goods_no 카탈로그 — 크롤링 없음)
+# ══════════════════════════════════════════════════════════════════════════════
+
+PRODUCTS_BATCH_MAX = 200
+
+
+class ProductsBatchRequest(BaseModel):
+    goods_nos: List[str]
+
+
+@app.get("/api/products/{goods_no}")
+async def get_product(goods_no: str):
+    """카탈로그에 기록된 상품 (first_seen / last_seen / listed 포함)."""
+    product = await catalog.get(goods_no)
+    if product is None:
+        raise HTTPException(status_code=404, detail=f"상품 없음: {goods_no}")
+    return product
+
+
+@app.post("/api/products/batch")
+async def get_products(batch: ProductsBatchRequest):
+    """{"products": {goods_no: 상품}, "missing": [...]} — 요청 순서 유지."""
+    if len(batch.goods_nos) > PRODUCTS_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {PRODUCTS_BATCH_MAX}개까지 가능합니다.")
+    goods_nos = list(dict.fromkeys(batch.goods_nos))
+    found = await catalog.get_many(goods_nos)
+    return JSON_RESPONSE_CLASS({
+        "products": {g: found[g] for g in goods_nos if g in found},
+        "missing":  [g for g in goods_nos if g not in found],
+    })
+
+
+@app.get("/api/img/{goods_no}")
+async def product_image(
+    goods_no: str,
+    w: int = IMAGE_SIZES[-1],
+    if_none_match: Optional[str] = Header(None),
+):
+    """상품 이미지 프록시 — 리사이즈 썸네일 디스크 캐시 (images.py). w: IMAGE_SIZES 중 하나."""
+    if not goods_no.isdigit():
+        raise HTTPException(status_code=400, detail="goods_no는 숫자여야 합니다.")
+    if w not in IMAGE_SIZES:
+        raise HTTPException(status_code=400, detail=f"w는 {list(IMAGE_SIZES)} 중 하나여야 합니다.")
+    try:
+        body, etag, media_type = await image_proxy.get(goods_no, w)
+    except ImageError as e:
+        raise HTTPException(status_code=e.status, detail=str(e))
+
+    headers = {"ETag": f'"{etag}"', "Cache-Control": IMAGE_CACHE_CONTROL}
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if headers["ETag"] in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 운영용 (Prometheus 메트릭 / 크롤러 상태)
+# ══════════════════════════════════════════════════════════════════════════════
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 스크레이프 엔드포인트 (metrics.py)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/crawler/status")
+async def crawler_status():
+    return {
+        "extractor":    backend_stats(),
+        "playwright":   crawl_timing_stats(),
+        "browser_pool": browser_pool.stats(),
+        "crawl_queue":  await dispatcher.stats(),
+        "health":       crawl_health.stats(),
+        "clients":      clients.stats(),
+        "checkout":     checkout_service.stats(),
+        "cache":        {**crawl_cache.stats(), "events": dict(cache_events)},
+        "catalog":      catalog.stats(),
+        "serialization": {**serialization_stats(), "brands": brands_snapshot.stats()},
+        "images":       image_proxy.stats(),
+        "refresher":    refresher.stats(),
+        "ai_plans":     ai_plans.stats(),
+        "ranking":      brand_index.stats(),
     }
 
 
@@ -247,8 +550,9 @@ async def create_checkout(req: CheckoutRequest):
     Stripe Checkout 세션 생성.
     결제수단: カード (Visa/MC/JCB) + コンビニ決済
     ※ konbini는 Stripe 계정에서 활성화 필요 (Japan Payments).
+      활성화 여부는 payments.checkout_service가 캐시 — 결제당 Stripe 호출 1회.
     """
-    if not stripe.api_key:
+    if clients.stripe is None:
         raise HTTPException(status_code=400, detail="STRIPE_SECRET_KEY 환경변수를 설정해주세요.")
     if req.price_jpy < 120:
         raise HTTPException(status_code=400, detail="최소 결제 금액은 ¥120입니다.")
@@ -279,28 +583,20 @@ async def create_checkout(req: CheckoutRequest):
         "quantity": 1,
     }
 
-    base_kwargs = dict(
-        line_items=[line_item],
-        mode="payment",
-        success_url=success_url,
-        cancel_url=cancel_url,
+    base_params = {
+        "line_items":  [line_item],
+        "mode":        "payment",
+        "success_url": success_url,
+        "cancel_url":  cancel_url,
         **({"customer_email": req.email} if req.email else {}),
-    )
+    }
 
-    for payment_methods in (["card", "konbini"], ["card"]):
-        try:
-            session = stripe.checkout.Session.create(
-                payment_method_types=payment_methods,
-                **base_kwargs,
-            )
-            return {
-                "checkout_url":    session.url,
-                "session_id":      session.id,
-                "payment_methods": payment_methods,
-            }
-        except stripe.error.InvalidRequestError:
-            if payment_methods == ["card"]:
-                raise
-            continue
-        except stripe.error.StripeError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        session, payment_methods = await checkout_service.create_session(base_params)
+    except stripe.error.StripeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "checkout_url":    session.url,
+        "session_id":      session.id,
+        "payment_methods": payment_methods,
+    }
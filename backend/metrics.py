@@ -0,0 +1,214 @@
+"""
+메트릭 (Prometheus 텍스트 포맷)
+===============================
+GET /metrics 로 노출. 외부 의존성 없이 Counter / Gauge / Histogram만 구현합니다.
+
+  - seoulfit_stage_seconds{stage}              단계별 지연 히스토그램
+        ranking / cache_lookup / crawl / openai / stripe / yahoo / msscdn
+  - seoulfit_cache_requests_total{cache,result} 캐시별 fresh·stale·miss·hit 집계 (musinsa / ai_plans / image)
+  - seoulfit_crawl_results_total{brand,outcome} 브랜드별 success / empty / failure
+  - seoulfit_crawl_breaker_state{host} / seoulfit_crawl_concurrency_limit{host}  (crawl_health.py)
+  - seoulfit_browser_pages_in_flight           Playwright 사용 중 페이지 수
+  - seoulfit_recommend_total{source_korean}     musinsa / ai_fallback 응답 수 (fallback 비율)
+  - seoulfit_http_requests_total / seoulfit_http_request_seconds  엔드포인트별
+
+사용:
+  with stage_timer("openai"):
+      resp = await ...
+  CACHE_REQUESTS.inc(cache="musinsa", result="miss")
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# 초 단위 (Playwright 경로는 수십 초까지 걸림)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    @abstractmethod
+    def collect(self) -> List[str]:
+        """샘플 줄 목록 (HELP / TYPE 제외)."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.collect())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """현재 값. fn을 주면 수집 시점에 호출해 값을 읽음."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        fn: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.fn = fn
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def collect(self) -> List[str]:
+        if self.fn is not None:
+            try:
+                return [f"{self.name} {_fmt(self.fn())}"]
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # 라벨 → [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """블록 실행 시간 기록 (예외/취소 포함). async 코드의 await를 감싸도 됨."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, row in items:
+            for bound, count in zip(self.buckets, row):
+                le = f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_fmt(count)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {row[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_fmt(row[-1])}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    """등록된 전체 메트릭 (Prometheus text exposition 0.0.4)."""
+    return "\n".join(m.render() for m in REGISTRY) + "\n"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 메트릭 정의
+# ══════════════════════════════════════════════════════════════════════════════
+
+STAGE_SECONDS = Histogram(
+    "seoulfit_stage_seconds", "단계별 소요 시간 (초)", ["stage"]
+)
+CACHE_REQUESTS = Counter(
+    "seoulfit_cache_requests_total", "캐시 조회 결과", ["cache", "result"]
+)
+CRAWL_RESULTS = Counter(
+    "seoulfit_crawl_results_total", "브랜드 크롤링 결과", ["brand", "outcome"]
+)
+CRAWL_BREAKER_STATE = Gauge(
+    "seoulfit_crawl_breaker_state", "호스트별 서킷 상태 (0 closed / 1 half_open / 2 open)", ["host"]
+)
+CRAWL_CONCURRENCY_LIMIT = Gauge(
+    "seoulfit_crawl_concurrency_limit", "호스트별 AIMD 동시 크롤링 한도", ["host"]
+)
+RECOMMEND_RESULTS = Counter(
+    "seoulfit_recommend_total", "추천 응답 수 (source_korean별)", ["source_korean"]
+)
+HTTP_REQUESTS = Counter(
+    "seoulfit_http_requests_total", "HTTP 요청 수", ["method", "path", "status"]
+)
+HTTP_SECONDS = Histogram(
+    "seoulfit_http_request_seconds", "HTTP 요청 처리 시간 (초)", ["method", "path"]
+)
+
+
+def stage_timer(stage: str):
+    """with stage_timer("crawl"): ... — seoulfit_stage_seconds{stage} 기록."""
+    return STAGE_SECONDS.time(stage=stage)
@@ -0,0 +1,161 @@
+"""
+Stripe Checkout 세션 생성
+=========================
+stripe SDK 호출은 동기(requests)이므로 이벤트 루프에서 직접 부르면
+Stripe 왕복 시간 동안 uvicorn 전체가 멈춥니다.
+
+  - SDK 호출은 전용 ThreadPoolExecutor(STRIPE_POOL_SIZE 스레드)에서 실행
+    → 동시 결제 요청 수와 requests 커넥션 풀 크기를 맞춤
+  - konbini(コンビニ決済) 사용 가능 여부를 캐시
+      · 시작 시 + KONBINI_PROBE_INTERVAL 초마다 계정 capabilities(konbini_payments) 조회
+      · 조회 결과가 있으면 결제마다 Stripe 호출은 정확히 1회
+      · 조회 실패(제한 키 등)면 예전처럼 card+konbini → card 재시도로 판별하고 결과를 캐시
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional, Tuple
+
+import stripe
+
+from clients import STRIPE_POOL_SIZE, clients
+from metrics import stage_timer
+
+KONBINI_PROBE_INTERVAL = int(os.getenv("KONBINI_PROBE_INTERVAL", "3600"))   # 1시간
+
+_WITH_KONBINI = ["card", "konbini"]
+_CARD_ONLY    = ["card"]
+
+
+class CheckoutService:
+    def __init__(
+        self,
+        workers: int = STRIPE_POOL_SIZE,
+        probe_interval: int = KONBINI_PROBE_INTERVAL,
+    ) -> None:
+        self.workers = workers
+        self.probe_interval = probe_interval
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # konbini 사용 가능 여부 (None = 아직 모름)
+        self.konbini: Optional[bool] = None
+        self.checked_at: Optional[float] = None
+        self.source: Optional[str] = None   # "account" | "checkout"
+
+        self.sessions = 0
+        self.calls    = 0
+        self.retries  = 0
+        self.probe_failures = 0
+
+    # ── 실행기 ────────────────────────────────────────────────────────────────
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """동기 SDK 호출을 전용 스레드 풀에서 실행."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="stripe")
+        loop = asyncio.get_running_loop()
+        with stage_timer("stripe"):
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    # ── konbini 판별 ──────────────────────────────────────────────────────────
+
+    def _remember(self, available: bool, source: str) -> None:
+        if available != self.konbini:
+            print(f"[checkout] konbini {'사용 가능' if available else '미지원'} ({source})")
+        self.konbini, self.checked_at, self.source = available, time.time(), source
+
+    def _is_fresh(self) -> bool:
+        return self.checked_at is not None and time.time() - self.checked_at < self.probe_interval
+
+    async def probe(self) -> Optional[bool]:
+        """계정 capabilities로 konbini 활성화 여부 확인. 실패하면 기존 값 유지."""
+        client = clients.stripe
+        if client is None:
+            return None
+        try:
+            account = await self._run(client.accounts.retrieve_current)
+            status = getattr(getattr(account, "capabilities", None), "konbini_payments", None)
+        except stripe.error.StripeError as e:
+            self.probe_failures += 1
+            print(f"[checkout] konbini 확인 실패: {e}")
+            return self.konbini
+        self._remember(status == "active", "account")
+        return self.konbini
+
+    async def run_forever(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.probe_interval)
+
+    def start(self) -> None:
+        if self._task is None and clients.stripe is not None:
+            self._task = asyncio.ensure_future(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ── 세션 생성 ─────────────────────────────────────────────────────────────
+
+    async def create_session(self, params: dict) -> Tuple[Any, List[str]]:
+        """
+        Checkout 세션 생성 → (session, payment_methods).
+        STRIPE_SECRET_KEY가 없으면 RuntimeError, Stripe 오류는 그대로 전달.
+        """
+        client = clients.stripe
+        if client is None:
+            raise RuntimeError("STRIPE_SECRET_KEY가 설정되지 않았습니다")
+
+        async def create(methods: List[str]) -> Any:
+            self.calls += 1
+            return await self._run(
+                client.checkout.sessions.create,
+                params={"payment_method_types": methods, **params},
+            )
+
+        if self.konbini is False and self._is_fresh():
+            methods = _CARD_ONLY
+            session = await create(methods)
+        else:
+            try:
+                methods = _WITH_KONBINI
+                session = await create(methods)
+                if self.source != "account" or not self._is_fresh():
+                    self._remember(True, "checkout")
+            except stripe.error.InvalidRequestError:
+                # card만으로도 실패하면 konbini 문제가 아니므로 캐시하지 않음
+                self.retries += 1
+                methods = _CARD_ONLY
+                session = await create(methods)
+                # 계정 확인 결과가 유효하면 유지 — 이 주문만의 konbini 제한(금액/통화 등)일 수 있음
+                if self.source != "account" or not self._is_fresh():
+                    self._remember(False, "checkout")
+
+        self.sessions += 1
+        return session, methods
+
+    def stats(self) -> dict:
+        return {
+            "konbini":        self.konbini,
+            "source":         self.source,
+            "age_s":          round(time.time() - self.checked_at, 1) if self.checked_at else None,
+            "sessions":       self.sessions,
+            "stripe_calls":   self.calls,
+            "retries":        self.retries,
+            "probe_failures": self.probe_failures,
+        }
+
+
+checkout_service = CheckoutService()
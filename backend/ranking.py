@@ -0,0 +1,206 @@
+"""
+브랜드 랭킹 엔진
+================
+rank_brands()는 요청마다 kpop-brands.json을 다시 읽고 모든 브랜드를
+스타일 키워드 × 태그 부분문자열 비교로 채점한 뒤 전체 정렬합니다.
+이 모듈은 카탈로그를 한 번만 컴파일해 두고 top-k만 뽑습니다.
+
+  - 파일 mtime이 바뀌면 자동 재로드 (확인 주기 RELOAD_CHECK_INTERVAL)
+  - 브랜드별 스타일 매칭 비트셋(_STYLE_MAP 키 단위), 체형 매칭 비트셋,
+    예산 구간 겹침 비트셋, 아이돌 confirmed 플래그를 미리 계산
+  - 예산 구간별로 (스타일, 체형, 예산 겹침, 아이돌) 그룹을 미리 나눠 둠.
+    같은 그룹의 브랜드는 점수가 같으므로 그룹 단위로 채점
+    → 카탈로그 크기가 아니라 그룹 수에 비례
+  - 동점은 카탈로그 순서 유지 (rank_brands의 안정 정렬과 동일)
+
+RANKING_ENGINE=numpy이면 같은 카탈로그를 vector_ranking.VectorIndex로도 컴파일해
+채점을 NumPy 행렬 연산으로 처리합니다 (대형 카탈로그 / 다수 프로필 일괄 채점).
+
+점수는 crawler.calc_match_score와 항상 같아야 합니다 (test_crawler.py에서 검증).
+"""
+
+import heapq
+import os
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from crawler import (
+    BRANDS_PATH,
+    BUDGET_RANGE,
+    _BODY_TYPE_MAP,
+    _STYLE_MAP,
+    calc_match_score,
+    load_brands,
+)
+
+RELOAD_CHECK_INTERVAL = 1.0   # 초
+RANKING_ENGINE        = os.getenv("RANKING_ENGINE", "index")   # index | numpy
+
+_STYLE_BITS:  Dict[str, int] = {s: 1 << i for i, s in enumerate(_STYLE_MAP)}
+_BODY_BITS:   Dict[str, int] = {t: 1 << i for i, t in enumerate(_BODY_TYPE_MAP)}
+_BUDGET_BITS: Dict[str, int] = {b: 1 << i for i, b in enumerate(BUDGET_RANGE)}
+
+# (style_mask, body_mask, budget_mask, idol_confirmed)
+Signature = Tuple[int, int, int, bool]
+# 예산 구간 하나에 대한 그룹 키: (style_mask, body_mask, budget_hit, idol_confirmed)
+GroupKey = Tuple[int, int, bool, bool]
+
+
+def _style_matches(keywords: List[str], tags: List[str]) -> bool:
+    return any(any(kw in bt for kw in keywords) for bt in tags)
+
+
+def _signature(brand: Dict) -> Signature:
+    tags = brand.get("style_tags", [])
+    style_mask = 0
+    for style, bit in _STYLE_BITS.items():
+        if _style_matches(_STYLE_MAP[style], tags):
+            style_mask |= bit
+    body_mask = 0
+    for body_type, bit in _BODY_BITS.items():
+        if _style_matches(_BODY_TYPE_MAP[body_type], tags):
+            body_mask |= bit
+
+    price = brand.get("price_range_krw", {})
+    brand_min = price.get("min", 0)
+    brand_max = price.get("max", 9_999_999)
+    budget_mask = 0
+    for key, (lo, hi) in BUDGET_RANGE.items():
+        if brand_min <= hi and brand_max >= lo:
+            budget_mask |= _BUDGET_BITS[key]
+
+    idol = any(ref.get("confirmed") for ref in brand.get("idol_references", []))
+    return style_mask, body_mask, budget_mask, idol
+
+
+def _style_points(style_mask: int, styles: List[str]) -> int:
+    if not styles:
+        return 0
+    matched = sum(1 for s in styles if style_mask & _STYLE_BITS[s])
+    return int(35 * matched / len(styles))
+
+
+class BrandIndex:
+    def __init__(self, path: Path = BRANDS_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._brands: List[Dict] = []
+        # 예산 키("" 포함) → 그룹 키 → 브랜드 인덱스(오름차순)
+        self._groups: Dict[str, Dict[GroupKey, List[int]]] = {}
+        self._vector = None   # RANKING_ENGINE=numpy일 때 VectorIndex
+        self.reloads = 0
+
+    # ── 로드 ──────────────────────────────────────────────────────────────────
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            brands = load_brands()
+            if not brands and self._brands:
+                return   # 편집 중 깨진 파일 — 이전 카탈로그 유지
+            self._compile(brands)
+            self._mtime = mtime
+            self.reloads += 1
+            print(f"[ranking] 카탈로그 컴파일: {len(brands)}개 브랜드, {self._group_count()}개 그룹")
+
+    def _compile(self, brands: List[Dict]) -> None:
+        groups: Dict[str, Dict[GroupKey, List[int]]] = {k: {} for k in ("", *BUDGET_RANGE)}
+        for i, b in enumerate(brands):
+            style_mask, body_mask, budget_mask, idol = _signature(b)
+            for key, part in groups.items():
+                hit = bool(budget_mask & _BUDGET_BITS.get(key, 0))
+                part.setdefault((style_mask, body_mask, hit, idol), []).append(i)
+        self._brands = brands
+        self._groups = groups
+        if RANKING_ENGINE == "numpy":
+            from vector_ranking import VectorIndex
+            self._vector = VectorIndex(brands)
+
+    def _group_count(self) -> int:
+        return len(self._groups.get("", {}))
+
+    def brands(self) -> List[Dict]:
+        self._refresh()
+        return self._brands
+
+    # ── 랭킹 ──────────────────────────────────────────────────────────────────
+
+    def top_k(self, user_input: dict, k: int = 3) -> List[Dict]:
+        """점수 상위 k개 브랜드 (동점은 카탈로그 순서)."""
+        return [b for _, b in self.top_k_scored(user_input, k)]
+
+    def top_k_many(self, user_inputs: List[dict], k: int = 3) -> List[List[Tuple[int, Dict]]]:
+        """여러 프로필의 top-k (numpy 엔진이면 행렬 연산 한 번으로 채점)."""
+        self._refresh()
+        if self._vector is not None:
+            return self._vector.top_k_many(user_inputs, k)
+        return [self.top_k_scored(u, k) for u in user_inputs]
+
+    def top_k_scored(self, user_input: dict, k: int = 3) -> List[Tuple[int, Dict]]:
+        self._refresh()
+        if self._vector is not None:
+            return self._vector.top_k_scored(user_input, k)
+        brands, groups = self._brands, self._groups
+        styles: List[str] = user_input.get("styles", [])
+
+        # _STYLE_MAP에 없는 스타일은 비트셋이 없으므로 브랜드별 채점 + 힙
+        if any(s not in _STYLE_BITS for s in styles):
+            best = heapq.nsmallest(
+                k, ((-calc_match_score(user_input, b), i) for i, b in enumerate(brands))
+            )
+            return [(-neg, brands[i]) for neg, i in best]
+
+        budget_key = user_input.get("budget_krw", "")
+        part = groups.get(budget_key if budget_key in BUDGET_RANGE else "", {})
+        body_bit = _BODY_BITS.get(user_input.get("body_type", ""), 0)
+
+        style_pts: Dict[int, int] = {}
+        by_score: Dict[int, List[List[int]]] = {}
+        for (style_mask, body_mask, hit, idol), members in part.items():
+            pts = style_pts.get(style_mask)
+            if pts is None:
+                pts = style_pts[style_mask] = _style_points(style_mask, styles)
+            score = (
+                pts
+                + (25 if hit else 0)
+                + (5 if body_mask & body_bit else 0)
+                + (5 if idol else 0)
+            )
+            by_score.setdefault(score, []).append(members)
+
+        result: List[Tuple[int, Dict]] = []
+        for score in sorted(by_score, reverse=True):
+            need = k - len(result)
+            if need <= 0:
+                break
+            # 같은 점수의 그룹들을 카탈로그 순서로 병합
+            for i in islice(heapq.merge(*by_score[score]), need):
+                result.append((score, brands[i]))
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "engine":  "numpy" if self._vector is not None else "index",
+            "brands":  len(self._brands),
+            "groups":  self._group_count(),
+            "reloads": self.reloads,
+        }
+
+
+brand_index = BrandIndex()
@@ -0,0 +1,160 @@
+"""
+무신사 캐시 백그라운드 갱신 / 프리워밍
+======================================
+kpop-brands.json의 브랜드를 훑어 만료 전에 미리 재크롤링합니다.
+사용자 요청 경로에서 크롤링 지연을 제거하는 것이 목적입니다.
+
+  - 만료 임박(REFRESH_MARGIN 이내) 또는 이미 stale인 엔트리를 갱신
+  - 우선순위: 조회 빈도 높은 순 → 오래된 순
+    (조회 수는 API 프로세스가 캐시 DB에 주기적으로 기록 — 단독 CLI로 돌려도 같은 기준)
+  - 사이클당 갱신 수 / 동시 크롤링 수 제한
+
+실행:
+  FastAPI 프로세스 내장:  CACHE_PREWARM=1 uvicorn main:app
+  단독 CLI:               python refresher.py [--once] [--all]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from crawler import (
+    CACHE_TTL,
+    _cache_key,
+    crawl_cache,
+    hit_counts,
+    load_brands,
+    migrate_json_cache,
+    refresh_brand,
+)
+
+REFRESH_INTERVAL      = int(os.getenv("REFRESH_INTERVAL", "600"))       # 사이클 간격 (초)
+REFRESH_MARGIN        = int(os.getenv("REFRESH_MARGIN", "1800"))        # 만료 N초 전부터 갱신
+REFRESH_MAX_PER_CYCLE = int(os.getenv("REFRESH_MAX_PER_CYCLE", "20"))
+REFRESH_CONCURRENCY   = int(os.getenv("REFRESH_CONCURRENCY", "2"))
+
+
+class CacheRefresher:
+    def __init__(
+        self,
+        interval: int = REFRESH_INTERVAL,
+        margin: int = REFRESH_MARGIN,
+        max_per_cycle: int = REFRESH_MAX_PER_CYCLE,
+        concurrency: int = REFRESH_CONCURRENCY,
+        include_cold: bool = False,
+    ) -> None:
+        self.interval      = interval
+        self.margin        = margin
+        self.max_per_cycle = max_per_cycle
+        self.concurrency   = concurrency
+        self.include_cold  = include_cold   # 한 번도 조회/저장되지 않은 키도 프리워밍
+        self._task: Optional[asyncio.Task] = None
+
+        self.cycles    = 0
+        self.refreshed = 0
+        self.failed    = 0
+
+    def due(self) -> List[Dict]:
+        """갱신 대상 브랜드 목록 — 우선순위 순."""
+        stored = crawl_cache.store.timestamps()
+        counts = hit_counts()
+        now = time.time()
+
+        candidates: List[Tuple[int, float, Dict]] = []
+        for brand in load_brands():
+            key  = _cache_key(brand)
+            hits = counts.get(key, 0)
+            ts, ttl = stored.get(key, (None, None))
+            if ts is None:
+                if not (hits or self.include_cold):
+                    continue
+                age = float("inf")
+            else:
+                age = now - ts
+                # 빈 결과/실패 엔트리는 자체 "ttl"(짧음)로 판단
+                if age < (ttl or CACHE_TTL) - self.margin:
+                    continue
+            candidates.append((hits, age, brand))
+
+        candidates.sort(key=lambda c: (-c[0], -c[1]))
+        return [brand for _, _, brand in candidates[: self.max_per_cycle]]
+
+    async def run_once(self) -> int:
+        due = await asyncio.to_thread(self.due)
+        self.cycles += 1
+        if not due:
+            return 0
+        print(f"[refresher] 갱신 대상 {len(due)}개")
+
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def _refresh(brand: Dict) -> None:
+            async with sem:
+                try:
+                    await refresh_brand(brand)
+                    self.refreshed += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[refresher] {_cache_key(brand)} 실패: {e}")
+
+        await asyncio.gather(*(_refresh(b) for b in due))
+        return len(due)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"[refresher] 사이클 오류: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running":   self._task is not None,
+            "cycles":    self.cycles,
+            "refreshed": self.refreshed,
+            "failed":    self.failed,
+        }
+
+
+refresher = CacheRefresher()
+
+
+async def _main(once: bool, include_cold: bool) -> None:
+    from browser_pool import browser_pool
+
+    migrate_json_cache()
+    r = CacheRefresher(include_cold=include_cold)
+    try:
+        if once:
+            n = await r.run_once()
+            print(f"[refresher] 완료: {n}개 갱신 시도, 실패 {r.failed}개")
+        else:
+            await r.run_forever()
+    finally:
+        await browser_pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="무신사 캐시 갱신 / 프리워밍 (조회 빈도 우선순위는 API 프로세스가 캐시 DB에 기록한 값 사용)"
+    )
+    parser.add_argument("--once", action="store_true", help="한 사이클만 실행 후 종료")
+    parser.add_argument("--all", action="store_true", help="조회 이력 없는 키도 프리워밍")
+    args = parser.parse_args()
+    asyncio.run(_main(args.once, args.all))
@@ -0,0 +1,150 @@
+"""
+직렬화 (API 응답 / 영속 데이터)
+================================
+  - API 응답: orjson이 있으면 ORJSONResponse를 FastAPI 기본 응답 클래스로 사용 (main.py).
+    SSE / NDJSON 줄도 dumps_text()로 같은 인코더 사용
+  - SQLite 캐시 값 (cache_store.SQLiteStore — 크롤링 캐시, AI 플랜 캐시): STORE_FORMAT
+      json    — 압축 JSON TEXT (orjson 인코딩/디코딩, 기본값 — CPU가 가장 적게 듦)
+      msgpack — msgpack BLOB (JSON보다 10~45% 작음, 디코딩은 표준 json과 비슷)
+    읽을 때는 행 타입(TEXT/BLOB)으로 구분하므로 형식을 바꿔도 기존 행은 그대로 읽힘
+  - 브랜드 카탈로그 (kpop-brands.json): JSON 원본은 편집/가져오기 형식으로 그대로 두고
+    JsonSnapshot으로 읽음 — 처음 사용할 때 읽고(import 시점 아님), 원본 mtime/크기가 바뀔
+    때까지 메모리에서 재사용. STORE_FORMAT=msgpack이면 옆에 바이너리 스냅샷
+    (kpop-brands.msgpack)을 만들어 다음 기동부터 그것을 읽음
+
+orjson / msgpack은 선택 의존성 — 없으면 표준 json으로 같은 결과(JSON)를 냅니다.
+형식별 수치: python bench_serialization.py
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+    ORJSONResponse = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+
+# FastAPI(default_response_class=...) — 응답 dict를 orjson으로 바로 인코딩
+JSON_RESPONSE_CLASS = ORJSONResponse if ORJSONResponse is not None else JSONResponse
+
+STORE_FORMAT = os.getenv("STORE_FORMAT", "json")
+if STORE_FORMAT == "msgpack" and msgpack is None:
+    print("[serialization] STORE_FORMAT=msgpack이지만 msgpack 미설치 — JSON으로 저장")
+
+
+def _use_msgpack() -> bool:
+    return STORE_FORMAT == "msgpack" and msgpack is not None
+
+
+def dumps(obj: Any) -> bytes:
+    """압축 JSON (UTF-8 바이트)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_text(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack(obj: Any) -> Union[bytes, str]:
+    """저장용 값 — STORE_FORMAT=msgpack이면 바이트, 아니면 압축 JSON 문자열."""
+    if _use_msgpack():
+        return msgpack.packb(obj, use_bin_type=True)
+    return dumps_text(obj)
+
+
+def unpack(value: Union[bytes, str]) -> Any:
+    """pack() 결과 또는 예전 JSON 문자열 → 객체."""
+    if isinstance(value, str):
+        return loads(value)
+    if msgpack is None:
+        raise RuntimeError("msgpack으로 저장된 값입니다 — pip install msgpack")
+    return msgpack.unpackb(value, raw=False, strict_map_key=False)
+
+
+class JsonSnapshot:
+    """
+    JSON 원본 파일 (+ STORE_FORMAT=msgpack이면 원본 옆 .msgpack 스냅샷).
+    get()은 원본 stat만 확인하고, 바뀌었을 때만 스냅샷(없거나 낡았으면 원본 JSON)을 읽음.
+    스냅샷에는 원본의 (mtime_ns, 크기)를 같이 저장해 낡았는지 판단.
+    """
+
+    def __init__(self, path: Path, snapshot_path: Optional[Path] = None) -> None:
+        self.path          = path
+        self.snapshot_path = snapshot_path or path.with_suffix(".msgpack")
+        self._lock = threading.Lock()
+        self._data: Any = None
+        self._source: Optional[list] = None
+
+        self.json_loads     = 0
+        self.snapshot_loads = 0
+        self.snapshot_saves = 0
+
+    def get(self) -> Any:
+        """원본이 없거나 깨졌으면 OSError / ValueError."""
+        st = os.stat(self.path)
+        source = [st.st_mtime_ns, st.st_size]
+        if source == self._source:
+            return self._data
+        with self._lock:
+            if source != self._source:
+                self._data = self._load(source)
+                self._source = source
+        return self._data
+
+    def _load(self, source: list) -> Any:
+        if _use_msgpack():
+            try:
+                snap = unpack(self.snapshot_path.read_bytes())
+                if snap.get("source") == source:
+                    self.snapshot_loads += 1
+                    return snap["data"]
+            except Exception:
+                pass   # 없음 / 깨짐 / 형식 변경 → 원본에서 재생성
+
+        data = loads(self.path.read_bytes())
+        self.json_loads += 1
+        if _use_msgpack():
+            try:
+                tmp = self.snapshot_path.with_suffix(".tmp")
+                tmp.write_bytes(pack({"source": source, "data": data}))
+                os.replace(tmp, self.snapshot_path)
+                self.snapshot_saves += 1
+            except OSError as e:
+                print(f"[serialization] {self.snapshot_path.name} 저장 실패: {e}")
+        return data
+
+    def stats(self) -> dict:
+        return {
+            "format":         "msgpack" if _use_msgpack() else "json",
+            "json_loads":     self.json_loads,
+            "snapshot_loads": self.snapshot_loads,
+            "snapshot_saves": self.snapshot_saves,
+        }
+
+
+def stats() -> dict:
+    return {
+        "response": JSON_RESPONSE_CLASS.__name__,
+        "store":    "msgpack" if _use_msgpack() else "json",
+        "encoder":  "orjson" if orjson is not None else "json",
+    }
@@ -0,0 +1,57 @@
+"""
+Single-flight (요청 병합)
+=========================
+같은 키로 동시에 들어온 작업을 하나로 합칩니다.
+첫 호출자가 작업을 시작하고, 이후 호출자는 같은 Future를 기다립니다.
+성공/예외 결과는 대기 중인 모든 호출자에게 동일하게 전달됩니다.
+
+  - 작업은 별도 Task로 실행되므로 한 호출자가 취소돼도 다른 호출자와
+    작업 자체에는 영향이 없음 (asyncio.shield)
+  - 작업이 끝나면 키를 즉시 해제 → 다음 호출은 새 작업을 시작
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str = "") -> None:
+        self.name = name
+        self._tasks: Dict[str, "asyncio.Task[T]"] = {}
+        self.started   = 0   # 실제로 실행된 작업 수
+        self.coalesced = 0   # 진행 중 작업에 합류한 호출 수
+
+    def inflight(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tasks
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """key로 진행 중인 작업이 있으면 합류, 없으면 fn()을 실행."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self.started += 1
+            task.add_done_callback(lambda t, k=key: self._done(k, t))
+        else:
+            self.coalesced += 1
+            print(f"[single-flight] {self.name} 합류: {key}")
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: "asyncio.Task[T]") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 모든 호출자가 취소된 경우에도 "exception never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "inflight":  len(self._tasks),
+            "started":   self.started,
+            "coalesced": self.coalesced,
+        }
@@ -8,20 +8,36 @@
   2. matchScore 브랜드 랭킹
   3. CDN URL fallback 생성
   4. Playwright 실제 크롤링 (단일 브랜드)
-  5. 캐시 파일 정합성
+  5. 캐시 저장소 정합성
+  6. 녹화 스냅샷 재생 (data/snapshots 또는 CRAWL_REPLAY_DIR — 오프라인, 결정적)
+     + crawl_brands(공유 컨텍스트 다중 탭) 결과 = 브랜드별 단독 크롤링 결과
 """
 
 import asyncio
-import json
+import os
 import sys
 from pathlib import Path
+from typing import Dict, List
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from browser_pool import browser_pool
+import crawler
+import vector_ranking
+from ranking import brand_index
 from crawler import (
+    CACHE_DB_PATH,
+    SNAPSHOT_DIR,
+    CrawlError,
     _cdn_url,
+    _crawl_brand_playwright,
+    _normalize_items,
     calc_match_score,
+    crawl_brands,
+    crawl_cache,
     load_brands,
+    load_snapshot,
+    migrate_json_cache,
     rank_brands,
     search_brand,
 )
@@ -37,6 +53,18 @@ def fail(msg): print(f"  {RED}✘{RESET}  {msg}")
 def info(msg): print(f"  {CYAN}·{RESET}  {msg}")
 
 
+def field_errors(p) -> list:
+    """[4] 필드 검증과 같은 기준으로 이상 필드 이름 목록 (bench_extract.py도 사용)."""
+    checks = {
+        "brand":        bool(p.get("brand")),
+        "product_name": bool(p.get("product_name")),
+        "price_krw":    p.get("price_krw", 0) >= 1000,
+        "image_url":    p.get("image_url", "").startswith("https://"),
+        "product_url":  p.get("product_url", "").startswith("https://"),
+    }
+    return [name for name, passed in checks.items() if not passed]
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # 1. kpop-brands.json 로드
 # ════════════════════════════════════════════════════════════════════════════
@@ -73,6 +101,45 @@ def test_match_score(brands):
             info(f"    {i}. {b['name_ko']} ({b['id']})  점수: {score}")
     ok("matchScore 랭킹 완료")
 
+    # 랭킹 엔진(ranking.py) ↔ rank_brands 정합성
+    parity_inputs = test_inputs + [
+        {"styles": [], "budget_krw": ""},
+        {"styles": ["미니멀", "미니멀", "포멀"], "budget_krw": "15~30만원"},
+        {"styles": ["페미닌"], "budget_krw": "~5만원"},   # _STYLE_MAP에 없는 스타일
+        {"styles": ["스트릿"] * 1000 + ["미니멀"], "budget_krw": "5~15만원"},   # 긴 스타일 목록 (정수 넘침)
+    ]
+    mismatches = 0
+    for user_input in parity_inputs:
+        expected = [(calc_match_score(user_input, b), b["id"]) for b in rank_brands(user_input, brands)]
+        for k in (1, 3, len(brands)):
+            got = [(s, b["id"]) for s, b in brand_index.top_k_scored(user_input, k)]
+            if got != expected[:k]:
+                mismatches += 1
+                fail(f"랭킹 엔진 불일치 {user_input} k={k}: {got[:3]} ≠ {expected[:3]}")
+    if not mismatches:
+        ok("랭킹 엔진 결과 = rank_brands (점수·순서 일치)")
+
+    # NumPy 벡터 채점(vector_ranking.py) ↔ calc_match_score
+    if vector_ranking.np is None:
+        info("numpy 미설치 — 벡터 채점 정합성 검사 생략")
+        return
+    vindex = vector_ranking.VectorIndex(brands)
+    body_inputs = [dict(u, body_type=t) for u in parity_inputs for t in ("마른 체형", "통통", "표준")]
+    profiles = parity_inputs + body_inputs
+    scores = vindex.scores(profiles)
+    mismatches = 0
+    for r, user_input in enumerate(profiles):
+        expected = [calc_match_score(user_input, b) for b in brands]
+        if scores[r].tolist() != expected:
+            mismatches += 1
+            fail(f"벡터 채점 불일치 {user_input}")
+        ranked = [b["id"] for b in rank_brands(user_input, brands)]
+        if [b["id"] for b in vindex.top_k(user_input, 3)] != ranked[:3]:
+            mismatches += 1
+            fail(f"벡터 top-k 불일치 {user_input}")
+    if not mismatches:
+        ok(f"벡터 채점 = calc_match_score ({len(profiles)}개 프로필, 체형 포함)")
+
 
 # ════════════════════════════════════════════════════════════════════════════
 # 3. CDN URL fallback
@@ -160,15 +227,15 @@ async def test_crawl(brands):
 # ════════════════════════════════════════════════════════════════════════════
 
 def test_cache():
-    print(f"\n{YELLOW}[5] 캐시 파일 상태{RESET}")
-    cache_path = Path(__file__).parent / "data" / "musinsa-cache.json"
-    if not cache_path.exists():
-        info("캐시 파일 없음 (첫 실행 시 정상)")
+    print(f"\n{YELLOW}[5] 캐시 저장소 상태{RESET}")
+    migrate_json_cache()
+    if not CACHE_DB_PATH.exists():
+        info("캐시 저장소 없음 (첫 실행 시 정상)")
         return
 
     try:
-        cache = json.loads(cache_path.read_text(encoding="utf-8"))
-        ok(f"캐시 파일 존재: {cache_path}")
+        cache = dict(crawl_cache.store.items())
+        ok(f"캐시 저장소 존재: {CACHE_DB_PATH}")
         ok(f"캐시 키 수: {len(cache)}")
 
         bad_prices, missing_imgs = [], []
@@ -181,7 +248,7 @@ def test_cache():
 
         if bad_prices:
             fail(f"가격 이상 항목 {len(bad_prices)}개: {bad_prices[:3]}")
-            info("→ 캐시 삭제 후 재크롤링: rm backend/data/musinsa-cache.json")
+            info("→ 캐시 삭제 후 재크롤링: rm backend/data/musinsa-cache.sqlite3*")
         else:
             ok("가격 데이터 정상 (모두 1,000원 이상)")
 
@@ -190,7 +257,53 @@ def test_cache():
         else:
             ok("이미지 URL 데이터 정상")
     except Exception as e:
-        fail(f"캐시 파일 파싱 오류: {e}")
+        fail(f"캐시 저장소 읽기 오류: {e}")
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# 6. 녹화 스냅샷 재생
+# ════════════════════════════════════════════════════════════════════════════
+
+async def test_replay(brands):
+    snapshot_dir = os.getenv("CRAWL_REPLAY_DIR") or str(SNAPSHOT_DIR)
+    print(f"\n{YELLOW}[6] 녹화 스냅샷 재생 ({snapshot_dir}){RESET}")
+    snapshots = [b for b in brands if (Path(snapshot_dir) / f"{b['id']}.html").exists()]
+    if not snapshots:
+        info("스냅샷 없음 — 녹화: python bench_extract.py --record")
+        return
+
+    crawler.CRAWL_REPLAY_DIR = snapshot_dir
+    errors = 0
+    single: Dict[str, List[Dict]] = {}
+    try:
+        for brand in snapshots:
+            _, meta = load_snapshot(snapshot_dir, brand["id"])
+            try:
+                products = await _crawl_brand_playwright(brand)
+            except CrawlError:
+                products = []
+            single[brand["id"]] = products
+            if not products:
+                fail(f"{brand['name_ko']}: 재생 결과 없음 (playwright install chromium 확인)")
+                errors += 1
+                continue
+            if "raw_items" in meta and products != _normalize_items(meta["raw_items"], brand["name_ko"]):
+                fail(f"{brand['name_ko']}: 재생 결과 ≠ 녹화 시점 추출 결과")
+                errors += 1
+            bad = [(p.get("goods_no"), field_errors(p)) for p in products if field_errors(p)]
+            if bad:
+                fail(f"{brand['name_ko']}: 필드 이상 {len(bad)}개 {bad[:3]}")
+                errors += 1
+
+        # 공유 컨텍스트 다중 탭 = 브랜드별 단독 크롤링
+        async for brand, products, error in crawl_brands(snapshots):
+            if error is not None or products != single[brand["id"]]:
+                fail(f"{brand['name_ko']}: crawl_brands 결과 ≠ 단독 크롤링 결과 ({error or len(products)})")
+                errors += 1
+    finally:
+        crawler.CRAWL_REPLAY_DIR = ""
+    if errors == 0:
+        ok(f"{len(snapshots)}개 스냅샷 재생 = 녹화 결과, 전체 필드 검증 통과")
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -208,7 +321,11 @@ async def main():
 
     test_match_score(brands)
     test_cdn_url()
-    await test_crawl(brands)
+    try:
+        await test_crawl(brands)
+        await test_replay(brands)
+    finally:
+        await browser_pool.close()
     test_cache()
 
     print(f"\n{'='*60}")
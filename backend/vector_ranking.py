@@ -0,0 +1,161 @@
+"""
+NumPy 벡터 채점 (대형 카탈로그 / 다수 프로필 일괄 채점)
+========================================================
+카탈로그를 행렬로 컴파일해 프로필 여러 개를 행렬 연산 한 번으로 채점합니다.
+
+  - S:   브랜드 × _STYLE_MAP 스타일 매칭 행렬 (bool)
+  - BT:  브랜드 × _BODY_TYPE_MAP 체형 매칭 행렬 (bool)
+  - price_min / price_max 배열, idol confirmed 마스크
+  - top-k는 argpartition으로 k번째 점수를 찾은 뒤, 동점은 카탈로그 순서로 채움
+    (rank_brands의 안정 정렬과 동일한 결과)
+
+점수는 crawler.calc_match_score와 같아야 합니다 (test_crawler.py에서 검증).
+numpy는 선택 의존성입니다 — 없으면 VectorIndex 생성 시 RuntimeError.
+
+사용:
+  idx = VectorIndex(load_brands())
+  idx.top_k(user_input, 3)              # 단일 프로필 (BrandIndex와 같은 인터페이스)
+  idx.top_k_many([u1, u2, ...], 3)      # 다수 프로필 일괄
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:   # pragma: no cover - 선택 의존성
+    np = None
+
+from crawler import BUDGET_RANGE, _BODY_TYPE_MAP, _STYLE_MAP
+
+_STYLES = list(_STYLE_MAP)
+_BODIES = list(_BODY_TYPE_MAP)
+_STYLE_COL = {s: i for i, s in enumerate(_STYLES)}
+_BODY_COL  = {t: i for i, t in enumerate(_BODIES)}
+
+# 한 번에 채점할 프로필 수 (점수 행렬 메모리 상한: chunk × 브랜드 수 × int32)
+_CHUNK = 256
+
+_TAG_SEP = "\x1f"
+
+
+def _matches(keywords: List[str], tags: List[str]) -> bool:
+    return any(any(kw in bt for kw in keywords) for bt in tags)
+
+
+class VectorIndex:
+    def __init__(self, brands: List[Dict]) -> None:
+        if np is None:
+            raise RuntimeError("numpy가 설치되어 있지 않습니다 (pip install numpy)")
+        self.brands = brands
+        n = len(brands)
+
+        tags = [b.get("style_tags", []) for b in brands]
+        self.S = np.array(
+            [[_matches(_STYLE_MAP[s], t) for s in _STYLES] for t in tags], dtype=bool
+        ).reshape(n, len(_STYLES))
+        self._S_T = self.S.T.astype(np.int32)   # 행렬곱용 (스타일 × 브랜드) — int32: 긴 스타일 목록에서도 35 × 일치 수가 넘치지 않게
+        self.BT = np.array(
+            [[_matches(_BODY_TYPE_MAP[bt], t) for bt in _BODIES] for t in tags], dtype=bool
+        ).reshape(n, len(_BODIES))
+
+        self.price_min = np.array(
+            [b.get("price_range_krw", {}).get("min", 0) for b in brands], dtype=np.int64
+        )
+        self.price_max = np.array(
+            [b.get("price_range_krw", {}).get("max", 9_999_999) for b in brands], dtype=np.int64
+        )
+        self.idol = np.array(
+            [any(r.get("confirmed") for r in b.get("idol_references", [])) for b in brands],
+            dtype=bool,
+        )
+
+        # _STYLE_MAP에 없는 스타일 → 태그 부분문자열 검색용 (열은 필요할 때 계산 후 캐시)
+        self._tag_text = np.array([_TAG_SEP.join(t) for t in tags], dtype=object)
+        self._extra_cols: Dict[str, "np.ndarray"] = {}
+
+        # 예산 구간별 겹침 마스크
+        self._budget_hit = {
+            key: (self.price_min <= hi) & (self.price_max >= lo)
+            for key, (lo, hi) in BUDGET_RANGE.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.brands)
+
+    # ── 채점 ──────────────────────────────────────────────────────────────────
+
+    def _extra_col(self, style: str) -> "np.ndarray":
+        col = self._extra_cols.get(style)
+        if col is None:
+            # calc_match_score: any(style in tag for tag in tags)
+            col = np.fromiter(
+                (bool(tt) and any(style in t for t in tt.split(_TAG_SEP)) for tt in self._tag_text),
+                dtype=bool,
+                count=len(self.brands),
+            )
+            self._extra_cols[style] = col
+        return col
+
+    def scores(self, user_inputs: Sequence[dict]) -> "np.ndarray":
+        """프로필 수 × 브랜드 수 점수 행렬 (int32)."""
+        m, n = len(user_inputs), len(self.brands)
+        out = np.zeros((m, n), dtype=np.int32)
+
+        # 스타일 (35점): 프로필 × 스타일 개수 행렬 @ 스타일 매칭 행렬ᵀ
+        U = np.zeros((m, len(_STYLES)), dtype=np.int32)
+        n_styles = np.zeros(m, dtype=np.int32)
+        for r, u in enumerate(user_inputs):
+            styles = u.get("styles", [])
+            n_styles[r] = len(styles)
+            for s in styles:
+                col = _STYLE_COL.get(s)
+                if col is not None:
+                    U[r, col] += 1
+        matched = U @ self._S_T
+        for r, u in enumerate(user_inputs):
+            for s in u.get("styles", []):
+                if s not in _STYLE_COL:
+                    matched[r] += self._extra_col(s)
+        has_styles = n_styles > 0
+        out[has_styles] += (35 * matched[has_styles] // n_styles[has_styles, None]).astype(np.int32)
+
+        # 예산 (25점) / 체형 (+5) / 아이돌 (+5)
+        for r, u in enumerate(user_inputs):
+            hit = self._budget_hit.get(u.get("budget_krw", ""))
+            if hit is not None:
+                out[r] += 25 * hit
+            col = _BODY_COL.get(u.get("body_type", ""))
+            if col is not None:
+                out[r] += 5 * self.BT[:, col]
+        out += 5 * self.idol
+        return out
+
+    # ── top-k ─────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _top_k_row(row: "np.ndarray", k: int) -> "np.ndarray":
+        """점수 내림차순, 동점은 인덱스 오름차순인 상위 k개 인덱스."""
+        n = row.shape[0]
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k >= n:
+            return np.lexsort((np.arange(n), -row.astype(np.int32)))
+        kth = row[np.argpartition(-row, k - 1)[k - 1]]   # k번째로 큰 점수
+        above = np.flatnonzero(row > kth)
+        ties  = np.flatnonzero(row == kth)[: k - len(above)]
+        idx = np.concatenate([above, ties])
+        return idx[np.lexsort((idx, -row[idx].astype(np.int32)))]
+
+    def top_k_many(self, user_inputs: Sequence[dict], k: int = 3) -> List[List[Tuple[int, Dict]]]:
+        results: List[List[Tuple[int, Dict]]] = []
+        for start in range(0, len(user_inputs), _CHUNK):
+            scores = self.scores(user_inputs[start:start + _CHUNK])
+            for row in scores:
+                results.append([(int(row[i]), self.brands[i]) for i in self._top_k_row(row, k)])
+        return results
+
+    def top_k_scored(self, user_input: dict, k: int = 3) -> List[Tuple[int, Dict]]:
+        return self.top_k_many([user_input], k)[0]
+
+    def top_k(self, user_input: dict, k: int = 3) -> List[Dict]:
+        return [b for _, b in self.top_k_scored(user_input, k)]